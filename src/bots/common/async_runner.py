@@ -0,0 +1,104 @@
+"""
+배치 평가용 asyncio LLM 실행기 (musicqna / scheduler 공용)
+- AsyncOpenAI 클라이언트 + 동시 실행 상한(semaphore)
+- 429 / 5xx / 연결 오류는 jitter(full jitter) 지수 backoff로 재시도 (Retry-After 헤더 우선)
+- 결과는 입력 순서대로 반환 → 순차 실행과 같은 순서로 로그 기록 가능
+- OPENAI_BASE_URL 지정 시 해당 엔드포인트 사용 (로컬 stub 서버 테스트용)
+"""
+import os
+import random
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+import openai
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_CONCURRENCY = 8
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 20.0
+
+def get_concurrency() -> int:
+    """LLM_CONCURRENCY (1 이하 = 기존 순차 실행)"""
+    try:
+        return max(1, int(os.getenv("LLM_CONCURRENCY", "1")))
+    except ValueError:
+        return 1
+
+def make_async_client(api_key: Optional[str] = None) -> openai.AsyncOpenAI:
+    # 재시도는 retry_with_backoff가 담당 → SDK 자체 재시도는 끔
+    return openai.AsyncOpenAI(
+        api_key=api_key or os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_retries=0
+    )
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+async def retry_with_backoff(
+    call: Callable[[], Awaitable[R]],
+    max_retries: int = MAX_RETRIES,
+    base_delay: float = BASE_DELAY,
+    max_delay: float = MAX_DELAY,
+    stats: Optional[dict] = None
+) -> R:
+    """call()을 실행, 재시도 가능한 오류면 min(max_delay, base * 2^n) 범위 full jitter 대기 후 재시도"""
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            retry_after = _retry_after(e)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            if stats is not None:
+                stats['retries'] = stats.get('retries', 0) + 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+async def run_ordered(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> List[R]:
+    """items를 최대 concurrency개씩 동시에 처리하고 입력 순서대로 결과 반환"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def guarded(item):
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(*(guarded(item) for item in items))
+
+def run_batch(
+    items: Sequence[T],
+    worker: Callable[[T, openai.AsyncOpenAI], Awaitable[R]],
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> List[R]:
+    """동기 코드에서 호출: 배치 하나를 이벤트 루프에서 실행 (클라이언트는 배치마다 생성/종료)"""
+    async def main():
+        client = make_async_client()
+        try:
+            return await run_ordered(items, lambda item: worker(item, client), concurrency)
+        finally:
+            await client.close()
+    return asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+배치 평가 로그 append-only JSONL writer / reader (두 봇의 eval/evaluate_batch_cli.py 공용)
+- 행을 {version_dir}/all.jsonl과 라벨별 파일(success / fail / partial_fail.jsonl)에 이어 쓰기만 함
+  (기존 all.json 방식처럼 주기마다 전체 파일을 다시 읽고 쓰지 않음 → 실행 길이에 선형)
+- 중복 제거: 행 키(봇마다 key_fn)의 sha1을 sidecar 파일(all.keys)에 한 줄씩 기록, writer 생성 시 한 번만 읽음
+- compress=True(.env BATCH_LOG_GZIP=1)면 .jsonl.gz (append마다 gzip 멤버를 이어 붙임, gzip.open으로 그대로 읽힘)
+- read_rows / iter_log_rows: 기존 JSON 배열(all.json) / JSONL / JSONL.gz 모두 읽음, rehydrate로 행 복원 가능
+"""
+import os
+import glob
+import gzip
+import json
+import hashlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+LABEL_FILES = {"success": "success", "fail": "fail", "partial": "partial_fail"}
+ALL_LOG = "all"
+KEYS_FILE = "all.keys"
+# --logs 기본 glob: 기존 all.json과 새 all.jsonl(.gz)를 함께 매치
+ALL_LOG_GLOB = "all.json*"
+
+def get_compress() -> bool:
+    """.env BATCH_LOG_GZIP: 1이면 배치 로그를 gzip으로 저장 (기본 0)"""
+    return (os.getenv("BATCH_LOG_GZIP") or "0").strip().lower() in ("1", "true", "yes")
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def _digest(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+class BatchLogWriter:
+    def __init__(self, version_dir: str, key_fn: Callable[[Dict], str], compress: Optional[bool] = None):
+        self.version_dir = version_dir
+        self.key_fn = key_fn
+        self.ext = ".jsonl.gz" if (get_compress() if compress is None else compress) else ".jsonl"
+        self.keys_path = os.path.join(version_dir, KEYS_FILE)
+        self.seen = set()
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, encoding="utf-8") as f:
+                self.seen = {line.strip() for line in f if line.strip()}
+
+    def path(self, name: str = ALL_LOG) -> str:
+        return os.path.join(self.version_dir, name + self.ext)
+
+    def append(self, rows: Iterable[Dict]) -> int:
+        """새 행만 all + 라벨별 파일에 이어 씀 (이미 기록된 키는 건너뜀) → 기록한 행 수"""
+        by_file: Dict[str, List[str]] = {}
+        new_keys = []
+        for row in rows:
+            digest = _digest(self.key_fn(row))
+            if digest in self.seen:
+                continue
+            self.seen.add(digest)
+            new_keys.append(digest)
+            line = json.dumps(row, ensure_ascii=False)
+            by_file.setdefault(ALL_LOG, []).append(line)
+            label_file = LABEL_FILES.get(row.get("label"))
+            if label_file:
+                by_file.setdefault(label_file, []).append(line)
+        if not new_keys:
+            return 0
+        os.makedirs(self.version_dir, exist_ok=True)
+        for name, lines in by_file.items():
+            with _open(self.path(name), "a") as f:
+                f.write("\n".join(lines) + "\n")
+        # 행을 먼저 쓰고 키를 기록 (중간에 죽으면 다음 실행에서 중복 행이 생길 수는 있어도 행이 빠지지는 않음)
+        with open(self.keys_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(new_keys) + "\n")
+        return len(new_keys)
+
+def read_rows(path: str, rehydrate: Optional[Callable[[Dict], Dict]] = None) -> Iterator[Dict]:
+    """all.json(JSON 배열) / *.jsonl / *.jsonl.gz 행을 순서대로"""
+    with _open(path, "r") as f:
+        if ".jsonl" in os.path.basename(path):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = iter(json.load(f))
+        for row in rows:
+            yield rehydrate(row) if rehydrate else row
+
+def log_paths(pattern: str) -> List[str]:
+    return sorted(p for p in glob.glob(pattern) if p.endswith((".json", ".jsonl", ".jsonl.gz")))
+
+def iter_log_rows(pattern: str, rehydrate: Optional[Callable[[Dict], Dict]] = None) -> Iterator[Dict]:
+    for path in log_paths(pattern):
+        yield from read_rows(path, rehydrate)
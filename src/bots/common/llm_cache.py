@@ -0,0 +1,245 @@
+"""
+LLM 응답 캐시 (content-addressed, SQLite)
+- 키 = sha256(모델명 + temperature + 전체 messages + max_tokens)
+- 크기(max_entries, last_access 오래된 순 제거) / TTL(created_at 기준 만료) eviction
+- RAGModel(musicqna)과 extract_schedule(scheduler)이 같은 캐시를 공유
+- LLM_CACHE_MODE: use(기본, 읽기+쓰기) | refresh(항상 새로 호출 후 덮어쓰기) | bypass(캐시 미사용)
+- hit rate, 절약한 prompt/completion 토큰 수 통계
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = 'data/cache/llm_responses.sqlite'
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_TTL_DAYS = 30
+CACHE_MODES = ('use', 'refresh', 'bypass')
+
+# 응답 형식을 바꾸는 요청 필드: 있을 때만 키에 포함 (없는 요청의 기존 키는 그대로)
+OUTPUT_FORMAT_FIELDS = ('tools', 'tool_choice', 'response_format')
+
+def request_key(model: str, messages: List[Dict], temperature=None, max_tokens=None, output_format=None) -> str:
+    body = {'model': model, 'temperature': temperature, 'messages': messages, 'max_tokens': max_tokens}
+    if output_format:
+        body['output_format'] = output_format
+    payload = json.dumps(body, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_sec: Optional[float] = DEFAULT_TTL_DAYS * 86400,
+        mode: str = 'use'
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드: {mode} (지원: {CACHE_MODES})")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = None
+        self.counters = {
+            'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evictions': 0,
+            'saved_prompt_tokens': 0, 'saved_completion_tokens': 0
+        }
+        if mode != 'bypass':
+            self._open(path)
+
+    def _open(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, model TEXT, content TEXT NOT NULL,"
+            " prompt_tokens INTEGER NOT NULL DEFAULT 0, completion_tokens INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_last_access ON llm_responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """use 모드에서만 조회. TTL 지난 항목은 삭제 후 miss"""
+        if self._conn is None or self.mode != 'use':
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, prompt_tokens, completion_tokens, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_sec is not None and now - row[3] > self.ttl_sec:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.counters['expired'] += 1
+                row = None
+            if row is None:
+                self.counters['misses'] += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.counters['hits'] += 1
+            self.counters['saved_prompt_tokens'] += row[1]
+            self.counters['saved_completion_tokens'] += row[2]
+            return row[0]
+
+    def put(self, key: str, content: str, model: str = None, usage=None):
+        if self._conn is None:
+            return
+        now = time.time()
+        prompt_tokens = int(getattr(usage, 'prompt_tokens', 0) or 0)
+        completion_tokens = int(getattr(usage, 'completion_tokens', 0) or 0)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses"
+                " (key, model, content, prompt_tokens, completion_tokens, created_at, last_access, hits)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, model, content, prompt_tokens, completion_tokens, now, now)
+            )
+            self.counters['writes'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self.ttl_sec is not None:
+            cur = self._conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_sec,))
+            self.counters['expired'] += cur.rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                " SELECT key FROM llm_responses ORDER BY last_access ASC LIMIT ?)", (overflow,)
+            )
+            self.counters['evictions'] += overflow
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['misses']
+            size = None
+            if self._conn is not None:
+                size = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            return {
+                **self.counters,
+                'mode': self.mode,
+                'hit_rate': self.counters['hits'] / lookups if lookups else 0.0,
+                'saved_tokens': self.counters['saved_prompt_tokens'] + self.counters['saved_completion_tokens'],
+                'size': size
+            }
+
+    def print_stats(self):
+        s = self.stats()
+        print(
+            f"💾 [LLM 캐시] mode={s['mode']} | hit {s['hits']} / miss {s['misses']} (hit rate {s['hit_rate']:.1%}) | "
+            f"절약 토큰 {s['saved_tokens']} (prompt {s['saved_prompt_tokens']}, completion {s['saved_completion_tokens']}) | "
+            f"저장 {s['size']}건"
+        )
+
+    def clear(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_responses")
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+def _request_key_of(request: Dict) -> str:
+    output_format = {k: request[k] for k in OUTPUT_FORMAT_FIELDS if k in request}
+    return request_key(
+        request.get('model'), request.get('messages'), request.get('temperature'), request.get('max_tokens'),
+        output_format or None
+    )
+
+def message_content(completion) -> Optional[str]:
+    return completion.choices[0].message.content
+
+def cached_chat_completion(client, cache: Optional[LLMResponseCache], request: Dict,
+                           validate: Optional[Callable[[str], bool]] = None,
+                           extract: Callable = message_content):
+    """
+    chat.completions.create(**request)의 캐시 래퍼 → (content, cached 여부).
+    validate가 주어지면 통과한 응답만 저장 (예: JSON 파싱 실패 응답은 저장하지 않음)
+    extract: completion → 저장/반환할 문자열 (기본 message.content, tool call이면 arguments 등)
+    """
+    key = _request_key_of(request) if cache is not None else None
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return content, True
+    completion = client.chat.completions.create(**request)
+    content = extract(completion)
+    if cache is not None and content is not None and (validate is None or validate(content)):
+        cache.put(key, content, request.get('model'), getattr(completion, 'usage', None))
+    return content, False
+
+async def acached_chat_completion(client, cache: Optional[LLMResponseCache], request: Dict,
+                                  validate: Optional[Callable[[str], bool]] = None,
+                                  extract: Callable = message_content):
+    """cached_chat_completion의 비동기 버전 (AsyncOpenAI + jitter backoff 재시도)"""
+    from src.bots.common.async_runner import retry_with_backoff
+    key = _request_key_of(request) if cache is not None else None
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return content, True
+    completion = await retry_with_backoff(lambda: client.chat.completions.create(**request))
+    content = extract(completion)
+    if cache is not None and content is not None and (validate is None or validate(content)):
+        cache.put(key, content, request.get('model'), getattr(completion, 'usage', None))
+    return content, False
+
+def stream_chat_completion(client, cache: Optional[LLMResponseCache], request: Dict):
+    """
+    cached_chat_completion의 스트리밍 버전 → (delta 문자열, cached 여부)를 차례로 yield.
+    캐시 hit이면 저장된 응답 전체를 한 번에 yield, miss면 stream=True 응답을 받은 만큼 바로 yield하고
+    스트림이 끝까지 수신된 경우에만 캐시에 저장 (중간에 끊긴 응답은 저장하지 않음)
+    """
+    key = _request_key_of(request) if cache is not None else None
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            yield content, True
+            return
+    stream = client.chat.completions.create(**request, stream=True, stream_options={'include_usage': True})
+    parts, usage = [], None
+    for chunk in stream:
+        if getattr(chunk, 'usage', None) is not None:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta, False
+    if cache is not None and parts:
+        cache.put(key, ''.join(parts), request.get('model'), usage)
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_llm_cache() -> LLMResponseCache:
+    """프로세스 공용 캐시 (LLM_CACHE_MODE / LLM_CACHE_PATH / LLM_CACHE_TTL_DAYS / LLM_CACHE_MAX_ENTRIES)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            mode = (os.getenv("LLM_CACHE_MODE") or 'use').lower()
+            ttl_days = float(os.getenv("LLM_CACHE_TTL_DAYS") or DEFAULT_TTL_DAYS)
+            _default_cache = LLMResponseCache(
+                path=os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH,
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES") or DEFAULT_MAX_ENTRIES),
+                ttl_sec=ttl_days * 86400 if ttl_days > 0 else None,
+                mode=mode if mode in CACHE_MODES else 'use'
+            )
+        return _default_cache
@@ -0,0 +1,201 @@
+"""
+로컬 OpenAI 호환 stub 서버 (동시 실행/재시도 테스트용, 실제 API 호출 없음)
+- POST /v1/chat/completions: 지연(latency) 후 결정적(deterministic) 응답
+  · system 프롬프트에 "missing"이 있으면(스케쥴러) 일정 JSON (여러 입력 묶음이면 JSON 배열), 아니면 질문을 되돌려주는 답변
+  · tools가 있는 요청(function calling)은 같은 JSON을 첫 번째 tool의 tool_calls 인자로 반환
+  · 같은 입력이면 항상 같은 응답 → 순차/동시 실행 로그 비교 가능
+- --rate-limit-prob / --error-prob 확률로 429(Retry-After) / 500 응답
+- --max-inflight 초과 동시 요청은 429 (서버 측 rate limit 흉내)
+- stream=True 요청은 SSE(chat.completion.chunk)로 몇 글자씩 --token-delay 간격으로 전송 (TTFT 측정용)
+- GET /stats: 요청 수, 429/500 수, 최대 동시 처리 수
+
+실행: python -m src.bots.common.stub_llm_server --port 8089 --latency 0.3 --rate-limit-prob 0.1
+사용: OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=stub LLM_CONCURRENCY=8 python -m ...evaluate_batch_cli
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubState:
+    def __init__(self, latency, jitter, rate_limit_prob, error_prob, max_inflight, seed, token_delay=0.02):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.jitter = jitter
+        self.rate_limit_prob = rate_limit_prob
+        self.error_prob = error_prob
+        self.max_inflight = max_inflight
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.stats = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'errors': 0, 'max_inflight': 0}
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+def _schedule_reply(text) -> dict:
+    return {
+        "event": {
+            "summary": text[:20],
+            "start": {"dateTime": "내일 오후 3시"},
+            "end": {"dateTime": "내일 오후 4시"},
+            "description": "stub"
+        },
+        "missing": []
+    }
+
+def stub_reply(messages) -> str:
+    system = next((m.get('content', '') for m in messages if m.get('role') == 'system'), '')
+    user = next((m.get('content', '') for m in reversed(messages) if m.get('role') == 'user'), '')
+    if 'missing' in system:
+        if '[여러 입력]' in system:
+            # 번호 붙은 여러 문장 → 문장별 결과 JSON 배열
+            lines = [re.sub(r'^\d+\.\s*', '', line) for line in user.splitlines() if line.strip()]
+            return json.dumps([_schedule_reply(line) for line in lines], ensure_ascii=False)
+        return json.dumps(_schedule_reply(user), ensure_ascii=False)
+    return f"[stub] {user.splitlines()[0] if user else ''}"
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code, body, headers=None):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(self, model, content, usage, chunk_chars=4):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+
+            def event(choices, extra=None):
+                body = {'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                        'model': model, 'choices': choices, **(extra or {})}
+                self.wfile.write(f"data: {json.dumps(body, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+
+            for i in range(0, len(content), chunk_chars):
+                event([{'index': 0, 'delta': {'content': content[i:i + chunk_chars]}, 'finish_reason': None}])
+                time.sleep(state.token_delay)
+            event([{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+            event([], {'usage': usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/stats'):
+                with state.lock:
+                    self._send(200, dict(state.stats))
+            else:
+                self._send(404, {'error': {'message': 'not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            with state.lock:
+                state.stats['requests'] += 1
+                state.inflight += 1
+                state.stats['max_inflight'] = max(state.stats['max_inflight'], state.inflight)
+                over_limit = state.max_inflight and state.inflight > state.max_inflight
+            try:
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send(404, {'error': {'message': 'not found'}})
+                    return
+                time.sleep(max(0.0, state.latency + state.jitter * (state.roll() * 2 - 1)))
+                if over_limit or state.roll() < state.rate_limit_prob:
+                    with state.lock:
+                        state.stats['rate_limited'] += 1
+                    self._send(429, {'error': {'message': 'rate limited (stub)', 'type': 'rate_limit'}},
+                               headers={'Retry-After': '0.2'})
+                    return
+                if state.roll() < state.error_prob:
+                    with state.lock:
+                        state.stats['errors'] += 1
+                    self._send(500, {'error': {'message': 'internal error (stub)', 'type': 'server_error'}})
+                    return
+                content = stub_reply(payload.get('messages', []))
+                # 토큰 수는 글자 수 / 4 로 근사 (캐시 절약 토큰 통계 확인용)
+                # (tools / response_format 스키마도 실제 API처럼 prompt 토큰에 포함)
+                prompt_chars = sum(len(m.get('content') or '') for m in payload.get('messages', []))
+                prompt_chars += sum(len(json.dumps(payload[k], ensure_ascii=False))
+                                    for k in ('tools', 'response_format') if k in payload)
+                prompt_tokens = prompt_chars // 4
+                completion_tokens = len(content) // 4
+                usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                         'total_tokens': prompt_tokens + completion_tokens}
+                with state.lock:
+                    state.stats['ok'] += 1
+                if payload.get('stream'):
+                    self._send_stream(payload.get('model', 'stub'), content, usage)
+                    return
+                message = {'role': 'assistant', 'content': content}
+                finish_reason = 'stop'
+                if payload.get('tools'):
+                    tool_name = payload['tools'][0].get('function', {}).get('name', 'tool')
+                    message = {'role': 'assistant', 'content': None, 'tool_calls': [{
+                        'id': 'call_stub', 'type': 'function',
+                        'function': {'name': tool_name, 'arguments': content}
+                    }]}
+                    finish_reason = 'tool_calls'
+                self._send(200, {
+                    'id': 'chatcmpl-stub',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': payload.get('model', 'stub'),
+                    'choices': [{
+                        'index': 0,
+                        'message': message,
+                        'finish_reason': finish_reason
+                    }],
+                    'usage': usage
+                })
+            finally:
+                with state.lock:
+                    state.inflight -= 1
+    return Handler
+
+def serve(port: int = 8089, latency: float = 0.3, jitter: float = 0.1, rate_limit_prob: float = 0.0,
+          error_prob: float = 0.0, max_inflight: int = 0, seed: int = 42, background: bool = False,
+          token_delay: float = 0.02):
+    """stub 서버 실행. background=True면 (server, state)를 반환 (server.shutdown()으로 종료)"""
+    state = StubState(latency, jitter, rate_limit_prob, error_prob, max_inflight, seed, token_delay)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, state
+    print(f"🧪 stub LLM 서버: http://127.0.0.1:{port}/v1 (latency={latency}s, 429={rate_limit_prob}, 500={error_prob})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"종료: {state.stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 로컬 stub 서버 (지연/429/500 시뮬레이션)")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--rate-limit-prob', type=float, default=0.0)
+    parser.add_argument('--error-prob', type=float, default=0.0)
+    parser.add_argument('--max-inflight', type=int, default=0, help="초과 동시 요청은 429 (0 = 제한 없음)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--token-delay', type=float, default=0.02, help="스트리밍 응답 조각 간 지연(초)")
+    args = parser.parse_args()
+    serve(args.port, args.latency, args.jitter, args.rate_limit_prob, args.error_prob, args.max_inflight, args.seed,
+          token_delay=args.token_delay)
+
+if __name__ == "__main__":
+    main()
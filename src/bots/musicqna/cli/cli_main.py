@@ -1,10 +1,11 @@
-import os
 from src.bots.musicqna.data_processing.json_loader import MusicTheoryDataLoader
 from src.bots.musicqna.data_processing.embedding_generator import EmbeddingGenerator
 from src.bots.musicqna.models.retriever import VectorRetriever
-from src.bots.musicqna.models.rag_model import RAGModel
+from src.bots.musicqna.models.rag_model import RAGModel, print_streaming_response
+from src.bots.musicqna.models.registry import get_registry
+from src.bots.musicqna.models.semantic_cache import SemanticAnswerCache
 
-def initialize_system():
+def initialize_system(use_semantic_cache: bool = False, use_templates: bool = False):
     print("🎵 음악 이론 RAG 시스템 초기화...")
 
     # 1. 데이터 로드
@@ -15,18 +16,11 @@ def initialize_system():
 
     # 2. 임베딩 처리
     embedder = EmbeddingGenerator()
-    embedding_dir = 'data/musicqna/embeddings'
-    embedding_path = os.path.join(embedding_dir, 'music_theory_embeddings.pkl')
 
-    # 임베딩 로드, 없으면 생성
-    if not embedder.load_embeddings():
-        print("   🔄 임베딩 로드 실패 또는 파일 없음! 임베딩 새로 생성 중...")
-        chunks = loader.extract_text_chunks()
-        embedder.generate_embeddings(chunks)
-        embedder.save_embeddings()
-        print("   ✅ 임베딩 생성 및 저장 완료!")
-    else:
-        print("   ✅ 임베딩 로드 완료!")
+    # 청크 텍스트 hash 비교로 신규/변경 청크만 encode (store 없으면 전체 생성, 변경 없으면 모델 로드 생략)
+    chunks = loader.extract_text_chunks()
+    stats = embedder.update_embeddings(chunks)
+    print(f"   ✅ 임베딩 준비 완료! (유지 {stats['kept']} / 신규·변경 {stats['added']} / 삭제 {stats['removed']})")
 
     # 3. 검색기(벡터) 초기화
     retriever = VectorRetriever()
@@ -36,25 +30,33 @@ def initialize_system():
         raise RuntimeError("검색기 인덱스 구축 실패!")
 
     # 4. RAG 모델 래퍼 초기화
-    rag_model = RAGModel(retriever)
+    # 대화형 CLI는 semantic answer cache / 정의형 질문 템플릿 답변 사용 (배치 평가는 매 질문 실제 생성이 필요하므로 기본 off)
+    rag_model = RAGModel(
+        retriever,
+        semantic_cache=SemanticAnswerCache() if use_semantic_cache else None,
+        use_templates=use_templates
+    )
     print("✅ RAG 시스템 객체 생성 성공!")
+    # 모델/임베딩/인덱스는 프로세스 전역 레지스트리에서 공유 → 메뉴 재진입 시 재사용
+    get_registry().print_report()
     return rag_model
 
 def main():
     """ (선택) CLI/manual 테스트 실행기 """
-    rag_model = initialize_system()
+    rag_model = initialize_system(use_semantic_cache=True, use_templates=True)
     print("\n🌱 (음악 이론 RAG) 자유 입력 CLI 모드입니다. 종료: exit/quit 입력\n")
     try:
         while True:
             query = input("\n질문(종료: exit): ")
             if query.strip().lower() in ["exit", "quit"]:
+                if rag_model.template_answerer is not None:
+                    rag_model.template_answerer.print_stats()
                 print("종료합니다.")
                 break
             # 실제 rag_model/retriever_inner 동작 로그 보기!
-            response = rag_model.get_conversation_response(query)
+            # 답변은 생성되는 대로 출력 (첫 토큰까지 / 전체 지연 시간 표시)
+            response = print_streaming_response(rag_model, query)
             topk_sources = response.get("sources", [])
-            print("\n[답변]")
-            print(response.get('answer', ''))
             print("\n[참고 passage 개수]:", len(topk_sources))
 
             # # === 🔍 상세 Top-K candidate 로그 확인 ===
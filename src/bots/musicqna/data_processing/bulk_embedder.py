@@ -0,0 +1,223 @@
+"""
+대용량 커리큘럼용 오프라인 벌크 임베딩 (CPU 전용 환경 대상)
+- 텍스트를 토큰 길이로 정렬 → 길이가 비슷한 텍스트끼리 bucket 구성 (padding 낭비 최소화)
+- bucket을 프로세스 풀에 분배 (워커마다 SentenceTransformer 1개, torch 스레드 분할)
+- 결과는 open_memmap으로 만든 디스크 행렬의 원래 행 위치에 바로 기록 (메모리 사용량 = 처리 중인 bucket 분)
+- bucket 완료마다 체크포인트 저장 → 중단 후 재실행 시 남은 bucket만 처리
+- 완료 시 행렬 파일을 그대로 임베딩 store로 편입 (header/chunks/text_hashes 기록)
+
+실행: python -m src.bots.musicqna.data_processing.bulk_embedder --workers 4 --bucket-size 512
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.bots.musicqna.data_processing.embedding_store import (
+    DEFAULT_STORE_PATH, DEFAULT_MODEL_NAME, SUPPORTED_DTYPES, adopt_matrix_file
+)
+from src.bots.musicqna.data_processing.embedding_generator import build_embedding_text, text_hash
+
+WORK_DIR = '.bulk'
+PARTIAL_MATRIX_FILE = 'embeddings.partial.npy'
+CHECKPOINT_FILE = 'checkpoint.json'
+
+# ===== 워커 프로세스 =====
+_worker_model = None
+
+def _init_worker(model_name: str, device: str, threads: int):
+    global _worker_model
+    import torch
+    from sentence_transformers import SentenceTransformer
+    torch.set_num_threads(max(1, threads))
+    _worker_model = SentenceTransformer(model_name, device=device)
+
+def _encode_bucket(bucket_id: int, rows: List[int], texts: List[str], batch_size: int):
+    vectors = _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    )
+    return bucket_id, rows, np.asarray(vectors, dtype=np.float32)
+
+# ===== 메인 프로세스 =====
+def token_lengths(texts: List[str], model_name: str) -> List[int]:
+    """모델 토크나이저 기준 토큰 길이 (토크나이저를 불러올 수 없으면 글자 수로 근사)"""
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        encoded = tokenizer(texts, add_special_tokens=True, truncation=False)['input_ids']
+        return [len(ids) for ids in encoded]
+    except Exception as e:
+        print(f"[bulk_embedder] 토크나이저 로드 실패 → 글자 수로 길이 근사: {e}")
+        return [len(t) for t in texts]
+
+def make_buckets(lengths: List[int], bucket_size: int) -> List[List[int]]:
+    """길이 오름차순 정렬 후 bucket_size 단위로 분할 (bucket = 원래 행 번호 리스트)"""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + bucket_size] for i in range(0, len(order), bucket_size)]
+
+def run_signature(hashes: List[str], model_name: str, dtype: str, bucket_size: int) -> str:
+    """입력/설정이 같은 실행인지 판별 (다르면 체크포인트 무효)"""
+    h = hashlib.sha256()
+    for part in (model_name, dtype, str(bucket_size)):
+        h.update(part.encode('utf-8'))
+        h.update(b'\x00')
+    for value in hashes:
+        h.update(value.encode('utf-8'))
+    return h.hexdigest()
+
+def _load_checkpoint(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _save_checkpoint(path: str, checkpoint: Dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def bulk_embed(
+    chunks: List[Dict],
+    store_path: str = DEFAULT_STORE_PATH,
+    model_name: str = DEFAULT_MODEL_NAME,
+    workers: int = None,
+    bucket_size: int = 512,
+    batch_size: int = 32,
+    dtype: str = 'float32',
+    device: str = 'cpu',
+    resume: bool = True
+) -> Dict:
+    """
+    chunks 전체를 임베딩해 store_path에 저장.
+    :return: {'count', 'encoded', 'resumed', 'elapsed_sec', 'chunks_per_sec', 'header'}
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"지원하지 않는 dtype: {dtype} (지원: {SUPPORTED_DTYPES})")
+    workers = workers or max(1, (os.cpu_count() or 1) // 2)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    t0 = time.perf_counter()
+    texts = [build_embedding_text(chunk) for chunk in chunks]
+    hashes = [text_hash(t) for t in texts]
+    buckets = make_buckets(token_lengths(texts, model_name), bucket_size)
+
+    work_dir = os.path.join(store_path, WORK_DIR)
+    os.makedirs(work_dir, exist_ok=True)
+    matrix_path = os.path.join(work_dir, PARTIAL_MATRIX_FILE)
+    checkpoint_path = os.path.join(work_dir, CHECKPOINT_FILE)
+    signature = run_signature(hashes, model_name, dtype, bucket_size)
+
+    checkpoint = _load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint and checkpoint.get('signature') == signature and os.path.exists(matrix_path):
+        done = set(checkpoint['done_buckets'])
+        matrix = np.lib.format.open_memmap(matrix_path, mode='r+')
+        print(f"🔁 체크포인트에서 재개: {len(done)}/{len(buckets)} bucket 완료")
+    else:
+        checkpoint = {'signature': signature, 'count': len(chunks), 'done_buckets': []}
+        done = set()
+        matrix = None  # 첫 결과에서 차원 확인 후 생성
+
+    pending = [b for b in range(len(buckets)) if b not in done]
+    resumed_rows = sum(len(buckets[b]) for b in done)
+    print(
+        f"🎵 벌크 임베딩: {len(chunks)}개 / bucket {len(buckets)}개(남은 {len(pending)}) / "
+        f"workers={workers} x threads={threads}, batch_size={batch_size}"
+    )
+
+    encoded = 0
+    t_encode = time.perf_counter()
+    if pending:
+        ctx = mp.get_context('spawn')  # torch + fork 조합의 교착 방지
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(model_name, device, threads)
+        ) as pool:
+            # 긴 bucket부터 제출 → 마지막에 긴 작업 하나만 남는 꼬리 지연 방지
+            futures = [
+                pool.submit(_encode_bucket, b, buckets[b], [texts[i] for i in buckets[b]], batch_size)
+                for b in reversed(pending)
+            ]
+            for future in as_completed(futures):
+                bucket_id, rows, vectors = future.result()
+                if matrix is None:
+                    matrix = np.lib.format.open_memmap(
+                        matrix_path, mode='w+', dtype=dtype, shape=(len(chunks), vectors.shape[1])
+                    )
+                matrix[rows] = vectors.astype(dtype)
+                matrix.flush()
+                checkpoint['done_buckets'].append(bucket_id)
+                _save_checkpoint(checkpoint_path, checkpoint)
+                encoded += len(rows)
+                rate = encoded / max(time.perf_counter() - t_encode, 1e-9)
+                print(
+                    f"   ✅ bucket {len(checkpoint['done_buckets'])}/{len(buckets)} "
+                    f"({resumed_rows + encoded}/{len(chunks)}개, {rate:.1f} chunks/sec)"
+                )
+
+    if matrix is None:
+        raise RuntimeError("임베딩할 청크가 없습니다.")
+    del matrix
+    header = adopt_matrix_file(
+        store_path, matrix_path, chunks, model_name, text_hashes=hashes
+    )
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    if os.path.isdir(work_dir) and not os.listdir(work_dir):
+        os.rmdir(work_dir)
+
+    elapsed = time.perf_counter() - t0
+    encode_sec = time.perf_counter() - t_encode
+    stats = {
+        'count': len(chunks),
+        'encoded': encoded,
+        'resumed': resumed_rows,
+        'elapsed_sec': elapsed,
+        'chunks_per_sec': encoded / encode_sec if encoded and encode_sec > 0 else 0.0,
+        'header': header
+    }
+    print(
+        f"✅ 벌크 임베딩 완료: {len(chunks)}개 → {store_path} "
+        f"(이번 실행 {encoded}개, {stats['chunks_per_sec']:.1f} chunks/sec, 총 {elapsed:.1f}s)"
+    )
+    return stats
+
+def main():
+    from src.bots.musicqna.data_processing.json_loader import MusicTheoryDataLoader
+    parser = argparse.ArgumentParser(description="길이 bucket + 멀티프로세스 오프라인 벌크 임베딩")
+    parser.add_argument('--data', default='data/musicqna/processed/music_theory_curriculum.json')
+    parser.add_argument('--out', default=DEFAULT_STORE_PATH)
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--bucket-size', type=int, default=512)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--dtype', default='float32', choices=SUPPORTED_DTYPES)
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--no-resume', action='store_true')
+    args = parser.parse_args()
+
+    loader = MusicTheoryDataLoader(args.data)
+    chunks = loader.extract_text_chunks()
+    if not chunks:
+        raise RuntimeError("청크가 없습니다.")
+    bulk_embed(
+        chunks, store_path=args.out, model_name=args.model, workers=args.workers,
+        bucket_size=args.bucket_size, batch_size=args.batch_size, dtype=args.dtype,
+        device=args.device, resume=not args.no_resume
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,179 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Tuple
-import pickle
 import os
+import time
+import hashlib
 import torch
+from src.bots.musicqna.data_processing.embedding_store import (
+    DEFAULT_STORE_PATH, save_embedding_store
+)
+from src.bots.musicqna.data_processing.projection import fit_projection, save_projection
+from src.bots.musicqna.models.index_store import index_dir_for, update_indexes_in_place
+from src.bots.musicqna.models.registry import get_registry
+
+def build_embedding_text(chunk: Dict) -> str:
+    # 용어 강조 + 주요 필드 조합 (태그 부여로 weighting 효과)
+    parts = [
+        f"[KEYWORD] {chunk.get('concept.ko', '')}",
+        f"[KEYWORD_EN] {chunk.get('concept.en', '')}",
+        f"[ALIAS] {chunk.get('aliases', '')}",
+        f"[DEF] {chunk.get('definition', '')}",
+        f"[LOGIC] {chunk.get('logic', '')}",
+        f"[EX_NAME] {chunk.get('examples.name', '')}",
+        f"[EX_DESC] {chunk.get('examples.description', '')}",
+        f"[TIPS] {chunk.get('tips', '')}",
+        f"[PREQ_KO] {chunk.get('prerequisites.ko', '')}",
+        f"[PREQ_EN] {chunk.get('prerequisites.en', '')}"
+    ]
+    return ' '.join([part for part in parts if part and part != ''])
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
 
 class EmbeddingGenerator:
     def __init__(
         self, 
         model_name: str = None, 
-        embedding_path: str = 'data/musicqna/embeddings/music_theory_embeddings.pkl'
+        embedding_path: str = DEFAULT_STORE_PATH
     ):
         if model_name is None:
             model_name = "intfloat/multilingual-e5-large"
-        print(f"🎵 임베딩 모델 로딩: {model_name}")
 
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        print(f"🖥️ 사용 디바이스: {self.device}")
 
-        self.model = SentenceTransformer(model_name, device=self.device)
+        # 모델은 실제 encode가 필요할 때 로드 (store가 최신이면 로드하지 않음)
+        self._model = None
         self.model_name = model_name
         self.embedding_path = embedding_path
         self.embeddings = None
         self.chunks = None
+        self.header = None
+        self.text_hashes = None
 
-    def generate_embeddings(self, text_chunks: List[Dict]) -> np.ndarray:
-        texts = []
-        for chunk in text_chunks:
-            # 용어 강조 + 주요 필드 조합 (태그 부여로 weighting 효과)
-            parts = [
-                f"[KEYWORD] {chunk.get('concept.ko', '')}",
-                f"[KEYWORD_EN] {chunk.get('concept.en', '')}",
-                f"[ALIAS] {chunk.get('aliases', '')}",
-                f"[DEF] {chunk.get('definition', '')}",
-                f"[LOGIC] {chunk.get('logic', '')}",
-                f"[EX_NAME] {chunk.get('examples.name', '')}",
-                f"[EX_DESC] {chunk.get('examples.description', '')}",
-                f"[TIPS] {chunk.get('tips', '')}",
-                f"[PREQ_KO] {chunk.get('prerequisites.ko', '')}",
-                f"[PREQ_EN] {chunk.get('prerequisites.en', '')}"
-            ]
-            combined_text = ' '.join([part for part in parts if part and part != ''])
-            texts.append(combined_text)
-        
-        print(f"🎵 {len(texts)}개의 텍스트에 대한 임베딩 생성 중...")
-        embeddings = self.model.encode(
+    @property
+    def model(self):
+        # 프로세스 전역 레지스트리의 공유 모델 사용 (VectorRetriever와 같은 인스턴스)
+        if self._model is None:
+            self._model = get_registry().get_model(self.model_name, self.device)
+        return self._model
+
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
             texts,
             batch_size=32,
             show_progress_bar=True,
             normalize_embeddings=True,
             convert_to_numpy=True
         )
+
+    def generate_embeddings(self, text_chunks: List[Dict]) -> np.ndarray:
+        texts = [build_embedding_text(chunk) for chunk in text_chunks]
+
+        print(f"🎵 {len(texts)}개의 텍스트에 대한 임베딩 생성 중...")
+        embeddings = self._encode_texts(texts)
         self.embeddings = embeddings
         self.chunks = text_chunks
+        self.text_hashes = [text_hash(t) for t in texts]
         print(f"✅ 임베딩 생성 완료: shape {embeddings.shape}")
         return embeddings
 
-    def save_embeddings(self):
-        os.makedirs(os.path.dirname(self.embedding_path), exist_ok=True)
-        embedding_data = {
-            'embeddings': self.embeddings.tolist(),
-            'chunks': self.chunks,
-            'model_name': self.model_name
+    def update_embeddings(self, text_chunks: List[Dict], dtype: str = 'float32') -> Dict:
+        """
+        증분 재생성: 청크별 임베딩 입력 텍스트 hash를 기존 store와 비교해
+        신규/변경 청크만 encode, 삭제된 청크는 제거, 저장된 FAISS 인덱스는 제자리 갱신.
+        새 행 순서 = 유지된 기존 행(기존 순서) + 신규/변경 행.
+        store가 없으면 전체 생성.
+        """
+        t0 = time.perf_counter()
+        texts = [build_embedding_text(chunk) for chunk in text_chunks]
+        hashes = [text_hash(t) for t in texts]
+
+        if not os.path.exists(self.embedding_path):
+            self.generate_embeddings(text_chunks)
+            self.save_embeddings(dtype=dtype)
+            return {'kept': 0, 'added': len(text_chunks), 'removed': 0, 'elapsed_sec': time.perf_counter() - t0}
+
+        store = get_registry().get_store(self.embedding_path)
+        old_embeddings = store['embeddings']
+        old_hashes = store.get('text_hashes') or [text_hash(build_embedding_text(c)) for c in store['chunks']]
+        old_content_hash = (store.get('header') or {}).get('content_hash')
+        if store.get('model_name') and store['model_name'] != self.model_name:
+            print(f"⚠️ store 모델({store['model_name']})과 현재 모델({self.model_name})이 달라 전체 재생성합니다.")
+            self.generate_embeddings(text_chunks)
+            self.save_embeddings(dtype=dtype)
+            return {'kept': 0, 'added': len(text_chunks), 'removed': len(old_hashes), 'elapsed_sec': time.perf_counter() - t0}
+
+        # hash → 새 청크 위치 (동일 텍스트 중복 청크도 개수만큼 매칭)
+        new_positions = {}
+        for pos, h in enumerate(hashes):
+            new_positions.setdefault(h, []).append(pos)
+
+        kept_rows, kept_positions, removed_rows = [], [], []
+        for row, h in enumerate(old_hashes):
+            if new_positions.get(h):
+                kept_rows.append(row)
+                kept_positions.append(new_positions[h].pop(0))
+            else:
+                removed_rows.append(row)
+        added_positions = sorted(p for positions in new_positions.values() for p in positions)
+
+        if not added_positions and not removed_rows:
+            # 텍스트 변화 없음: 메타데이터(node_id, parent_id 등)만 바뀌었을 수 있으므로 청크만 갱신
+            chunks = [text_chunks[p] for p in kept_positions]
+            if chunks == store['chunks']:
+                print(f"✅ 임베딩 최신 상태: 변경 없음 ({len(chunks)}개)")
+                self.embeddings, self.chunks = old_embeddings, store['chunks']
+                self.header, self.text_hashes = store.get('header'), old_hashes
+                return {'kept': len(kept_rows), 'added': 0, 'removed': 0, 'elapsed_sec': time.perf_counter() - t0}
+
+        print(f"🔄 증분 재생성: 유지 {len(kept_rows)} / 신규·변경 {len(added_positions)} / 삭제 {len(removed_rows)}")
+        dim = old_embeddings.shape[1]
+        if added_positions:
+            added_vectors = np.asarray(self._encode_texts([texts[p] for p in added_positions]), dtype=np.float32)
+        else:
+            added_vectors = np.zeros((0, dim), dtype=np.float32)
+
+        self.embeddings = np.concatenate([
+            np.asarray(old_embeddings[kept_rows], dtype=np.float32),
+            added_vectors
+        ])
+        self.chunks = [text_chunks[p] for p in kept_positions + added_positions]
+        self.text_hashes = [hashes[p] for p in kept_positions + added_positions]
+        self.save_embeddings(dtype=dtype)
+
+        index_stats = update_indexes_in_place(
+            index_dir_for(self.embedding_path), old_content_hash, self.header['content_hash'],
+            removed_rows, np.asarray(self.embeddings[len(kept_rows):], dtype=np.float32)
+        )
+        stats = {
+            'kept': len(kept_rows),
+            'added': len(added_positions),
+            'removed': len(removed_rows),
+            'index_updated': index_stats['updated'],
+            'index_dropped': index_stats['dropped'],
+            'elapsed_sec': time.perf_counter() - t0
         }
-        with open(self.embedding_path, 'wb') as f:
-            pickle.dump(embedding_data, f)
-        print(f"✅ 임베딩 저장 완료: {len(self.chunks)}개, {self.embedding_path}")
+        print(f"✅ 증분 재생성 완료: {stats}")
+        return stats
+
+    def save_embeddings(self, dtype: str = 'float32'):
+        """임베딩 store 저장 (dtype: float32 | float16)"""
+        if self.text_hashes is None or len(self.text_hashes) != len(self.chunks):
+            self.text_hashes = [text_hash(build_embedding_text(c)) for c in self.chunks]
+        self.header = save_embedding_store(
+            self.embedding_path, self.embeddings, self.chunks, self.model_name, dtype=dtype,
+            text_hashes=self.text_hashes
+        )
+        print(f"✅ 임베딩 저장 완료: {len(self.chunks)}개, {self.embedding_path} ({dtype})")
 
     def load_embeddings(self) -> bool:
         try:
-            with open(self.embedding_path, 'rb') as f:
-                embedding_data = pickle.load(f)
-            self.embeddings = np.array(embedding_data['embeddings'])
-            self.chunks = embedding_data['chunks']
-            self.model_name = embedding_data.get('model_name', 'unknown')
+            store = get_registry().get_store(self.embedding_path)
+            self.embeddings = store['embeddings']
+            self.chunks = store['chunks']
+            self.model_name = store.get('model_name') or 'unknown'
+            self.header = store.get('header')
+            self.text_hashes = store.get('text_hashes')
             print(f"✅ 임베딩 로드 완료: {len(self.chunks)}개, 모델: {self.model_name}")
             return True
         except FileNotFoundError:
@@ -83,6 +183,22 @@ class EmbeddingGenerator:
             print(f"❌ 임베딩 로드 중 오류: {e}")
             return False
 
+    def fit_projection(self, dim: int, method: str = 'pca', save: bool = True) -> Dict:
+        """
+        저장된 청크 임베딩으로 차원 축소 projection 학습 후 store에 저장.
+        VectorRetriever(projection_dim=dim)가 청크/쿼리 임베딩 모두에 적용.
+        """
+        if self.embeddings is None:
+            raise ValueError("임베딩이 생성되거나 로드되지 않았습니다.")
+        projection = fit_projection(self.embeddings, dim, method=method)
+        projection['content_hash'] = (self.header or {}).get('content_hash')
+        if save:
+            path = save_projection(self.embedding_path, projection)
+            explained = projection['explained_variance']
+            explained_str = f", 설명 분산 {explained:.1%}" if explained is not None else ""
+            print(f"✅ projection 저장 완료: {self.embeddings.shape[1]} → {dim} ({method}{explained_str}), {path}")
+        return projection
+
     def get_embeddings(self) -> Tuple[np.ndarray, List[Dict]]:
         if self.embeddings is None or self.chunks is None:
             raise ValueError("임베딩이 생성되거나 로드되지 않았습니다.")
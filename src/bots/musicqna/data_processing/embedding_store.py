@@ -0,0 +1,226 @@
+import os
+import json
+import pickle
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 버전 관리되는 임베딩 저장 포맷
+#   <store_dir>/header.json     : format_version, model_name, dim, count, dtype, content_hash
+#   <store_dir>/embeddings.npy  : 연속(contiguous) float32/float16 행렬 (np.memmap 으로 zero-copy 로드)
+#   <store_dir>/chunks.json     : 청크 메타데이터 (행 순서 = 임베딩 행 순서)
+#   <store_dir>/text_hashes.json: 행별 임베딩 입력 텍스트 hash (증분 재생성용)
+STORE_FORMAT_VERSION = 1
+DEFAULT_STORE_PATH = 'data/musicqna/embeddings/music_theory_store'
+LEGACY_PICKLE_PATH = 'data/musicqna/embeddings/music_theory_embeddings.pkl'
+DEFAULT_MODEL_NAME = 'intfloat/multilingual-e5-large'
+
+HEADER_FILE = 'header.json'
+MATRIX_FILE = 'embeddings.npy'
+CHUNKS_FILE = 'chunks.json'
+TEXT_HASHES_FILE = 'text_hashes.json'
+
+SUPPORTED_DTYPES = ('float32', 'float16')
+
+def compute_content_hash(embeddings: np.ndarray, chunks: List[Dict], block_rows: int = 4096) -> str:
+    """임베딩 행렬(저장 dtype 기준 바이트) + 청크 메타데이터의 sha256"""
+    h = hashlib.sha256()
+    h.update(str(embeddings.dtype).encode())
+    h.update(str(tuple(embeddings.shape)).encode())
+    # memmap 전체를 한 번에 읽지 않도록 블록 단위로 해싱
+    for start in range(0, len(embeddings), block_rows):
+        h.update(np.ascontiguousarray(embeddings[start:start + block_rows]).tobytes())
+    h.update(json.dumps(chunks, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+def is_legacy_pickle(path: str) -> bool:
+    return path.endswith('.pkl')
+
+def save_embedding_store(
+    store_path: str,
+    embeddings: np.ndarray,
+    chunks: List[Dict],
+    model_name: str,
+    dtype: str = 'float32',
+    extra_header: Optional[Dict] = None,
+    text_hashes: Optional[List[str]] = None
+) -> Dict:
+    """임베딩 행렬/청크/헤더를 store_path 디렉토리에 저장하고 header를 반환"""
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"지원하지 않는 dtype: {dtype} (지원: {SUPPORTED_DTYPES})")
+    matrix = np.ascontiguousarray(embeddings, dtype=dtype)
+    if matrix.ndim != 2 or len(matrix) != len(chunks):
+        raise ValueError(f"임베딩 shape {matrix.shape} 와 청크 수 {len(chunks)} 가 맞지 않습니다.")
+
+    os.makedirs(store_path, exist_ok=True)
+    # 임시 파일에 쓴 뒤 rename → 저장 도중 중단돼도 행렬/메타데이터가 섞인 store가 남지 않음 (_commit_store 참고)
+    matrix_tmp = os.path.join(store_path, MATRIX_FILE) + '.tmp'
+    with open(matrix_tmp, 'wb') as f:
+        np.save(f, matrix)
+    header = _build_header(matrix, chunks, model_name, dtype, extra_header)
+    _commit_store(store_path, matrix_tmp, header, chunks, text_hashes)
+    return header
+
+def adopt_matrix_file(
+    store_path: str,
+    matrix_path: str,
+    chunks: List[Dict],
+    model_name: str,
+    extra_header: Optional[Dict] = None,
+    text_hashes: Optional[List[str]] = None
+) -> Dict:
+    """
+    이미 디스크에 있는 .npy 행렬(open_memmap 등으로 스트리밍 기록)을 store로 편입.
+    행렬 전체를 메모리에 올리지 않고 블록 해싱으로 header 생성 후 rename.
+    """
+    matrix = np.load(matrix_path, mmap_mode='r')
+    dtype = str(matrix.dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"지원하지 않는 dtype: {dtype} (지원: {SUPPORTED_DTYPES})")
+    if matrix.ndim != 2 or len(matrix) != len(chunks):
+        raise ValueError(f"임베딩 shape {matrix.shape} 와 청크 수 {len(chunks)} 가 맞지 않습니다.")
+
+    os.makedirs(store_path, exist_ok=True)
+    header = _build_header(matrix, chunks, model_name, dtype, extra_header)
+    del matrix
+    _commit_store(store_path, matrix_path, header, chunks, text_hashes)
+    return header
+
+def _build_header(matrix, chunks, model_name, dtype, extra_header) -> Dict:
+    header = {
+        'format_version': STORE_FORMAT_VERSION,
+        'model_name': model_name,
+        'dim': int(matrix.shape[1]),
+        'count': int(matrix.shape[0]),
+        'dtype': dtype,
+        'content_hash': compute_content_hash(matrix, chunks),
+        'created_at': datetime.now().isoformat()
+    }
+    if extra_header:
+        header.update(extra_header)
+    return header
+
+def _commit_store(store_path, matrix_src, header, chunks, text_hashes):
+    """
+    행렬 파일(matrix_src)과 메타데이터로 store 파일 교체.
+    메타데이터를 모두 임시 파일로 먼저 쓰고, 기존 header 삭제 → 행렬 → 청크/hash → header 순으로 rename
+    (header 존재 = store 완성: 중간에 중단되면 header 없는 store가 남아 로드 시 오류가 나고,
+     새 행렬 + 이전 헤더/청크 같은 불일치 store는 생기지 않음)
+    """
+    if text_hashes is not None and len(text_hashes) != len(chunks):
+        raise ValueError(f"text_hashes 수 {len(text_hashes)} 와 청크 수 {len(chunks)} 가 맞지 않습니다.")
+    staged = [(CHUNKS_FILE, json.dumps(chunks, ensure_ascii=False).encode('utf-8'))]
+    if text_hashes is not None:
+        staged.append((TEXT_HASHES_FILE, json.dumps(text_hashes).encode('utf-8')))
+    staged.append((HEADER_FILE, json.dumps(header, ensure_ascii=False, indent=2).encode('utf-8')))
+    for name, data in staged:
+        with open(os.path.join(store_path, name) + '.tmp', 'wb') as f:
+            f.write(data)
+
+    header_path = os.path.join(store_path, HEADER_FILE)
+    if os.path.exists(header_path):
+        os.remove(header_path)
+    hashes_path = os.path.join(store_path, TEXT_HASHES_FILE)
+    if text_hashes is None and os.path.exists(hashes_path):
+        # 이전 행렬 기준 hash가 남지 않도록
+        os.remove(hashes_path)
+    os.replace(matrix_src, os.path.join(store_path, MATRIX_FILE))
+    for name, _ in staged:
+        path = os.path.join(store_path, name)
+        os.replace(path + '.tmp', path)
+
+def read_store_header(store_path: str) -> Dict:
+    header_path = os.path.join(store_path, HEADER_FILE)
+    if not os.path.exists(header_path):
+        raise FileNotFoundError(f"임베딩 store 헤더가 존재하지 않습니다: {header_path}")
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    version = header.get('format_version')
+    if version != STORE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 store 버전: {version} (현재: {STORE_FORMAT_VERSION})")
+    return header
+
+def load_embedding_store(store_path: str, mmap: bool = True) -> Dict:
+    """
+    임베딩 store 로드.
+    - mmap=True: embeddings는 읽기 전용 np.memmap (zero-copy, 필요한 페이지만 메모리에 올라감)
+    - store_path가 구버전 .pkl 이면 호환 로드 (convert_pickle_to_store 로 마이그레이션 권장)
+    :return: {'embeddings', 'chunks', 'model_name', 'header', 'text_hashes'(없으면 None)}
+    """
+    if is_legacy_pickle(store_path):
+        return load_legacy_pickle(store_path)
+
+    header = read_store_header(store_path)
+    embeddings = np.load(os.path.join(store_path, MATRIX_FILE), mmap_mode='r' if mmap else None)
+    with open(os.path.join(store_path, CHUNKS_FILE), 'r', encoding='utf-8') as f:
+        chunks = json.load(f)
+    if embeddings.shape != (header['count'], header['dim']):
+        raise ValueError(
+            f"store 헤더와 행렬 shape 불일치: header=({header['count']}, {header['dim']}), matrix={embeddings.shape}"
+        )
+    text_hashes = None
+    hashes_path = os.path.join(store_path, TEXT_HASHES_FILE)
+    if os.path.exists(hashes_path):
+        with open(hashes_path, 'r', encoding='utf-8') as f:
+            text_hashes = json.load(f)
+        if len(text_hashes) != len(chunks):
+            text_hashes = None
+    return {
+        'embeddings': embeddings,
+        'chunks': chunks,
+        'model_name': header.get('model_name', DEFAULT_MODEL_NAME),
+        'header': header,
+        'text_hashes': text_hashes
+    }
+
+def load_legacy_pickle(pkl_path: str) -> Dict:
+    """구버전(list-of-floats pickle) 임베딩 로드"""
+    with open(pkl_path, 'rb') as f:
+        obj = pickle.load(f)
+    arr = obj.get('embeddings', None)
+    if arr is not None and not isinstance(arr, np.ndarray):
+        arr = np.array(arr, dtype=np.float32)
+    chunks = obj.get('chunks', None)
+    model_name = obj.get('model_name', DEFAULT_MODEL_NAME)
+    header = None
+    if arr is not None and chunks is not None:
+        header = {
+            'format_version': 0,
+            'model_name': model_name,
+            'dim': int(arr.shape[1]),
+            'count': int(arr.shape[0]),
+            'dtype': str(arr.dtype),
+            'content_hash': compute_content_hash(arr, chunks)
+        }
+    return {'embeddings': arr, 'chunks': chunks, 'model_name': model_name, 'header': header, 'text_hashes': None}
+
+def convert_pickle_to_store(
+    pkl_path: str = LEGACY_PICKLE_PATH,
+    store_path: str = DEFAULT_STORE_PATH,
+    dtype: str = 'float32'
+) -> Dict:
+    """구버전 pickle → 신규 store 마이그레이션"""
+    obj = load_legacy_pickle(pkl_path)
+    if obj['embeddings'] is None or obj['chunks'] is None:
+        raise ValueError(f"pickle에 embeddings/chunks가 없습니다: {pkl_path}")
+    header = save_embedding_store(store_path, obj['embeddings'], obj['chunks'], obj['model_name'], dtype=dtype)
+    old_mb = os.path.getsize(pkl_path) / (1024 * 1024)
+    new_mb = os.path.getsize(os.path.join(store_path, MATRIX_FILE)) / (1024 * 1024)
+    print(f"✅ 마이그레이션 완료: {pkl_path} ({old_mb:.2f}MB) → {store_path} (행렬 {new_mb:.2f}MB, {dtype})")
+    return header
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="구버전 임베딩 pickle → memmap store 변환기")
+    parser.add_argument('--pkl', default=LEGACY_PICKLE_PATH)
+    parser.add_argument('--out', default=DEFAULT_STORE_PATH)
+    parser.add_argument('--dtype', default='float32', choices=SUPPORTED_DTYPES)
+    args = parser.parse_args()
+    header = convert_pickle_to_store(args.pkl, args.out, args.dtype)
+    for key, value in header.items():
+        print(f"  - {key}: {value}")
+
+if __name__ == "__main__":
+    main()
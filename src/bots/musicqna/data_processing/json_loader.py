@@ -11,6 +11,7 @@ class MusicTheoryDataLoader:
         self.json_path = json_path
         self.data: Optional[List[Dict]] = None
         self.chunks: List[Dict] = []
+        self._search_texts: Optional[List[str]] = None
 
     def load_data(self) -> List[Dict]:
         """JSON 파일 로드"""
@@ -36,6 +37,7 @@ class MusicTheoryDataLoader:
         if self.data is None:
             self.load_data()
         self.chunks = self.data
+        self._search_texts = None
         print(f"✅ {len(self.chunks)}개의 청크 로드 완료")
         return self.chunks
 
@@ -51,24 +53,26 @@ class MusicTheoryDataLoader:
         if not self.chunks:
             self.extract_text_chunks()
 
+        # 청크별 검색용 문자열은 최초 1회만 생성 (BM25 순위 검색은 models/sparse_retriever.py 참고)
+        if self._search_texts is None:
+            self._search_texts = [
+                ' '.join([
+                    str(chunk.get('concept.ko', '')),
+                    str(chunk.get('concept.en', '')),
+                    str(chunk.get('aliases', '')),
+                    str(chunk.get('definition', '')),
+                    str(chunk.get('logic', '')),
+                    str(chunk.get('examples.name', '')),
+                    str(chunk.get('examples.description', '')),
+                    str(chunk.get('tips', '')),
+                    str(chunk.get('prerequisites.ko', '')),
+                    str(chunk.get('prerequisites.en', ''))
+                ]).lower()
+                for chunk in self.chunks
+            ]
+
         keyword_lower = keyword.lower()
-        results = []
-        for chunk in self.chunks:
-            joined = ' '.join([
-                str(chunk.get('concept.ko', '')),
-                str(chunk.get('concept.en', '')),
-                str(chunk.get('aliases', '')),
-                str(chunk.get('definition', '')),
-                str(chunk.get('logic', '')),
-                str(chunk.get('examples.name', '')),
-                str(chunk.get('examples.description', '')),
-                str(chunk.get('tips', '')),
-                str(chunk.get('prerequisites.ko', '')),
-                str(chunk.get('prerequisites.en', ''))
-            ]).lower()
-            if keyword_lower in joined:
-                results.append(chunk)
-        return results
+        return [chunk for chunk, joined in zip(self.chunks, self._search_texts) if keyword_lower in joined]
 
     def get_statistics(self) -> Dict:
         """데이터 통계"""
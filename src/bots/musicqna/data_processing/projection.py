@@ -0,0 +1,88 @@
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+# 임베딩 차원 축소(projection) 저장: <store_dir>/projection_<dim>.npz
+# (mean, components, method, 학습에 쓰인 임베딩 store의 content_hash)
+PROJECTION_METHODS = ('pca', 'random')
+
+def fit_projection(embeddings: np.ndarray, dim: int, method: str = 'pca', seed: int = 42) -> Dict:
+    """
+    (n, d) 임베딩 → (d → dim) projection 학습.
+    - pca: 평균 중심화 후 SVD 상위 dim개 주성분 (dim <= min(n, d) 이어야 함)
+    - random: 정규직교 랜덤 projection (샘플 수와 무관, Johnson-Lindenstrauss)
+    """
+    x = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n, d = x.shape
+    if method not in PROJECTION_METHODS:
+        raise ValueError(f"지원하지 않는 projection 방식: {method} (지원: {PROJECTION_METHODS})")
+    if dim >= d:
+        raise ValueError(f"projection 차원({dim})은 원본 차원({d})보다 작아야 합니다.")
+
+    if method == 'pca':
+        if dim > min(n, d):
+            raise ValueError(
+                f"PCA: 샘플 수({n})보다 큰 차원({dim})은 학습할 수 없습니다. method='random'을 사용하세요."
+            )
+        mean = x.mean(axis=0)
+        _, singular, vt = np.linalg.svd(x - mean, full_matrices=False)
+        components = vt[:dim]
+        explained = float((singular[:dim] ** 2).sum() / (singular ** 2).sum())
+    else:
+        rng = np.random.default_rng(seed)
+        q, _ = np.linalg.qr(rng.standard_normal((d, dim)).astype(np.float32))
+        mean = np.zeros(d, dtype=np.float32)
+        components = q.T
+        explained = None
+
+    return {
+        'method': method,
+        'dim': dim,
+        'mean': mean.astype(np.float32),
+        'components': np.ascontiguousarray(components, dtype=np.float32),
+        'explained_variance': explained
+    }
+
+def apply_projection(x: np.ndarray, projection: Dict) -> np.ndarray:
+    """(n, d) 또는 (d,) → 투영 후 L2 정규화 (inner product = cosine 유지)"""
+    single = x.ndim == 1
+    x = np.atleast_2d(np.asarray(x, dtype=np.float32))
+    y = (x - projection['mean']) @ projection['components'].T
+    y /= np.linalg.norm(y, axis=1, keepdims=True).clip(min=1e-12)
+    y = np.ascontiguousarray(y, dtype=np.float32)
+    return y[0] if single else y
+
+def projection_path(store_path: str, dim: int) -> str:
+    return os.path.join(store_path, f"projection_{dim}.npz")
+
+def save_projection(store_path: str, projection: Dict) -> str:
+    path = projection_path(store_path, projection['dim'])
+    tmp_path = path + '.tmp.npz'
+    np.savez(
+        tmp_path,
+        mean=projection['mean'],
+        components=projection['components'],
+        method=np.array(projection['method']),
+        explained_variance=np.array(
+            -1.0 if projection['explained_variance'] is None else projection['explained_variance']
+        ),
+        content_hash=np.array(projection.get('content_hash') or '')
+    )
+    os.replace(tmp_path, path)
+    return path
+
+def load_projection(store_path: str, dim: int) -> Optional[Dict]:
+    path = projection_path(store_path, dim)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        explained = float(data['explained_variance'])
+        return {
+            'method': str(data['method']),
+            'dim': int(data['components'].shape[0]),
+            'mean': data['mean'],
+            'components': data['components'],
+            'explained_variance': None if explained < 0 else explained,
+            'content_hash': str(data['content_hash']) or None
+        }
@@ -0,0 +1,107 @@
+"""
+참고자료 context 패킹 벤치마크 (auto_questions.json 검색 결과 기준, LLM 호출 없음)
+- legacy: 기존 포맷 (passage 2개, definition/logic 300자 자르기)
+- packed: ContextPacker (토큰 예산 + concept_type별 필드 우선순위 + 부모/자식 중복 제거)
+- 지표: 프롬프트 토큰 평균/p95/최대, 잘린 필드 수, 생략된 필드 수
+
+실행: python -m src.bots.musicqna.eval.benchmark_context_packer --budgets 400,600,800
+"""
+import json
+import argparse
+
+import numpy as np
+
+from src.bots.musicqna.prompts.prompts import MUSICQNA_SYSTEM_PROMPT
+from src.bots.musicqna.utils.context_packer import ContextPacker, TokenCounter
+
+LEGACY_MAX_PASSAGE = 2
+LEGACY_MAX_LENGTH = 300
+
+def legacy_format(sources):
+    """변경 전 RAGModel._format_sources_for_prompt → (text, 잘린 필드 수)"""
+    formatted, cut = "", 0
+    for idx, source in enumerate(sources[:LEGACY_MAX_PASSAGE], 1):
+        definition = source.get('definition', '') or ''
+        logic = source.get('logic', '') or ''
+        cut += int(len(definition) > LEGACY_MAX_LENGTH) + int(len(logic) > LEGACY_MAX_LENGTH)
+        definition = (definition[:LEGACY_MAX_LENGTH] + "...") if len(definition) > LEGACY_MAX_LENGTH else definition
+        logic = (logic[:LEGACY_MAX_LENGTH] + "...") if len(logic) > LEGACY_MAX_LENGTH else logic
+        formatted += (
+            f"\n[참고자료 {idx}]\n"
+            f"용어(한글): {source.get('concept.ko', '') or ''}\n"
+            f"용어(영문): {source.get('concept.en', '') or ''}\n"
+            f"동의어·유사 표기: {source.get('aliases', '') or ''}\n"
+            f"[정의]: {definition}\n"
+            f"[원리]: {logic}\n"
+        )
+        if source.get('examples.name'):
+            formatted += f"예시: {source['examples.name']}\n"
+            if source.get('examples.description'):
+                formatted += f"예시 설명: {source['examples.description']}\n"
+        if source.get('tips'):
+            formatted += f"[팁]: {source['tips']}\n"
+        formatted += "-" * 28
+    return formatted, cut
+
+def prompt_tokens(counter, question, context):
+    user = f"질문: {question}\n\n{context}" if context.strip() else f"질문: {question}\n\n(참고자료가 없습니다.)"
+    return counter.count_messages([
+        {"role": "system", "content": MUSICQNA_SYSTEM_PROMPT},
+        {"role": "user", "content": user}
+    ])
+
+def summarize(name, tokens, truncated, dropped=None):
+    arr = np.array(tokens)
+    return {
+        'name': name,
+        'mean': float(arr.mean()), 'p95': float(np.percentile(arr, 95)), 'max': int(arr.max()),
+        'truncated': truncated, 'dropped': dropped
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="토큰 예산 context 패킹 vs 기존 포맷 프롬프트 토큰 비교")
+    parser.add_argument('--budgets', default='400,600,800')
+    parser.add_argument('--top-k', type=int, default=2)
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--model', default='gpt-3.5-turbo')
+    args = parser.parse_args()
+
+    with open("data/musicqna/processed/auto_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    if args.limit:
+        questions = questions[:args.limit]
+
+    from src.bots.musicqna.models.retriever import VectorRetriever
+    retriever = VectorRetriever()
+    retriever.build_index()
+    texts = [q["question"] for q in questions]
+    batch_sources = retriever.search_batch(texts, top_k=args.top_k)
+
+    counter = TokenCounter(args.model)
+    rows = []
+    legacy_tokens, legacy_cut = [], 0
+    for question, sources in zip(texts, batch_sources):
+        text, cut = legacy_format(sources)
+        legacy_tokens.append(prompt_tokens(counter, question, text))
+        legacy_cut += cut
+    rows.append(summarize('legacy', legacy_tokens, legacy_cut))
+
+    for budget in [int(b) for b in args.budgets.split(',') if b.strip()]:
+        packer = ContextPacker(args.model, budget, counter=counter)
+        tokens, truncated, dropped = [], 0, 0
+        for question, sources in zip(texts, batch_sources):
+            packed = packer.pack(sources)
+            tokens.append(prompt_tokens(counter, question, packed['text']))
+            truncated += packed['truncated']
+            dropped += packed['dropped']
+        rows.append(summarize(f'packed@{budget}', tokens, truncated, dropped))
+
+    print(f"\n📊 context 패킹 벤치마크 (질문 {len(texts)}개, top_k={args.top_k}, tokenizer={counter.backend})")
+    print(f"{'mode':<14} {'mean':>8} {'p95':>8} {'max':>6} {'truncated':>10} {'dropped':>8}")
+    for r in rows:
+        dropped = r['dropped'] if r['dropped'] is not None else '-'
+        print(f"{r['name']:<14} {r['mean']:>8.1f} {r['p95']:>8.1f} {r['max']:>6} {r['truncated']:>10} {dropped:>8}")
+    return rows
+
+if __name__ == "__main__":
+    main()
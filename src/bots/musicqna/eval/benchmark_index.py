@@ -0,0 +1,97 @@
+"""
+FAISS 인덱스 타입별 recall/지연 벤치마크
+- 대상: 실제 임베딩 store + 실제 임베딩을 노이즈로 복제한 합성 scale-up 데이터
+- 쿼리: 임베딩 행에 노이즈를 더해 정규화한 벡터 (encoder 없이 실행 가능)
+- 지표: flat(exact) 대비 recall@k, QPS, 빌드 시간, 인덱스 메모리(직렬화 크기)
+
+실행: python -m src.bots.musicqna.eval.benchmark_index --sizes real,10000,100000 --k 5
+"""
+import time
+import argparse
+
+import numpy as np
+
+from src.bots.musicqna.data_processing.embedding_store import DEFAULT_STORE_PATH, load_embedding_store
+from src.bots.musicqna.models.index_factory import (
+    INDEX_TYPES, build_faiss_index, index_memory_bytes
+)
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    return x / np.linalg.norm(x, axis=1, keepdims=True).clip(min=1e-12)
+
+def perturb(base: np.ndarray, n: int, noise: float, rng) -> np.ndarray:
+    rows = base[rng.integers(0, len(base), size=n)]
+    return normalize_rows(rows + rng.normal(0, noise, size=rows.shape).astype(np.float32)).astype(np.float32)
+
+def recall_at_k(approx_ids: np.ndarray, exact_ids: np.ndarray) -> float:
+    k = exact_ids.shape[1]
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approx_ids, exact_ids))
+    return hits / (len(exact_ids) * k)
+
+def bench_dataset(name, xb, xq, k, index_types):
+    rows = []
+    exact_ids = None
+    for index_type in index_types:
+        try:
+            t0 = time.perf_counter()
+            index, _, params = build_faiss_index(xb, index_type, fallback_threshold=0)
+            build_sec = time.perf_counter() - t0
+        except Exception as e:
+            rows.append({'dataset': name, 'index': index_type, 'skip': str(e).strip().splitlines()[-1][-120:]})
+            continue
+        t0 = time.perf_counter()
+        _, ids = index.search(xq, k)
+        search_sec = time.perf_counter() - t0
+        if index_type == 'flat':
+            exact_ids = ids
+        rows.append({
+            'dataset': name,
+            'index': index_type,
+            'n': len(xb),
+            'recall': recall_at_k(ids, exact_ids) if exact_ids is not None else None,
+            'qps': len(xq) / search_sec if search_sec > 0 else float('inf'),
+            'build_sec': build_sec,
+            'memory_mb': index_memory_bytes(index) / (1024 * 1024),
+            'params': params
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 타입별 recall/QPS/빌드 시간/메모리 벤치마크")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH)
+    parser.add_argument('--sizes', default='real,10000,50000', help="'real' 또는 합성 데이터 벡터 수 (쉼표 구분)")
+    parser.add_argument('--types', default=','.join(INDEX_TYPES))
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--noise', type=float, default=0.02)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    base = np.ascontiguousarray(load_embedding_store(args.store)['embeddings'], dtype=np.float32)
+    # flat을 항상 먼저 측정해야 recall 기준(exact)이 생김
+    index_types = ['flat'] + [t for t in args.types.split(',') if t and t != 'flat']
+
+    results = []
+    for size in [s.strip() for s in args.sizes.split(',') if s.strip()]:
+        xb = base if size == 'real' else perturb(base, int(size), args.noise, rng)
+        xq = perturb(base, args.queries, args.noise, rng)
+        name = f"real({len(base)})" if size == 'real' else f"synthetic({int(size)})"
+        print(f"\n⏱️ {name}: dim={xb.shape[1]}, queries={len(xq)}, k={args.k}")
+        results += bench_dataset(name, xb, xq, args.k, index_types)
+
+    print("\n📊 인덱스 벤치마크")
+    print(f"{'dataset':<20} {'index':<9} {'recall@k':>9} {'QPS':>11} {'build_s':>9} {'mem_MB':>9}")
+    for r in results:
+        if 'skip' in r:
+            print(f"{r['dataset']:<20} {r['index']:<9} (skip: {r['skip']})")
+            continue
+        recall = f"{r['recall']:.3f}" if r['recall'] is not None else '-'
+        print(
+            f"{r['dataset']:<20} {r['index']:<9} {recall:>9} {r['qps']:>11.1f} "
+            f"{r['build_sec']:>9.3f} {r['memory_mb']:>9.2f}"
+        )
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+임베딩 차원 축소(projection) 품질 벤치마크 (auto_questions.json 기준)
+- 원본 차원 vs 768/512/256/128 차원에서 success/partial/fail 비율과 인덱스 메모리 비교
+- PCA는 청크 수보다 큰 차원을 학습할 수 없으므로 그 경우 random projection으로 대체해 표시
+- --save 지정 시 각 차원의 projection을 store에 저장 (VectorRetriever(projection_dim=...)로 사용)
+
+실행: python -m src.bots.musicqna.eval.benchmark_projection --dims 768,512,256,128 --top-k 2
+"""
+import json
+import argparse
+from collections import Counter
+
+from src.bots.musicqna.eval.evaluate_batch_cli import evaluate_musicqna
+from src.bots.musicqna.data_processing.projection import fit_projection, save_projection
+from src.bots.musicqna.models.index_factory import index_memory_bytes
+
+def evaluate_current(retriever, questions, nodes, top_k):
+    batch = retriever.search_batch([q["question"] for q in questions], top_k=top_k)
+    counts = Counter(evaluate_musicqna(q, hits, nodes) for q, hits in zip(questions, batch))
+    n = len(questions)
+    return {
+        'success': counts['success'] / n,
+        'partial': counts['partial'] / n,
+        'fail': counts['fail'] / n,
+        'index_mb': index_memory_bytes(retriever.index) / (1024 * 1024)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="projection 차원별 검색 품질 벤치마크")
+    parser.add_argument('--dims', default='768,512,256,128')
+    parser.add_argument('--method', default='pca', choices=('pca', 'random'))
+    parser.add_argument('--top-k', type=int, default=2)
+    parser.add_argument('--save', action='store_true')
+    args = parser.parse_args()
+
+    with open("data/musicqna/processed/music_theory_curriculum.json", encoding="utf-8") as f:
+        nodes = json.load(f)
+    with open("data/musicqna/processed/auto_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    from src.bots.musicqna.models.retriever import VectorRetriever
+    retriever = VectorRetriever(persist_index=False)
+    # 정확 일치 질문의 encoder 생략 경로는 차원과 무관하므로 끄고 dense 품질만 비교
+    retriever.skip_encoder_on_exact = False
+    retriever.build_index()
+
+    rows = [{'dim': retriever.embeddings.shape[1], 'method': 'full', 'explained': 1.0,
+             **evaluate_current(retriever, questions, nodes, args.top_k)}]
+    for dim in [int(d) for d in args.dims.split(',') if d.strip()]:
+        method = args.method
+        try:
+            projection = fit_projection(retriever.embeddings, dim, method=method)
+        except ValueError as e:
+            print(f"[{dim}] {e} → random projection으로 대체")
+            method = 'random'
+            projection = fit_projection(retriever.embeddings, dim, method=method)
+        projection['content_hash'] = (retriever.header or {}).get('content_hash')
+        if args.save:
+            print(f"[{dim}] 저장: {save_projection(retriever.embedding_path, projection)}")
+        retriever.set_projection(projection)
+        retriever.build_index()
+        rows.append({'dim': dim, 'method': method, 'explained': projection['explained_variance'],
+                     **evaluate_current(retriever, questions, nodes, args.top_k)})
+
+    base = rows[0]
+    print(f"\n📊 projection 벤치마크 (질문 {len(questions)}개, top_k={args.top_k})")
+    print(f"{'dim':>5} {'method':<7} {'explained':>9} {'success':>8} {'Δsucc':>7} {'partial':>8} {'fail':>7} {'index_MB':>9}")
+    for r in rows:
+        explained = f"{r['explained']:.1%}" if r['explained'] is not None else '-'
+        print(
+            f"{r['dim']:>5} {r['method']:<7} {explained:>9} {r['success']:>8.1%} "
+            f"{(r['success'] - base['success']) * 100:>+6.1f}p {r['partial']:>8.1%} {r['fail']:>7.1%} {r['index_mb']:>9.2f}"
+        )
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+검색 모드 벤치마크 (auto_questions.json 기준)
+- substring: 기존 MusicTheoryDataLoader.search_chunks (부분 문자열 스캔)
+- dense: FAISS 단독 / sparse: BM25 n-gram 역색인 단독 / hybrid: RRF 융합
+- 모드별 쿼리 지연(ms, mean/p50/p95)과 success/partial/fail 비율 출력
+
+실행: python -m src.bots.musicqna.eval.benchmark_retrieval --modes dense,sparse,hybrid --top-k 2
+"""
+import json
+import time
+import random
+import argparse
+from collections import Counter
+
+from src.bots.musicqna.eval.evaluate_batch_cli import evaluate_musicqna
+from src.bots.musicqna.data_processing.json_loader import MusicTheoryDataLoader
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+def summarize(name, latencies, labels):
+    n = len(labels)
+    counts = Counter(labels)
+    return {
+        'mode': name,
+        'n': n,
+        'mean_ms': sum(latencies) / n * 1000 if n else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'success': counts['success'] / n if n else 0.0,
+        'partial': counts['partial'] / n if n else 0.0,
+        'fail': counts['fail'] / n if n else 0.0
+    }
+
+def run_substring(loader, questions, nodes, top_k):
+    latencies, labels = [], []
+    for q in questions:
+        t0 = time.perf_counter()
+        hits = loader.search_chunks(q["question"])[:top_k]
+        latencies.append(time.perf_counter() - t0)
+        labels.append(evaluate_musicqna(q, hits, nodes))
+    return summarize('substring', latencies, labels)
+
+def run_retriever_mode(retriever, mode, questions, nodes, top_k):
+    retriever.mode = mode
+    retriever.query_cache.clear()  # encoder 비용 포함 측정
+    latencies, labels = [], []
+    for q in questions:
+        t0 = time.perf_counter()
+        hits = retriever.search(q["question"], top_k=top_k)
+        latencies.append(time.perf_counter() - t0)
+        labels.append(evaluate_musicqna(q, hits, nodes))
+    return summarize(mode, latencies, labels)
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 모드별 지연/정확도 벤치마크")
+    parser.add_argument('--modes', default='substring,dense,sparse,hybrid')
+    parser.add_argument('--top-k', type=int, default=2)
+    parser.add_argument('--limit', type=int, default=0, help="0이면 전체 질문")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+
+    with open("data/musicqna/processed/music_theory_curriculum.json", encoding="utf-8") as f:
+        nodes = json.load(f)
+    with open("data/musicqna/processed/auto_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    if args.limit:
+        random.seed(args.seed)
+        questions = random.sample(questions, min(args.limit, len(questions)))
+
+    rows = []
+    if 'substring' in modes:
+        loader = MusicTheoryDataLoader()
+        loader.extract_text_chunks()
+        rows.append(run_substring(loader, questions, nodes, args.top_k))
+
+    retriever_modes = [m for m in modes if m != 'substring']
+    if retriever_modes:
+        from src.bots.musicqna.models.retriever import VectorRetriever
+        # hybrid로 생성하면 FAISS/BM25 인덱스가 모두 준비되므로 mode만 바꿔가며 측정
+        retriever = VectorRetriever(mode='hybrid')
+        retriever.build_index()
+        print(f"[sparse index] {retriever.sparse_retriever.get_stats()}")
+        for mode in retriever_modes:
+            rows.append(run_retriever_mode(retriever, mode, questions, nodes, args.top_k))
+
+    print(f"\n📊 검색 벤치마크 (질문 {len(questions)}개, top_k={args.top_k})")
+    print(f"{'mode':<10} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'success':>8} {'partial':>8} {'fail':>8}")
+    for r in rows:
+        print(
+            f"{r['mode']:<10} {r['mean_ms']:>9.3f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} "
+            f"{r['success']:>8.1%} {r['partial']:>8.1%} {r['fail']:>8.1%}"
+        )
+    return rows
+
+if __name__ == "__main__":
+    main()
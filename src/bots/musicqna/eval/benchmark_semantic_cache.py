@@ -0,0 +1,109 @@
+"""
+semantic answer cache 벤치마크 (auto_questions.json 기준)
+- 질문을 섞은 순서로 흘려보내며 SemanticAnswerCache 조회 → miss면 답변 저장
+- 지표: threshold별 hit rate, near-miss(유사하지만 node_id 불일치로 거절), 답변 일치율(agreement)
+- agreement (기본, LLM 호출 없음): 캐시된 질문과 target node / 질문 의도(정의·역할·원리 등)가 모두 같으면 일치
+- agreement (--llm): miss는 실제 LLM 답변 생성, hit이면 현재 질문의 실제 답변도 생성해
+  두 답변 임베딩 cosine >= --answer-sim 이면 일치
+
+실행: python -m src.bots.musicqna.eval.benchmark_semantic_cache --thresholds 0.90,0.93,0.95,0.97
+"""
+import re
+import json
+import random
+import argparse
+
+import numpy as np
+
+from src.bots.musicqna.models.semantic_cache import SemanticAnswerCache, DEFAULT_CAPACITY
+
+INTENT_PATTERNS = [
+    ('definition', re.compile(r'(란\?|의 정의는\?)$')),
+    ('role', re.compile(r'의 역할은\?$')),
+    ('logic', re.compile(r'원리')),
+    ('tips', re.compile(r'팁')),
+    ('example', re.compile(r'예시')),
+    ('prerequisite', re.compile(r'선수 지식')),
+    ('compare', re.compile(r'차이점')),
+]
+
+def question_intent(question: str) -> str:
+    for name, pattern in INTENT_PATTERNS:
+        if pattern.search(question):
+            return name
+    return 'other'
+
+def target_key(q) -> tuple:
+    return tuple(sorted(q.get("target_node_ids") or [q.get("target_node_id")]))
+
+def run(questions, batch_sources, query_vecs, threshold, capacity, answer_fn=None, answer_sim=None, encode=None):
+    cache = SemanticAnswerCache(threshold=threshold, capacity=capacity)
+    agree = 0
+    for q, sources, vec in zip(questions, batch_sources, query_vecs):
+        node_ids = [s.get('node_id') for s in sources]
+        meta = {'target': target_key(q), 'intent': question_intent(q['question'])}
+        hit = cache.lookup(vec, node_ids)
+        if hit is None:
+            answer = answer_fn(q['question'], sources) if answer_fn else ''
+            cache.put(q['question'], vec, node_ids, {'answer': answer, **meta})
+            continue
+        cached = hit['response']
+        if answer_fn is None:
+            agree += int(cached['target'] == meta['target'] and cached['intent'] == meta['intent'])
+        else:
+            fresh = answer_fn(q['question'], sources)
+            a, b = encode([cached['answer'], fresh])
+            agree += int(float(np.dot(a, b)) >= answer_sim)
+    stats = cache.stats()
+    stats['agreement'] = agree / stats['hits'] if stats['hits'] else None
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="semantic answer cache hit rate / 답변 일치율 벤치마크")
+    parser.add_argument('--thresholds', default='0.90,0.93,0.95,0.97')
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument('--top-k', type=int, default=2)
+    parser.add_argument('--limit', type=int, default=None, help="질문 수 제한 (--llm 사용 시 비용 절감용)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--llm', action='store_true', help="실제 LLM 답변으로 agreement 측정")
+    parser.add_argument('--answer-sim', type=float, default=0.9)
+    args = parser.parse_args()
+
+    with open("data/musicqna/processed/auto_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    random.Random(args.seed).shuffle(questions)
+    if args.limit:
+        questions = questions[:args.limit]
+
+    from src.bots.musicqna.models.retriever import VectorRetriever
+    retriever = VectorRetriever()
+    retriever.build_index()
+    texts = [q["question"] for q in questions]
+    batch_sources = retriever.search_batch(texts, top_k=args.top_k)
+    query_vecs = retriever.encode_queries(texts)
+
+    answer_fn = encode = None
+    if args.llm:
+        from src.bots.musicqna.models.rag_model import RAGModel
+        rag_model = RAGModel(retriever, top_k=args.top_k)
+        answer_fn = lambda question, sources: rag_model._generate_llm_response(question, sources).get('answer', '')
+        encode = lambda pair: retriever.model.encode(pair, normalize_embeddings=True, convert_to_numpy=True)
+
+    rows = []
+    for threshold in [float(t) for t in args.thresholds.split(',') if t.strip()]:
+        stats = run(questions, batch_sources, query_vecs, threshold, args.capacity, answer_fn, args.answer_sim, encode)
+        rows.append(stats)
+
+    mode = 'LLM 답변 임베딩' if args.llm else 'target node + 의도'
+    print(f"\n📊 semantic cache 벤치마크 (질문 {len(questions)}개, capacity={args.capacity}, agreement 기준: {mode})")
+    print(f"{'threshold':>9} {'hit_rate':>9} {'hits':>6} {'near_miss':>10} {'agreement':>10} {'evict':>6}")
+    for r in rows:
+        agreement = f"{r['agreement']:.1%}" if r['agreement'] is not None else '-'
+        print(
+            f"{r['threshold']:>9.2f} {r['hit_rate']:>9.1%} {r['hits']:>6} {r['near_misses']:>10} "
+            f"{agreement:>10} {r['evictions']:>6}"
+        )
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+정의형 질문 템플릿 답변 벤치마크 (auto_questions.json 기준, LLM 호출 없음)
+- 질문 의도(정의·역할·원리 등)별: 질문 수, 템플릿 적중 수/비율, 정답 개념 일치율, 처리 시간 p50/p95(ms)
+- 비교용으로 같은 질문의 검색(encode + FAISS + alias rerank) 시간 p50도 출력
+  (템플릿 미적중 질문은 검색 + LLM 왕복이 추가로 필요)
+
+실행: python -m src.bots.musicqna.eval.benchmark_template_answers
+"""
+import json
+import time
+import argparse
+
+import numpy as np
+
+from src.bots.musicqna.models.template_answer import TemplateAnswerer
+from src.bots.musicqna.eval.benchmark_semantic_cache import question_intent
+
+def main():
+    parser = argparse.ArgumentParser(description="정의형 질문 템플릿 답변 적중률 / 지연 시간 벤치마크")
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    with open("data/musicqna/processed/auto_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    if args.limit:
+        questions = questions[:args.limit]
+
+    from src.bots.musicqna.models.retriever import VectorRetriever
+    retriever = VectorRetriever()
+    retriever.build_index()
+    answerer = TemplateAnswerer(retriever)
+
+    rows = {}
+    for q in questions:
+        intent = question_intent(q['question'])
+        r = rows.setdefault(intent, {'questions': 0, 'hits': 0, 'correct': 0, 'template_ms': [], 'search_ms': []})
+        r['questions'] += 1
+        t0 = time.perf_counter()
+        response = answerer.answer(q['question'])
+        t1 = time.perf_counter()
+        retriever.search(q['question'], top_k=2)
+        t2 = time.perf_counter()
+        r['search_ms'].append((t2 - t1) * 1000)
+        if response is not None:
+            r['hits'] += 1
+            r['template_ms'].append((t1 - t0) * 1000)
+            targets = q.get("target_node_ids") or [q.get("target_node_id")]
+            r['correct'] += int(response['sources'][0]['node_id'] in targets)
+
+    def pct(values, p):
+        return f"{np.percentile(values, p):.2f}" if values else '-'
+
+    total_hits = sum(r['hits'] for r in rows.values())
+    print(f"\n📊 템플릿 답변 벤치마크 (질문 {len(questions)}개, 적중 {total_hits}개 = {total_hits / len(questions):.1%})")
+    print(f"{'intent':<13} {'questions':>9} {'hits':>6} {'hit_rate':>9} {'correct':>8} {'tpl_p50':>8} {'tpl_p95':>8} {'search_p50':>10}")
+    for intent, r in sorted(rows.items(), key=lambda kv: -kv[1]['questions']):
+        correct = f"{r['correct'] / r['hits']:.1%}" if r['hits'] else '-'
+        print(
+            f"{intent:<13} {r['questions']:>9} {r['hits']:>6} {r['hits'] / r['questions']:>9.1%} {correct:>8} "
+            f"{pct(r['template_ms'], 50):>8} {pct(r['template_ms'], 95):>8} {pct(r['search_ms'], 50):>10}"
+        )
+    print("(시간 단위 ms)")
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+신뢰도 게이트 임계값 보정 (배치 평가 로그 기반, LLM 호출 없음)
+- 로그(all.json / all.jsonl(.gz)) 행마다 최고 검색 점수(topk_sources_full 또는 topk_refs의 score 최댓값)와 '생략해도 되는 질문'인지 판정
+  · 생략해도 됨: label == 'fail' (정답 개념을 못 찾음) 또는 답변에 '참고 자료 부족'이 포함됨
+- 임계값 t 미만을 생략할 때
+  · precision: 생략한 질문 중 생략해도 됐던 비율
+  · saved: 전체 중 생략된(LLM 호출 절약) 비율
+  · lost: 답변 가능했던 질문 중 잘못 생략된 비율
+- --min-precision 이상 + 생략 행 --min-skipped개 이상(표본 몇 개로 정한 임계값 방지)을 만족하는 임계값 중
+  saved가 가장 큰 값을 선택해 confidence_gate.json에 저장
+  (만족하는 값이 없으면 threshold: null → 게이트는 RAGModel의 min_similarity_score 사용)
+
+실행: python -m src.bots.musicqna.eval.calibrate_confidence_gate --min-precision 0.9 --min-skipped 5
+"""
+import json
+import argparse
+import datetime
+
+from src.bots.musicqna.models.confidence_gate import DEFAULT_GATE_PATH, top_score
+from src.bots.common.batch_log import ALL_LOG_GLOB, log_paths, read_rows
+
+INSUFFICIENT_MARKER = "참고 자료 부족"
+
+def load_rows(pattern: str):
+    """로그 파일들의 all.json / all.jsonl(.gz) 행 (같은 질문+target이 여러 로그에 있으면 첫 행만)"""
+    rows, seen = [], set()
+    paths = log_paths(pattern)
+    for path in paths:
+        for row in read_rows(path):
+            key = str(row.get('question', '')) + str(row.get('target_node_id', ''))
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(row)
+    return rows, paths
+
+def samples_from_rows(rows):
+    """→ [(최고 점수, 생략해도 되는지)] (게이트로 이미 생략된 행은 LLM 답변이 없으므로 제외)"""
+    samples = []
+    for row in rows:
+        if row.get('gated'):
+            continue
+        # score만 필요하므로 참조 행(topk_refs)은 복원 없이 사용
+        score = top_score(row.get('topk_sources_full') or row.get('topk_refs') or [])
+        skippable = row.get('label') == 'fail' or INSUFFICIENT_MARKER in (row.get('answer') or '')
+        samples.append((score if score is not None else 0.0, skippable))
+    return samples
+
+def evaluate_threshold(samples, threshold: float):
+    skipped = [ok for score, ok in samples if score < threshold]
+    answerable = sum(1 for _, ok in samples if not ok)
+    lost = sum(1 for ok in skipped if not ok)
+    return {
+        'threshold': threshold,
+        'skipped': len(skipped),
+        'precision': sum(skipped) / len(skipped) if skipped else None,
+        'saved': len(skipped) / len(samples) if samples else 0.0,
+        'lost': lost / answerable if answerable else 0.0
+    }
+
+def calibrate(samples, min_precision: float, min_skipped: int = 1):
+    """→ (선택한 행 / 조건을 만족하는 임계값이 없으면 None, 임계값별 표)"""
+    # 후보: 관측된 점수 바로 위 (그 점수까지 생략)
+    candidates = sorted({round(score + 1e-6, 6) for score, _ in samples})
+    table = [evaluate_threshold(samples, t) for t in candidates]
+    best = None
+    for r in table:
+        if r['skipped'] < min_skipped or r['precision'] is None or r['precision'] < min_precision:
+            continue
+        if best is None or r['saved'] > best['saved']:
+            best = r
+    return best, table
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 평가 로그로 신뢰도 게이트 임계값 보정")
+    parser.add_argument('--logs', default=f"data/musicqna/batch_logs/*/{ALL_LOG_GLOB}")
+    parser.add_argument('--min-precision', type=float, default=0.9)
+    parser.add_argument('--min-skipped', type=int, default=5, help="임계값 선택에 필요한 최소 생략 행 수")
+    parser.add_argument('--out', default=DEFAULT_GATE_PATH)
+    parser.add_argument('--dry-run', action='store_true', help="파일 저장 없이 결과만 출력")
+    args = parser.parse_args()
+
+    rows, paths = load_rows(args.logs)
+    samples = samples_from_rows(rows)
+    if not samples:
+        print(f"❌ 보정할 로그가 없습니다: {args.logs}")
+        return None
+    best, table = calibrate(samples, args.min_precision, args.min_skipped)
+
+    skippable = sum(1 for _, ok in samples if ok)
+    print(f"\n📊 신뢰도 게이트 보정 (로그 {len(paths)}개, 질문 {len(samples)}개, 생략 가능 {skippable}개)")
+    print(f"{'threshold':>9} {'skipped':>8} {'precision':>10} {'saved':>7} {'lost':>7}")
+    step = max(1, len(table) // 15)
+    shown = table[::step] + ([best] if best is not None and best not in table[::step] else [])
+    for r in sorted(shown, key=lambda r: r['threshold']):
+        precision = f"{r['precision']:.1%}" if r['precision'] is not None else '-'
+        mark = '  ◀ 선택' if r is best else ''
+        print(f"{r['threshold']:>9.3f} {r['skipped']:>8} {precision:>10} {r['saved']:>7.1%} {r['lost']:>7.1%}{mark}")
+
+    if best is None:
+        print(f"\n⚠️ precision {args.min_precision:.0%} 이상 + 생략 {args.min_skipped}개 이상인 임계값 없음 "
+              f"→ threshold: null (RAGModel min_similarity_score 사용)")
+    result = {
+        **(best or {'threshold': None}),
+        'min_precision': args.min_precision,
+        'min_skipped': args.min_skipped,
+        'n_samples': len(samples),
+        'n_skippable': skippable,
+        'logs': paths,
+        'calibrated_at': datetime.datetime.now().isoformat(timespec='seconds')
+    }
+    if not args.dry_run:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        threshold = f"{best['threshold']:.3f}" if best is not None else 'null'
+        print(f"\n✅ 임계값 {threshold} 저장: {args.out}")
+    return result
+
+if __name__ == "__main__":
+    main()
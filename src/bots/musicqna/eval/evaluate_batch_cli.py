@@ -3,6 +3,13 @@ import json
 import random
 import datetime
 from src.bots.musicqna.cli.cli_main import initialize_system
+from src.bots.common.async_runner import get_concurrency, run_batch
+from src.bots.common.llm_cache import get_llm_cache
+from src.bots.common.batch_log import BatchLogWriter
+from src.bots.musicqna.utils.source_refs import compact_sources
+
+# 결과 파일 append 주기 (동시 실행 모드에서는 이 단위로 묶어 LLM 호출)
+LOG_INTERVAL = 100
 
 # === 평가 규칙: 이 파일 안에! ===
 def evaluate_musicqna(q, topk_sources, nodes):
@@ -20,26 +27,13 @@ def evaluate_musicqna(q, topk_sources, nodes):
                 return "partial"
     return "fail"
 
-def append_results(version_dir, results, successes, fails, partials):
-    os.makedirs(version_dir, exist_ok=True)
-    for fname, newdata in {
-        "all.json": results,
-        "success.json": successes,
-        "fail.json": fails,
-        "partial_fail.json": partials
-    }.items():
-        fpath = os.path.join(version_dir, fname)
-        if os.path.exists(fpath):
-            with open(fpath, "r", encoding="utf-8") as f:
-                curdata = json.load(f)
-        else:
-            curdata = []
-        curdata_ids = {str(d.get('question', ''))+str(d.get('target_node_id', '')) for d in curdata}
-        adddata = [d for d in newdata if str(d.get('question',''))+str(d.get('target_node_id','')) not in curdata_ids]
-        curdata += adddata
-        with open(fpath, "w", encoding="utf-8") as f:
-            json.dump(curdata, f, ensure_ascii=False, indent=2)
-    print(f"\n🌱 Results appended: {version_dir}/ (success/fail/partial_fail/all.json)")
+def row_key(row):
+    return str(row.get('question', '')) + str(row.get('target_node_id', ''))
+
+def append_results(writer, results):
+    # all.jsonl + 라벨별 jsonl에 이어 쓰기 (중복 질문+target은 all.keys로 제외)
+    writer.append(results)
+    print(f"\n🌱 Results appended: {writer.version_dir}/ (success/fail/partial_fail/all{writer.ext})")
 
 def main():
     rag_model = initialize_system()
@@ -74,7 +68,7 @@ def main():
 
     questions = random.sample(questions, N_SAMPLE)
 
-    results, successes, fails, partials = [], [], [], []
+    results = []
 
     now_dt = datetime.datetime.now()
     now_str = now_dt.strftime("%Y%m%d_%H%M")
@@ -82,42 +76,70 @@ def main():
         "data", "musicqna", "batch_logs",
         f"{now_str}_seed{seed_value}"
     )
+    writer = BatchLogWriter(version_dir, row_key)
 
-    for idx, q in enumerate(questions):
-        question_text = q["question"]
-        target_node_id = q.get("target_node_id")
-        print(f"\n[{idx+1}/{N_SAMPLE}] 질문: {question_text}")
-
-        try:
-            response = rag_model.get_conversation_response(question_text)
-        except Exception as e:
-            response = {"sources": [], "answer": f"시스템 오류: {str(e)}"}
-        topk_sources = response.get("sources", [])
-        label = evaluate_musicqna(q, topk_sources, nodes)
-        eval_log = {
-            "question": question_text,
-            "target_node_id": target_node_id,
-            "topk_node_ids": [x.get("node_id") for x in topk_sources],
-            "answer": response.get('answer', ''),
-            "label": label,
-            "topk_sources_full": topk_sources
-        }
-        results.append(eval_log)
-        if label == "success":
-            successes.append(eval_log)
-        elif label == "fail":
-            fails.append(eval_log)
-        elif label == "partial":
-            partials.append(eval_log)
-
-        print(f"   → 평가결과: {label}")
-
-        if (idx+1) % 100 == 0 or (idx+1) == N_SAMPLE:
-            append_results(version_dir, results, successes, fails, partials)
-            results, successes, fails, partials = [], [], [], []
+    # 검색은 배치로 한 번에 (배치 encode + 배치 FAISS search)
+    print(f"\n🔎 {N_SAMPLE}개 질문 배치 검색 중...")
+    try:
+        batch_sources = rag_model.retrieve_batch([q["question"] for q in questions])
+    except Exception as e:
+        print(f"[배치 검색 실패 → 질문별 검색으로 진행] {e}")
+        batch_sources = [None] * N_SAMPLE
+
+    # LLM_CONCURRENCY > 1: LOG_INTERVAL개씩 AsyncOpenAI로 동시 호출 후 순서대로 기록 (로그는 순차 실행과 동일)
+    concurrency = get_concurrency()
+    if concurrency > 1:
+        print(f"⚡ LLM 동시 실행 모드: concurrency={concurrency}")
+
+    async def ask(idx, client):
+        return await rag_model.aget_conversation_response(
+            questions[idx]["question"], sources=batch_sources[idx], client=client
+        )
+
+    for block_start in range(0, N_SAMPLE, LOG_INTERVAL):
+        block = list(range(block_start, min(block_start + LOG_INTERVAL, N_SAMPLE)))
+        block_responses = dict(zip(block, run_batch(block, ask, concurrency))) if concurrency > 1 else {}
+
+        for idx in block:
+            q = questions[idx]
+            question_text = q["question"]
+            target_node_id = q.get("target_node_id")
+            print(f"\n[{idx+1}/{N_SAMPLE}] 질문: {question_text}")
+
+            if idx in block_responses:
+                response = block_responses[idx]
+            else:
+                try:
+                    response = rag_model.get_conversation_response(question_text, sources=batch_sources[idx])
+                except Exception as e:
+                    response = {"sources": [], "answer": f"시스템 오류: {str(e)}"}
+            topk_sources = response.get("sources", [])
+            label = evaluate_musicqna(q, topk_sources, nodes)
+            eval_log = {
+                "question": question_text,
+                "target_node_id": target_node_id,
+                "topk_node_ids": [x.get("node_id") for x in topk_sources],
+                "answer": response.get('answer', ''),
+                "label": label,
+                "prompt_tokens": response.get("prompt_tokens"),
+                "gated": response.get("gated", False),
+                # 청크 전체 대신 참조만 저장 (source_refs.SourceRehydrator로 topk_sources_full 복원)
+                "topk_refs": compact_sources(topk_sources)
+            }
+            results.append(eval_log)
+
+            print(f"   → 평가결과: {label}")
+
+            if (idx+1) % LOG_INTERVAL == 0 or (idx+1) == N_SAMPLE:
+                append_results(writer, results)
+                results = []
 
     print("\n🌱 전체 루프 완료!")
-    print(f"→ 전체 결과: {version_dir}/.json 등 (누적 append)")
+    get_llm_cache().print_stats()
+    if rag_model.confidence_gate is not None:
+        g = rag_model.confidence_gate.stats()
+        print(f"🚧 [신뢰도 게이트] threshold={g['threshold']:.3f} | LLM 생략 {g['gated']}/{g['checked']} ({g['gate_rate']:.1%})")
+    print(f"→ 전체 결과: {version_dir}/all{writer.ext} 등 (누적 append)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+# alias rerank 가중치 (rerank_by_alias 기본값과 동일)
+ALIAS_BOOST = 0.05
+PARTIAL_WEIGHT = 0.5
+# encoder를 생략한 정확 일치 결과의 기준 점수 (정규화 임베딩 cosine 최댓값)
+EXACT_MATCH_SCORE = 1.0
+
+def normalize(text):
+    if not text: return ""
+    text = text.lower().replace(" ", "").replace("-", "").replace("_", "").replace("/", "").strip()
+    return text
+
+def chunk_names(chunk: Dict) -> List[str]:
+    """concept.ko, concept.en, aliases(';' 구분)를 정규화한 이름 목록 (빈 값 제외, 순서 유지)"""
+    raw = [chunk.get('concept.ko', ''), chunk.get('concept.en', '')]
+    raw += [a for a in (chunk.get('aliases') or '').split(';') if a]
+    names = []
+    for name in raw:
+        n = normalize(name)
+        if n and n not in names:
+            names.append(n)
+    return names
+
+def match_type(nq: str, names: List[str]) -> Optional[str]:
+    """'exact'(이름과 정확 일치) > 'partial'(포함 관계) > None"""
+    if not nq:
+        return None
+    if nq in names:
+        return 'exact'
+    for c in names:
+        if nq in c or c in nq:
+            return 'partial'
+    return None
+
+class AliasIndex:
+    """
+    청크 이름(concept.ko/en, aliases) 정규화 lookup. 인덱스 빌드 시 1회 구축.
+    - exact: 정규화 이름 → 행 번호 해시맵 (정확 일치)
+    - Aho-Corasick 오토마톤: 쿼리 안에 포함된 모든 이름을 한 번의 스캔으로 탐색 (포함 일치)
+    """
+    def __init__(self, chunks: List[Dict]):
+        self.names = [chunk_names(c) for c in chunks]
+        self.exact = {}
+        for row, names in enumerate(self.names):
+            for n in names:
+                self.exact.setdefault(n, []).append(row)
+        self._build_automaton()
+
+    def _build_automaton(self):
+        # goto[state] = {char: next_state}, out[state] = 해당 상태에서 끝나는 이름들의 행 번호
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for name, rows in self.exact.items():
+            state = 0
+            for ch in name:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].update(rows)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state == 0:
+                    self._fail[nxt] = 0
+                else:
+                    f = self._fail[state]
+                    while f and ch not in self._goto[f]:
+                        f = self._fail[f]
+                    self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def exact_rows(self, query: str) -> List[int]:
+        return list(self.exact.get(normalize(query), []))
+
+    def contained_rows(self, query: str) -> Set[int]:
+        """정규화 쿼리 안에 이름이 포함된 모든 행"""
+        rows = set()
+        state = 0
+        for ch in normalize(query):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                rows |= self._out[state]
+        return rows
+
+    def match_rows(self, query: str, rows: List[int]) -> Dict[int, str]:
+        """후보 행별 일치 유형 {row: 'exact' | 'partial'} (일치 없는 행은 제외)"""
+        nq = normalize(query)
+        if not nq:
+            return {}
+        exact = set(self.exact.get(nq, []))
+        contained = self.contained_rows(nq)
+        matches = {}
+        for row in rows:
+            if row in exact:
+                matches[row] = 'exact'
+            elif row in contained or any(nq in c for c in self.names[row]):
+                matches[row] = 'partial'
+        return matches
+
+    def boost(self, match: Optional[str], alias_boost: float = ALIAS_BOOST, partial_weight: float = PARTIAL_WEIGHT) -> float:
+        if match == 'exact':
+            return alias_boost
+        if match == 'partial':
+            return alias_boost * partial_weight
+        return 0.0
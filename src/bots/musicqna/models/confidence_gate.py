@@ -0,0 +1,63 @@
+"""
+검색 신뢰도 게이트
+- alias rerank 후 최고 점수(score = cosine + alias 가중치)가 임계값 미만이면 LLM을 호출하지 않고
+  고정 '참고 자료 부족' 답변 반환 (시스템 프롬프트 4번 원칙상 LLM도 어차피 같은 답을 냄)
+- 임계값: eval/calibrate_confidence_gate.py가 배치 평가 로그로 정한 값(confidence_gate.json),
+  파일이 없거나 threshold가 null(보정 표본 부족)이면 RAGModel의 min_similarity_score
+- 점수 범위가 다른 sparse 검색(score = BM25)에서는 RAGModel이 게이트를 끔 (dense / hybrid만 적용)
+"""
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_GATE_PATH = "data/musicqna/processed/confidence_gate.json"
+INSUFFICIENT_CONTEXT_ANSWER = (
+    "참고 자료 부족: 질문과 충분히 관련된 음악 이론 자료를 찾지 못했습니다.\n"
+    "개념 이름(예: '장3화음', '세븐스 코드')을 포함해 다시 질문해 주세요."
+)
+
+def top_score(sources: List[Dict]) -> Optional[float]:
+    scores = [s.get('score') for s in sources if s.get('score') is not None]
+    return max(scores) if scores else None
+
+def load_gate_threshold(path: str = DEFAULT_GATE_PATH) -> Optional[float]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            threshold = json.load(f)['threshold']
+        # null: 보정 표본 부족으로 임계값을 정하지 못함 → 기본 임계값
+        return float(threshold) if threshold is not None else None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[ConfidenceGate] 보정 파일 로드 실패 → 기본 임계값 사용: {e}")
+        return None
+
+class ConfidenceGate:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.counters = {'checked': 0, 'gated': 0}
+
+    @classmethod
+    def from_calibration(cls, default_threshold: float, path: str = DEFAULT_GATE_PATH) -> 'ConfidenceGate':
+        calibrated = load_gate_threshold(path)
+        return cls(calibrated if calibrated is not None else default_threshold)
+
+    def check(self, sources: List[Dict]) -> Tuple[bool, Optional[float]]:
+        """→ (LLM 호출 여부, 최고 점수). 검색 결과가 없으면 호출하지 않음"""
+        score = top_score(sources)
+        passed = score is not None and score >= self.threshold
+        with self._lock:
+            self.counters['checked'] += 1
+            self.counters['gated'] += int(not passed)
+        return passed, score
+
+    def stats(self) -> Dict:
+        with self._lock:
+            checked = self.counters['checked']
+            return {
+                **self.counters,
+                'threshold': self.threshold,
+                'gate_rate': self.counters['gated'] / checked if checked else 0.0
+            }
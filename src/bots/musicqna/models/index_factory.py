@@ -0,0 +1,95 @@
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import faiss
+
+# 모든 인덱스는 정규화 임베딩 기준 inner product(= cosine) metric 사용
+INDEX_TYPES = ('flat', 'hnsw', 'ivf_flat', 'ivf_pq', 'sq8')
+
+# 타입별 기본 build/search 파라미터 (nlist=None이면 벡터 수 기준 자동 결정)
+DEFAULT_INDEX_PARAMS = {
+    'flat': {},
+    'hnsw': {'M': 32, 'ef_construction': 200, 'ef_search': 64},
+    'ivf_flat': {'nlist': None, 'nprobe': 8},
+    'ivf_pq': {'nlist': None, 'm': 64, 'nbits': 8, 'nprobe': 16},
+    'sq8': {}
+}
+
+# 검색 시점에만 쓰이는 파라미터 (인덱스 fingerprint에서 제외 → 바꿔도 재빌드 불필요)
+SEARCH_PARAM_KEYS = ('ef_search', 'nprobe')
+
+# 벡터 수가 이보다 적으면 근사 인덱스 대신 exact(flat) 검색으로 자동 전환
+EXACT_FALLBACK_THRESHOLD = 10000
+
+def resolve_index_params(index_type: str, params: Optional[Dict] = None) -> Dict:
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"지원하지 않는 인덱스 타입: {index_type} (지원: {INDEX_TYPES})")
+    resolved = dict(DEFAULT_INDEX_PARAMS[index_type])
+    resolved.update(params or {})
+    return resolved
+
+def resolve_index_type(index_type: str, num_vectors: int, fallback_threshold: int = EXACT_FALLBACK_THRESHOLD) -> str:
+    """실제로 빌드할 인덱스 타입 (소규모면 flat)"""
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"지원하지 않는 인덱스 타입: {index_type} (지원: {INDEX_TYPES})")
+    if index_type != 'flat' and num_vectors < fallback_threshold:
+        return 'flat'
+    return index_type
+
+def build_params_of(params: Dict) -> Dict:
+    return {k: v for k, v in params.items() if k not in SEARCH_PARAM_KEYS}
+
+def auto_nlist(num_vectors: int) -> int:
+    # 대략 4*sqrt(n), 단 centroid 당 최소 39개 학습 벡터(faiss 권장) 확보
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+def build_faiss_index(
+    embeddings: np.ndarray,
+    index_type: str = 'flat',
+    params: Optional[Dict] = None,
+    fallback_threshold: int = EXACT_FALLBACK_THRESHOLD
+) -> Tuple[object, str, Dict]:
+    """
+    인덱스 생성 + 학습 + 추가.
+    :return: (index, 실제 인덱스 타입, 적용된 파라미터)
+    """
+    xb = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n, dim = xb.shape
+    effective_type = resolve_index_type(index_type, n, fallback_threshold)
+    p = resolve_index_params(effective_type, params if effective_type == index_type else None)
+    metric = faiss.METRIC_INNER_PRODUCT
+
+    if effective_type == 'flat':
+        index = faiss.IndexFlatIP(dim)
+    elif effective_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(dim, p['M'], metric)
+        index.hnsw.efConstruction = p['ef_construction']
+    elif effective_type == 'ivf_flat':
+        p['nlist'] = p['nlist'] or auto_nlist(n)
+        index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, p['nlist'], metric)
+    elif effective_type == 'ivf_pq':
+        p['nlist'] = p['nlist'] or auto_nlist(n)
+        if dim % p['m'] != 0:
+            raise ValueError(f"IVF-PQ: 차원 {dim}이 sub-quantizer 수 m={p['m']}로 나누어떨어지지 않습니다.")
+        index = faiss.IndexIVFPQ(faiss.IndexFlatIP(dim), dim, p['nlist'], p['m'], p['nbits'], metric)
+    else:  # sq8
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, metric)
+
+    if not index.is_trained:
+        index.train(xb)
+    index.add(xb)
+    apply_search_params(index, effective_type, p)
+    return index, effective_type, p
+
+def apply_search_params(index, index_type: str, params: Optional[Dict] = None):
+    """검색 시점 파라미터 (저장된 인덱스를 로드한 뒤에도 다시 적용)"""
+    p = resolve_index_params(index_type, params)
+    if index_type == 'hnsw':
+        index.hnsw.efSearch = p['ef_search']
+    elif index_type in ('ivf_flat', 'ivf_pq'):
+        faiss.extract_index_ivf(index).nprobe = p['nprobe']
+
+def index_memory_bytes(index) -> int:
+    """직렬화 크기 기준 인덱스 메모리 사용량 근사치"""
+    return int(faiss.serialize_index(index).nbytes)
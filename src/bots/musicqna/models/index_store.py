@@ -0,0 +1,134 @@
+import os
+import json
+import glob
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import faiss
+from src.bots.musicqna.models.index_factory import build_params_of
+
+# 임베딩 store 옆에 빌드된 FAISS 인덱스를 저장/재사용
+#   <index_dir>/index_<fingerprint>.faiss : faiss.write_index 결과
+#   <index_dir>/index_<fingerprint>.json  : fingerprint 구성 요소(메타)
+# fingerprint = sha256(임베딩 content_hash + 모델명 + 인덱스 타입(+파라미터))
+INDEX_PREFIX = 'index_'
+
+def index_fingerprint(content_hash: str, model_name: str, index_type: str, index_params: Optional[Dict] = None) -> str:
+    h = hashlib.sha256()
+    for part in (content_hash, model_name, index_type, json.dumps(index_params or {}, sort_keys=True)):
+        h.update(str(part).encode('utf-8'))
+        h.update(b'\x00')
+    return h.hexdigest()[:16]
+
+def index_dir_for(embedding_path: str) -> str:
+    """store 디렉토리면 그 안에, 구버전 .pkl 이면 같은 폴더에 저장"""
+    if os.path.isdir(embedding_path):
+        return embedding_path
+    return os.path.dirname(embedding_path) or '.'
+
+def index_file_path(index_dir: str, fingerprint: str) -> str:
+    return os.path.join(index_dir, f"{INDEX_PREFIX}{fingerprint}.faiss")
+
+def load_index(index_dir: str, fingerprint: str, mmap: bool = False):
+    """fingerprint가 일치하는 인덱스 파일이 있으면 로드, 없으면 None"""
+    path = index_file_path(index_dir, fingerprint)
+    if not os.path.exists(path):
+        return None
+    if mmap:
+        try:
+            return faiss.read_index(path, faiss.IO_FLAG_MMAP)
+        except Exception as e:
+            # mmap 미지원 인덱스 타입 → 일반 로드
+            print(f"[index_store] mmap 로드 불가, 일반 로드로 전환: {e}")
+    return faiss.read_index(path)
+
+def save_index(index, index_dir: str, fingerprint: str, meta: Optional[Dict] = None, prune: bool = True) -> str:
+    """인덱스 저장. prune=True면 현재 store(content_hash)가 아닌 이전 버전 임베딩으로 만든 인덱스 파일 정리"""
+    os.makedirs(index_dir, exist_ok=True)
+    path = index_file_path(index_dir, fingerprint)
+    tmp_path = path + '.tmp'
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
+
+    meta = dict(meta or {})
+    meta.update({
+        'fingerprint': fingerprint,
+        'ntotal': int(index.ntotal),
+        'saved_at': datetime.now().isoformat()
+    })
+    with open(os.path.join(index_dir, f"{INDEX_PREFIX}{fingerprint}.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    if prune:
+        prune_stale_indexes(index_dir, keep=fingerprint, content_hash=meta.get('content_hash'))
+    return path
+
+def prune_stale_indexes(index_dir: str, keep: str, content_hash: Optional[str] = None):
+    """
+    content_hash(현재 임베딩 store 버전)와 다른 store로 만든 인덱스만 삭제.
+    같은 store의 다른 설정(index_type, nlist, projection 등) 인덱스는 유효하므로 남겨 설정 전환 시 재사용.
+    """
+    if not content_hash:
+        return
+    for meta_path in glob.glob(os.path.join(index_dir, f"{INDEX_PREFIX}*.json")):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception:
+            continue
+        fp = meta.get('fingerprint')
+        if fp == keep or meta.get('content_hash') == content_hash:
+            continue
+        for path in (index_file_path(index_dir, fp), meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+# remove_ids 후 남은 벡터 순서가 유지(compaction)되는 인덱스 타입만 제자리 갱신 가능
+IN_PLACE_UPDATABLE_TYPES = ('flat', 'sq8')
+
+def update_indexes_in_place(
+    index_dir: str,
+    old_content_hash: str,
+    new_content_hash: str,
+    removed_rows: List[int],
+    added_vectors: np.ndarray
+) -> Dict:
+    """
+    증분 재생성 후 저장된 인덱스 갱신: 삭제/변경 행 remove_ids → 신규 벡터 add → 새 fingerprint로 저장.
+    (새 행렬 순서 = 남은 기존 행(기존 순서) + 신규 행) 이어야 함.
+    제자리 갱신이 불가능한 인덱스(hnsw/ivf/projection 적용)는 삭제 → 다음 로드 시 재빌드.
+    """
+    stats = {'updated': 0, 'dropped': 0}
+    for meta_path in glob.glob(os.path.join(index_dir, f"{INDEX_PREFIX}*.json")):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception:
+            continue
+        if meta.get('content_hash') != old_content_hash:
+            continue
+        old_fp = meta['fingerprint']
+        old_path = index_file_path(index_dir, old_fp)
+        params = meta.get('index_params') or {}
+        index = None
+        if meta.get('index_type') in IN_PLACE_UPDATABLE_TYPES and 'projection' not in params and os.path.exists(old_path):
+            index = faiss.read_index(old_path)
+            if removed_rows:
+                index.remove_ids(np.asarray(sorted(removed_rows), dtype='int64'))
+            if len(added_vectors):
+                index.add(np.ascontiguousarray(added_vectors, dtype=np.float32))
+        for path in (old_path, meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        if index is None:
+            stats['dropped'] += 1
+            continue
+        new_fp = index_fingerprint(
+            new_content_hash, meta.get('model_name'), meta['index_type'], build_params_of(params)
+        )
+        meta.update({'content_hash': new_content_hash})
+        save_index(index, index_dir, new_fp, meta=meta, prune=False)
+        stats['updated'] += 1
+    return stats
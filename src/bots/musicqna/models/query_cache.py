@@ -0,0 +1,127 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+class QueryEmbeddingCache:
+    """
+    쿼리 임베딩 2단 캐시.
+    - 1단: 프로세스 내 LRU (OrderedDict, max_entries 초과 시 가장 오래된 항목 제거)
+    - 2단(선택): SQLite 디스크 캐시 (disk_path 지정 시, disk_max_entries 초과 시 last_access 오래된 순 제거)
+    키 = (모델명, 정규화된 쿼리 텍스트)
+    """
+    def __init__(self, max_entries: int = 2048, disk_path: Optional[str] = None, disk_max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'memory_evictions': 0, 'disk_evictions': 0}
+        if disk_path:
+            self._open_disk(disk_path)
+
+    @staticmethod
+    def normalize_query(text: str) -> str:
+        return " ".join((text or "").lower().split())
+
+    @staticmethod
+    def _key(model_name: str, norm_text: str) -> str:
+        return f"{model_name}\x00{norm_text}"
+
+    def _open_disk(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings ("
+            " key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_qe_last_access ON query_embeddings(last_access)")
+        self._conn.commit()
+
+    def get(self, model_name: str, norm_text: str) -> Optional[np.ndarray]:
+        key = self._key(model_name, norm_text)
+        with self._lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return vec
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT dim, vector FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE query_embeddings SET last_access = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._conn.commit()
+                    vec = np.frombuffer(row[1], dtype=np.float32).reshape(row[0])
+                    self._put_memory(key, vec)
+                    self.counters['disk_hits'] += 1
+                    return vec
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, model_name: str, norm_text: str, vec: np.ndarray):
+        key = self._key(model_name, norm_text)
+        vec = np.ascontiguousarray(vec, dtype=np.float32).reshape(-1)
+        vec.setflags(write=False)
+        with self._lock:
+            self._put_memory(key, vec)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, dim, vector, last_access) VALUES (?, ?, ?, ?)",
+                    (key, int(vec.shape[0]), vec.tobytes(), time.time())
+                )
+                self._evict_disk()
+                self._conn.commit()
+
+    def _put_memory(self, key: str, vec: np.ndarray):
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters['memory_evictions'] += 1
+
+    def _evict_disk(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+        overflow = count - self.disk_max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM query_embeddings WHERE key IN ("
+                " SELECT key FROM query_embeddings ORDER BY last_access ASC LIMIT ?)", (overflow,)
+            )
+            self.counters['disk_evictions'] += overflow
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.counters['memory_hits'] + self.counters['disk_hits']
+            total = hits + self.counters['misses']
+            disk_size = None
+            if self._conn is not None:
+                disk_size = self._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+            return {
+                **self.counters,
+                'hit_rate': hits / total if total else 0.0,
+                'memory_size': len(self._memory),
+                'disk_size': disk_size
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM query_embeddings")
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,5 +1,6 @@
 import os
-from typing import Dict, List
+import time
+from typing import Dict, Iterator, List, Optional, Union
 from datetime import datetime
 import openai
 from dotenv import load_dotenv, find_dotenv
@@ -12,83 +13,213 @@ parallelism = os.getenv("TOKENIZERS_PARALLELISM", "false")
 os.environ["TOKENIZERS_PARALLELISM"] = parallelism
 
 from src.bots.musicqna.prompts.prompts import MUSICQNA_SYSTEM_PROMPT
+from src.bots.musicqna.models.template_answer import TemplateAnswerer
+from src.bots.musicqna.models.confidence_gate import ConfidenceGate, INSUFFICIENT_CONTEXT_ANSWER
+from src.bots.musicqna.utils.context_packer import ContextPacker, DEFAULT_CONTEXT_BUDGET
+from src.bots.common.llm_cache import get_llm_cache, cached_chat_completion, acached_chat_completion, stream_chat_completion
 
 class RAGModel:
-    def __init__(self, retriever, model_name: str = DEFAULT_MODEL, min_similarity_score: float = 0.7):
+    def __init__(
+        self,
+        retriever,
+        model_name: str = DEFAULT_MODEL,
+        min_similarity_score: float = 0.7,
+        top_k: int = 2,
+        semantic_cache=None,
+        context_budget: int = DEFAULT_CONTEXT_BUDGET,
+        use_confidence_gate: bool = True,
+        use_templates: bool = False
+    ):
         self.retriever = retriever
         self.model_name = model_name
         self.min_similarity_score = min_similarity_score
+        self.top_k = top_k
         self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        # 동일 요청(모델/temperature/messages/max_tokens)은 SQLite 응답 캐시에서 재사용 (LLM_CACHE_MODE로 제어)
+        self.llm_cache = get_llm_cache()
+        # (선택) SemanticAnswerCache: 의미적으로 거의 같은 질문 + 같은 검색 근거면 이전 답변 재사용
+        self.semantic_cache = semantic_cache
+        # 참고자료는 토큰 예산(context_budget) 안에서 concept_type별 필드 우선순위로 채움
+        self.context_packer = ContextPacker(model_name, context_budget)
+        # 검색 최고 점수가 임계값(보정 파일 confidence_gate.json, 없으면 min_similarity_score) 미만이면 LLM 생략
+        # 임계값은 cosine 점수 기준이라 score가 BM25 점수인 sparse 검색에서는 게이트를 쓰지 않음
+        if use_confidence_gate and getattr(retriever, 'mode', 'dense') == 'sparse':
+            print("[RAGModel] sparse 검색(BM25 점수)에는 cosine 기준 신뢰도 게이트를 적용하지 않음")
+            use_confidence_gate = False
+        self.confidence_gate = ConfidenceGate.from_calibration(min_similarity_score) if use_confidence_gate else None
+        # (선택) "X란?" / "X의 정의는?" + 개념명 정확 일치면 검색·LLM 없이 청크 내용으로 템플릿 답변
+        self.template_answerer = TemplateAnswerer(retriever) if use_templates and retriever else None
 
-    def get_conversation_response(self, query: str) -> Dict:
-        # sources = self.retriever.search(query, top_k=5, min_score=0.0)
-        # print("[DEBUG] sources:", sources)
-        # user_content = self._format_user_message(query, sources)
-        # print("[DEBUG] after format, sources:", sources)
+    def retrieve_batch(self, queries: List[str]) -> List[List[Dict]]:
+        """여러 질문의 근거 passage를 한 번에 검색 (배치 평가 등 대량 처리용)"""
+        if not self.retriever:
+            return [[] for _ in queries]
+        return self.retriever.search_batch(queries, top_k=self.top_k)
+
+    def get_conversation_response(self, query: str, sources: Optional[List[Dict]] = None) -> Dict:
+        """sources를 넘기면(retrieve_batch 등으로 미리 검색) 검색 단계를 생략"""
         try:
-            sources = self.retriever.search(query, top_k=2) if self.retriever else []
-            return self._generate_llm_response(query, sources)
+            templated = self._template_response(query)
+            if templated is not None:
+                return templated
+            if sources is None:
+                sources = self.retriever.search(query, top_k=self.top_k) if self.retriever else []
+            query_vec, cached_response = self._shortcut_response(query, sources)
+            if cached_response is not None:
+                return cached_response
+            response = self._generate_llm_response(query, sources)
+            self._semantic_store(query, query_vec, sources, response)
+            return response
         except Exception as e:
             return self._create_error_response(f"오류: {e}")
 
-    def _generate_llm_response(self, query: str, sources: List[Dict]) -> Dict:
+    async def aget_conversation_response(self, query: str, sources: Optional[List[Dict]] = None, client=None) -> Dict:
+        """
+        get_conversation_response의 비동기 버전 (배치 평가 동시 실행용).
+        client: openai.AsyncOpenAI, 429/5xx는 jitter backoff로 재시도. 응답 dict 형식은 동기 버전과 동일.
+        """
+        try:
+            templated = self._template_response(query)
+            if templated is not None:
+                return templated
+            if sources is None:
+                sources = self.retriever.search(query, top_k=self.top_k) if self.retriever else []
+            query_vec, cached_response = self._shortcut_response(query, sources)
+            if cached_response is not None:
+                return cached_response
+            try:
+                request = self._build_llm_request(query, sources)
+                content, cached = await acached_chat_completion(client, self.llm_cache, request)
+                response = self._build_llm_response(content, sources, cached, request)
+            except Exception as e:
+                return self._create_error_response(f"API 오류: {e}")
+            self._semantic_store(query, query_vec, sources, response)
+            return response
+        except Exception as e:
+            return self._create_error_response(f"오류: {e}")
+
+    def stream_conversation_response(self, query: str, sources: Optional[List[Dict]] = None) -> Iterator[Union[str, Dict]]:
+        """
+        get_conversation_response의 스트리밍 버전.
+        답변 조각(str)을 생성되는 대로 yield하고, 마지막에 응답 dict를 한 번 yield
+        (sources 등 기존 키 + timing: retrieval_sec / ttft_sec(첫 토큰까지) / total_sec).
+        캐시(semantic/LLM) hit이면 답변 전체가 조각 하나로 나옴.
+        조각을 내보낸 뒤 스트림이 실패하면 최종 dict는 오류 응답 + partial=True / partial_answer
+        """
+        t0 = time.perf_counter()
+        ttft = retrieval_sec = None
+        stage = '템플릿 응답'
+        try:
+            response = self._template_response(query)
+            if response is None:
+                stage = '검색'
+                if sources is None:
+                    sources = self.retriever.search(query, top_k=self.top_k) if self.retriever else []
+                retrieval_sec = time.perf_counter() - t0
+                query_vec, response = self._shortcut_response(query, sources)
+        except Exception as e:
+            response = self._create_error_response(f"{stage} 오류: {e}")
+        else:
+            if response is not None:
+                ttft = time.perf_counter() - t0
+                yield response['answer']
+            else:
+                # LLM 스트림 실패는 따로 처리: 이미 조각을 내보냈으면 partial/partial_answer로 표시 (출력 쪽에서 오류를 항상 보여줌)
+                parts = []
+                try:
+                    cached = False
+                    request = self._build_llm_request(query, sources)
+                    for delta, cached in stream_chat_completion(self.client, self.llm_cache, request):
+                        if ttft is None:
+                            ttft = time.perf_counter() - t0
+                        parts.append(delta)
+                        yield delta
+                    response = self._build_llm_response(''.join(parts), sources, cached, request)
+                    self._semantic_store(query, query_vec, sources, response)
+                except Exception as e:
+                    response = self._create_error_response(f"API 오류: {e}")
+                    if parts:
+                        response.update({'partial': True, 'partial_answer': ''.join(parts)})
+        yield {
+            **response,
+            'timing': {'retrieval_sec': retrieval_sec, 'ttft_sec': ttft, 'total_sec': time.perf_counter() - t0}
+        }
+
+    def _template_response(self, query: str) -> Optional[Dict]:
+        if self.template_answerer is None:
+            return None
+        return self.template_answerer.answer(query)
+
+    def _shortcut_response(self, query: str, sources: List[Dict]):
+        """LLM 호출 전 단계 → (쿼리 임베딩, 바로 반환할 응답 dict / 없으면 None). 신뢰도 게이트 → semantic cache 순"""
+        if self.confidence_gate is not None:
+            passed, score = self.confidence_gate.check(sources)
+            if not passed:
+                return None, self._create_gated_response(sources, score)
+        return self._semantic_lookup(query, sources)
+
+    def _semantic_lookup(self, query: str, sources: List[Dict]):
+        """semantic cache 조회 → (쿼리 임베딩, hit이면 응답 dict / 아니면 None)"""
+        if self.semantic_cache is None or not self.retriever:
+            return None, None
+        # 쿼리 임베딩은 검색 때 쿼리 캐시에 들어가 있으므로 보통 encoder 재호출 없음
+        query_vec = self.retriever.encode_query(query)
+        hit = self.semantic_cache.lookup(query_vec, [s.get('node_id') for s in sources])
+        if hit is None:
+            return query_vec, None
+        response = dict(hit['response'])
+        response.update({
+            'sources': sources,
+            'timestamp': datetime.now().isoformat(),
+            'semantic_cache_hit': True,
+            'cached_query': hit['query'],
+            'cache_similarity': hit['similarity']
+        })
+        return query_vec, response
+
+    def _semantic_store(self, query: str, query_vec, sources: List[Dict], response: Dict):
+        if self.semantic_cache is None or query_vec is None or response.get('confidence') == 'error':
+            return
+        self.semantic_cache.put(query, query_vec, [s.get('node_id') for s in sources], response)
+
+    def _build_llm_request(self, query: str, sources: List[Dict]) -> Dict:
         user_content = self._format_user_message(query, sources)
+        return {
+            'model': self.model_name,
+            'messages': [
+                {"role": "system", "content": MUSICQNA_SYSTEM_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            'max_tokens': 1000,
+            'temperature': 0.7
+        }
+
+    def _build_llm_response(self, content: str, sources: List[Dict], cached: bool = False,
+                            request: Optional[Dict] = None) -> Dict:
+        answer = content.strip()
+        prompt_tokens = self.context_packer.counter.count_messages(request['messages']) if request else None
+        return {
+            'answer': answer,
+            'sources': sources,
+            'model': self.model_name,
+            'timestamp': datetime.now().isoformat(),
+            'used_system_prompt': True,
+            'cached': cached,
+            'prompt_tokens': prompt_tokens
+        }
+
+    def _generate_llm_response(self, query: str, sources: List[Dict]) -> Dict:
         try:
-            chat = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": MUSICQNA_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_content}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            answer = chat.choices[0].message.content.strip()
-            return {
-                'answer': answer,
-                'sources': sources,
-                'model': self.model_name,
-                'timestamp': datetime.now().isoformat(),
-                'used_system_prompt': True
-            }
+            request = self._build_llm_request(query, sources)
+            content, cached = cached_chat_completion(self.client, self.llm_cache, request)
+            return self._build_llm_response(content, sources, cached, request)
         except Exception as e:
             return self._create_error_response(f"API 오류: {e}")
 
     def _format_sources_for_prompt(self, sources: List[Dict]) -> str:
         if not sources:
             return ""
-        formatted = ""
-        max_passage = 2
-        max_length = 300    
-        for idx, source in enumerate(sources[:max_passage], 1):
-            concept_ko = source.get('concept.ko', '') or ''
-            concept_en = source.get('concept.en', '') or ''
-            aliases = source.get('aliases', '') or ''
-            definition = source.get('definition', '') or ''
-            logic = source.get('logic', '') or ''
-            example_name = source.get('examples.name', '') or ''
-            example_desc = source.get('examples.description', '') or ''
-            tips = source.get('tips', '') or ''
-
-            definition = (definition[:max_length] + "...") if len(definition) > max_length else definition
-            logic = (logic[:max_length] + "...") if len(logic) > max_length else logic
-
-            formatted += (
-                f"\n[참고자료 {idx}]\n"
-                f"용어(한글): {concept_ko}\n"
-                f"용어(영문): {concept_en}\n"
-                f"동의어·유사 표기: {aliases}\n"
-                f"[정의]: {definition}\n"
-                f"[원리]: {logic}\n"
-            )
-            if example_name:
-                formatted += f"예시: {example_name}\n"
-                if example_desc:
-                    formatted += f"예시 설명: {example_desc}\n"
-            if tips:
-                formatted += f"[팁]: {tips}\n"
-            formatted += "-"*28
-        return formatted
+        return self.context_packer.pack(sources)['text']
 
     def _format_user_message(self, query: str, sources: List[Dict]) -> str:
         sources_text = self._format_sources_for_prompt(sources)
@@ -97,6 +228,20 @@ class RAGModel:
         else:
             return f"질문: {query}\n\n(참고자료가 없습니다.)"
         
+    def _create_gated_response(self, sources: List[Dict], score: Optional[float]) -> Dict:
+        return {
+            'answer': INSUFFICIENT_CONTEXT_ANSWER,
+            'sources': sources,
+            'model': self.model_name,
+            'timestamp': datetime.now().isoformat(),
+            'used_system_prompt': False,
+            'cached': False,
+            'prompt_tokens': 0,
+            'confidence': 'low',
+            'gated': True,
+            'top_score': score
+        }
+
     def _create_error_response(self, error_message: str) -> Dict:
         return {
             'answer': f"시스템 오류: {error_message}",
@@ -106,6 +251,27 @@ class RAGModel:
             'data_coverage': 'error'
         }
 
+def print_streaming_response(rag_model: RAGModel, query: str) -> Dict:
+    """대화형 CLI용: 답변을 토큰 단위로 바로 출력하고 최종 응답 dict 반환"""
+    print("\n[답변]")
+    streamed = False
+    response = {}
+    for part in rag_model.stream_conversation_response(query):
+        if isinstance(part, str):
+            print(part, end="", flush=True)
+            streamed = True
+        else:
+            response = part
+    if not streamed:
+        print(response.get('answer', ''), end="")
+    elif response.get('partial'):
+        print(f"\n⚠️ 답변이 중간에 끊겼습니다 → {response.get('answer', '')}", end="")
+    print()
+    timing = response.get('timing', {})
+    if timing.get('ttft_sec') is not None:
+        print(f"\n⏱️ 첫 토큰 {timing['ttft_sec']:.2f}s | 전체 {timing['total_sec']:.2f}s")
+    return response
+
 def main():
     try:
         from src.bots.musicqna.models.retriever import VectorRetriever
@@ -120,9 +286,7 @@ def main():
             query = input("\n질문을 입력하세요 (종료: exit): ")
             if query.lower() in ["exit", "quit"]:
                 break
-            response = rag_model.get_conversation_response(query)
-            print("\n[답변]")
-            print(response['answer'])
+            response = print_streaming_response(rag_model, query)
             print(f"\n[참고 passage 개수]: {len(response['sources'])}")
 
     except Exception as e:
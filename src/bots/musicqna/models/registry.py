@@ -0,0 +1,152 @@
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+from src.bots.musicqna.data_processing.embedding_store import load_embedding_store, read_store_header, is_legacy_pickle
+
+class ArtifactRegistry:
+    """
+    프로세스 전역 아티팩트 레지스트리.
+    - SentenceTransformer: 모델명(+디바이스)당 1개
+    - 임베딩 store: 경로당 1개 (header의 content_hash가 바뀌면 다시 로드)
+    - FAISS 인덱스: fingerprint(+검색 파라미터)당 1개
+    - 쿼리 임베딩 캐시: 디스크 경로당 1개
+    오케스트레이터 메뉴 재진입 등으로 RAG 세션을 다시 만들어도 같은 객체를 재사용.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._models = {}
+        self._stores = {}
+        self._indexes = {}
+        self._query_caches = {}
+        # 항목별 로드 시간/재사용 횟수
+        self.records: Dict[str, Dict] = {}
+
+    def _record(self, kind: str, key: str, load_sec: Optional[float] = None):
+        name = f"{kind}:{key}"
+        rec = self.records.setdefault(name, {'kind': kind, 'key': key, 'load_sec': 0.0, 'loads': 0, 'hits': 0})
+        if load_sec is None:
+            rec['hits'] += 1
+        else:
+            rec['loads'] += 1
+            rec['load_sec'] = load_sec
+
+    @staticmethod
+    def default_device() -> str:
+        import torch
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+    def get_model(self, model_name: str, device: Optional[str] = None):
+        device = device or self.default_device()
+        key = f"{model_name}@{device}"
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._record('model', key)
+                return model
+            from sentence_transformers import SentenceTransformer
+            print(f"🎵 임베딩 모델 로딩: {model_name} ({device})")
+            t0 = time.perf_counter()
+            model = SentenceTransformer(model_name, device=device)
+            self._models[key] = model
+            self._record('model', key, time.perf_counter() - t0)
+            return model
+
+    def get_store(self, store_path: str) -> Dict:
+        """store 로드 결과(load_embedding_store 반환값) 공유. content_hash가 바뀐 store는 다시 로드"""
+        key = os.path.abspath(store_path)
+        with self._lock:
+            cached = self._stores.get(key)
+            if cached is not None:
+                current_hash = None
+                if not is_legacy_pickle(store_path):
+                    try:
+                        current_hash = read_store_header(store_path).get('content_hash')
+                    except Exception:
+                        current_hash = None
+                cached_hash = (cached.get('header') or {}).get('content_hash')
+                if is_legacy_pickle(store_path) or current_hash == cached_hash:
+                    self._record('store', key)
+                    return cached
+            t0 = time.perf_counter()
+            store = load_embedding_store(store_path)
+            self._stores[key] = store
+            self._record('store', key, time.perf_counter() - t0)
+            return store
+
+    def peek_index(self, key: str):
+        """key(fingerprint + 검색 파라미터)로 등록된 인덱스 반환, 없으면 None"""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._record('index', key)
+            return index
+
+    def put_index(self, key: str, index, load_sec: float = 0.0):
+        with self._lock:
+            self._indexes[key] = index
+            self._record('index', key, load_sec)
+
+    def get_query_cache(self, disk_path: Optional[str] = None):
+        from src.bots.musicqna.models.query_cache import QueryEmbeddingCache
+        key = os.path.abspath(disk_path) if disk_path else ':memory:'
+        with self._lock:
+            cache = self._query_caches.get(key)
+            if cache is None:
+                cache = QueryEmbeddingCache(disk_path=disk_path)
+                self._query_caches[key] = cache
+            return cache
+
+    def clear(self):
+        with self._lock:
+            for cache in self._query_caches.values():
+                cache.close()
+            self._models.clear()
+            self._stores.clear()
+            self._indexes.clear()
+            self._query_caches.clear()
+            self.records.clear()
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                'models': len(self._models),
+                'stores': len(self._stores),
+                'indexes': len(self._indexes),
+                'rss_mb': current_rss_mb(),
+                'peak_rss_mb': peak_rss_mb(),
+                'items': [dict(rec) for rec in self.records.values()]
+            }
+
+    def print_report(self):
+        rep = self.report()
+        print(
+            f"📦 [registry] 모델 {rep['models']} / store {rep['stores']} / 인덱스 {rep['indexes']} | "
+            f"RSS {rep['rss_mb']:.1f}MB (peak {rep['peak_rss_mb']:.1f}MB)"
+        )
+        for rec in rep['items']:
+            print(f"   - {rec['kind']:<6} {rec['key']} | load {rec['load_sec'] * 1000:.1f}ms x{rec['loads']} | 재사용 {rec['hits']}회")
+
+def current_rss_mb() -> float:
+    """현재 RSS (리눅스 /proc 기준, 없으면 peak RSS로 대체)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # 리눅스는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+_registry = ArtifactRegistry()
+
+def get_registry() -> ArtifactRegistry:
+    return _registry
@@ -1,68 +1,135 @@
 import os
-import pickle
+import time
+from typing import Dict, List, Optional, Tuple
+import json
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import faiss
+from src.bots.musicqna.data_processing.embedding_store import (
+    DEFAULT_STORE_PATH, DEFAULT_MODEL_NAME, load_embedding_store
+)
+from src.bots.musicqna.data_processing.projection import load_projection, apply_projection
+from src.bots.musicqna.models.index_store import (
+    index_fingerprint, index_dir_for, load_index, save_index
+)
+from src.bots.musicqna.models.query_cache import QueryEmbeddingCache
+from src.bots.musicqna.models.registry import ArtifactRegistry, get_registry
+from src.bots.musicqna.models.index_factory import (
+    EXACT_FALLBACK_THRESHOLD, build_faiss_index, apply_search_params,
+    resolve_index_type, resolve_index_params, build_params_of, auto_nlist
+)
+from src.bots.musicqna.models.sparse_retriever import SparseRetriever, reciprocal_rank_fusion
+from src.bots.musicqna.models.alias_index import (
+    AliasIndex, normalize, chunk_names, match_type, ALIAS_BOOST, PARTIAL_WEIGHT, EXACT_MATCH_SCORE
+)
 
-def normalize(text):
-    if not text: return ""
-    text = text.lower().replace(" ", "").replace("-", "").replace("_", "").replace("/", "").strip()
-    return text
-
-def rerank_by_alias(query, results, alias_boost=0.05, partial_weight=0.5):
+def rerank_by_alias(query, results, alias_boost=ALIAS_BOOST, partial_weight=PARTIAL_WEIGHT):
+    """
+    result dict만 있을 때의 alias rerank (AliasIndex 없이 매번 정규화).
+    VectorRetriever는 빌드 시 만든 AliasIndex lookup을 사용.
+    """
     nq = normalize(query)
     for r in results:
-        base_score = r['score']
-        candidates = [
-            normalize(r.get('concept.ko', '')),
-            normalize(r.get('concept.en', ''))
-        ] + [normalize(a) for a in (r.get('aliases') or '').split(';') if a]
-        for c in candidates:
-            if nq == c:  # 정확 일치
-                r['score'] = base_score + alias_boost
-                break
-            elif nq in c or c in nq:  # 부분/포함 일치
-                r['score'] = base_score + (alias_boost * partial_weight)
-                break
+        match = match_type(nq, chunk_names(r))
+        if match == 'exact':  # 정확 일치
+            r['score'] = r['score'] + alias_boost
+        elif match == 'partial':  # 부분/포함 일치
+            r['score'] = r['score'] + (alias_boost * partial_weight)
     results = sorted(results, key=lambda x: x['score'], reverse=True)
     # rank 필드 다시 업데이트 (정렬 후)
     for i, r in enumerate(results, 1):
         r['rank'] = i
     return results
 
+# dense: FAISS만 / sparse: BM25 n-gram 역색인만 / hybrid: 두 결과를 RRF로 융합
+RETRIEVER_MODES = ('dense', 'sparse', 'hybrid')
+HYBRID_CANDIDATE_K = 20
+
 class VectorRetriever:
-    def __init__(self, embedding_path: str = 'data/musicqna/embeddings/music_theory_embeddings.pkl'):
+    def __init__(
+        self,
+        embedding_path: str = DEFAULT_STORE_PATH,
+        index_type: str = 'flat',
+        persist_index: bool = True,
+        mmap_index: bool = False,
+        query_cache: QueryEmbeddingCache = None,
+        skip_encoder_on_exact: bool = False,
+        mode: str = 'dense',
+        index_params: Dict = None,
+        exact_fallback_threshold: int = EXACT_FALLBACK_THRESHOLD,
+        projection_dim: Optional[int] = None,
+        registry: Optional[ArtifactRegistry] = None,
+        use_registry: bool = True
+    ):
+        if mode not in RETRIEVER_MODES:
+            raise ValueError(f"지원하지 않는 검색 모드: {mode} (지원: {RETRIEVER_MODES})")
+        self.mode = mode
         self.embedding_path = embedding_path
         self.embeddings = None
         self.chunks = None
+        self.header = None
         self.model = None
         self.model_name = None
         self.index = None
+        # index_type: flat | hnsw | ivf_flat | ivf_pq | sq8 (벡터 수가 threshold 미만이면 flat으로 자동 전환)
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.exact_fallback_threshold = exact_fallback_threshold
+        self.effective_index_type = None
+        self.effective_index_params = None
+        # projection_dim 지정 시 store의 projection_<dim>.npz를 청크/쿼리 임베딩 모두에 적용
+        self.projection_dim = projection_dim
+        self.projection = None
+        self.search_embeddings = None
+        self.persist_index = persist_index
+        self.mmap_index = mmap_index
+        self.index_fingerprint = None
+        self.alias_index = None
+        self.sparse_retriever = None
+        # (opt-in) 쿼리가 개념명/alias와 정확히 일치하면 encoder/FAISS 없이 해당 청크만 바로 반환
+        # → 결과가 top_k보다 적을 수 있음 (기본은 끄고 일반 검색 + 정확 일치 청크 주입으로 top_k 유지)
+        self.skip_encoder_on_exact = skip_encoder_on_exact
+        self.startup_stats = {}
+        # 모델/임베딩/인덱스를 프로세스 전역 레지스트리에서 공유 (use_registry=False면 인스턴스 전용으로 로드)
+        self.registry = (registry or get_registry()) if use_registry else None
+        # 쿼리 임베딩 캐시: 기본은 메모리 LRU, QUERY_EMBEDDING_CACHE_PATH 지정 시 SQLite 디스크 캐시 추가
+        if query_cache is None:
+            disk_path = os.getenv("QUERY_EMBEDDING_CACHE_PATH") or None
+            if self.registry is not None:
+                query_cache = self.registry.get_query_cache(disk_path)
+            else:
+                query_cache = QueryEmbeddingCache(disk_path=disk_path)
+        self.query_cache = query_cache
 
-        if os.path.exists(self.embedding_path):
-            with open(self.embedding_path, 'rb') as f:
-                obj = pickle.load(f)
-            arr = obj.get('embeddings', None)
-            if arr is not None and not isinstance(arr, np.ndarray):
-                arr = np.array(arr)
-            self.embeddings = arr
-            self.chunks = obj.get('chunks', None)
-            self.model_name = obj.get('model_name', 'intfloat/multilingual-e5-large')
-        else:
+        if not os.path.exists(self.embedding_path):
             raise FileNotFoundError(f"임베딩 파일이 존재하지 않습니다: {self.embedding_path}")
+        t0 = time.perf_counter()
+        self._apply_store(self._load_store())
+        self.startup_stats['embedding_load_sec'] = time.perf_counter() - t0
+        if self.model_name is None:
+            self.model_name = DEFAULT_MODEL_NAME
+
+        t0 = time.perf_counter()
+        if self.registry is not None:
+            self.model = self.registry.get_model(self.model_name)
+        else:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(self.model_name)
+        self.startup_stats['model_load_sec'] = time.perf_counter() - t0
+
+    def _load_store(self):
+        if self.registry is not None:
+            return self.registry.get_store(self.embedding_path)
+        return load_embedding_store(self.embedding_path)
 
-        self.model = SentenceTransformer(self.model_name)
+    def _apply_store(self, store):
+        # embeddings는 np.memmap(읽기 전용) → 복사 없이 그대로 보관
+        self.embeddings = store.get('embeddings')
+        self.chunks = store.get('chunks')
+        self.header = store.get('header')
+        self.model_name = store.get('model_name') or self.model_name
 
     def load_embeddings(self) -> bool:
         try:
-            with open(self.embedding_path, 'rb') as f:
-                obj = pickle.load(f)
-            arr = obj.get('embeddings', None)
-            if arr is not None and not isinstance(arr, np.ndarray):
-                arr = np.array(arr)
-            self.embeddings = arr
-            self.chunks = obj.get('chunks', None)
-            self.model_name = obj.get('model_name', self.model_name)
+            self._apply_store(self._load_store())
             return self.embeddings is not None and self.chunks is not None
         except Exception as e:
             print(f"[VectorRetriever][ERROR] 임베딩 로드 실패: {e}")
@@ -70,73 +137,325 @@ class VectorRetriever:
             self.chunks = None
             return False
 
-    def build_index(self) -> bool:
+    def set_projection(self, projection: Optional[Dict]):
+        """projection 교체 (None이면 원본 차원). 적용하려면 build_index() 재호출"""
+        self.projection = projection
+        self.projection_dim = projection['dim'] if projection else None
+        self.search_embeddings = None
+        self.index = None
+
+    def _prepare_search_embeddings(self):
+        if self.projection_dim and self.projection is None:
+            self.projection = load_projection(index_dir_for(self.embedding_path), self.projection_dim)
+            if self.projection is None:
+                raise FileNotFoundError(
+                    f"projection_{self.projection_dim}.npz 가 없습니다. EmbeddingGenerator.fit_projection({self.projection_dim})을 먼저 실행하세요."
+                )
+            content_hash = (self.header or {}).get('content_hash')
+            if self.projection.get('content_hash') and self.projection['content_hash'] != content_hash:
+                print("[VectorRetriever] ⚠️ projection이 현재 임베딩과 다른 store로 학습되었습니다. 재학습을 권장합니다.")
+        if self.projection is not None:
+            self.search_embeddings = apply_projection(self.embeddings, self.projection)
+        else:
+            self.search_embeddings = self.embeddings
+
+    def _project_queries(self, query_embs: np.ndarray) -> np.ndarray:
+        if self.projection is None:
+            return query_embs
+        return apply_projection(query_embs, self.projection)
+
+    def _resolve_index_config(self):
+        n = len(self.embeddings)
+        effective_type = resolve_index_type(self.index_type, n, self.exact_fallback_threshold)
+        params = resolve_index_params(
+            effective_type, self.index_params if effective_type == self.index_type else None
+        )
+        if 'nlist' in params and not params['nlist']:
+            params['nlist'] = auto_nlist(n)
+        if self.projection is not None:
+            params['projection'] = f"{self.projection['method']}{self.projection['dim']}"
+        return effective_type, params
+
+    def _compute_fingerprint(self) -> str:
+        content_hash = (self.header or {}).get('content_hash', '')
+        return index_fingerprint(
+            content_hash, self.model_name, self.effective_index_type, build_params_of(self.effective_index_params)
+        )
+
+    def _create_index(self):
+        params = {k: v for k, v in self.effective_index_params.items() if k != 'projection'}
+        index, _, _ = build_faiss_index(
+            self.search_embeddings, self.effective_index_type, params, fallback_threshold=0
+        )
+        return index
+
+    def _registry_index_key(self, fingerprint: str) -> str:
+        # 같은 fingerprint라도 검색 파라미터(ef_search/nprobe)·mmap 여부가 다르면 별도 인덱스 객체
+        params = json.dumps(self.effective_index_params, sort_keys=True, default=str)
+        return f"{fingerprint}|mmap={self.mmap_index}|{params}"
+
+    def build_index(self, force_rebuild: bool = False) -> bool:
+        """
+        fingerprint(임베딩 content hash + 모델명 + 인덱스 타입)가 같은 인덱스가 저장돼 있으면 로드,
+        없거나 force_rebuild=True면 새로 빌드 후 임베딩 store 옆에 저장.
+        레지스트리에 같은 인덱스가 이미 올라와 있으면 디스크 로드 없이 재사용.
+        """
         try:
             if self.embeddings is None:
                 return False
-            dim = self.embeddings.shape[1]
-            self.index = faiss.IndexFlatIP(dim)
-            self.index.add(self.embeddings.astype(np.float32))
+            t0 = time.perf_counter()
+            self._prepare_search_embeddings()
+            self.effective_index_type, self.effective_index_params = self._resolve_index_config()
+            fingerprint = self._compute_fingerprint()
+            index_dir = index_dir_for(self.embedding_path)
+            registry_key = self._registry_index_key(fingerprint)
+            index = None
+            source = 'shared'
+            if self.registry is not None and not force_rebuild:
+                index = self.registry.peek_index(registry_key)
+            if index is None and self.persist_index and not force_rebuild:
+                source = 'loaded'
+                try:
+                    index = load_index(index_dir, fingerprint, mmap=self.mmap_index)
+                except Exception as e:
+                    print(f"[VectorRetriever] 저장된 인덱스 로드 실패, 재빌드합니다: {e}")
+                    index = None
+                if index is not None and index.ntotal != len(self.embeddings):
+                    print("[VectorRetriever] 저장된 인덱스 크기 불일치, 재빌드합니다.")
+                    index = None
+                if index is not None:
+                    apply_search_params(index, self.effective_index_type, self.effective_index_params)
+
+            if index is None:
+                index = self._create_index()
+                source = 'built'
+                if self.persist_index:
+                    try:
+                        save_index(index, index_dir, fingerprint, meta={
+                            'model_name': self.model_name,
+                            'index_type': self.effective_index_type,
+                            'index_params': self.effective_index_params,
+                            'content_hash': (self.header or {}).get('content_hash')
+                        })
+                    except Exception as e:
+                        print(f"[VectorRetriever] 인덱스 저장 실패(메모리 인덱스로 계속 진행): {e}")
+            if self.registry is not None and source != 'shared':
+                self.registry.put_index(registry_key, index, time.perf_counter() - t0)
+
+            self.index = index
+            self.index_fingerprint = fingerprint
+            self.alias_index = AliasIndex(self.chunks)
+            # BM25는 sparse/hybrid 검색에서 처음 필요할 때 생성 (빌드 후 mode를 바꿔도 동작)
+            self.sparse_retriever = None
+            if self.mode != 'dense':
+                self._get_sparse_retriever()
+            elapsed = time.perf_counter() - t0
+            self.startup_stats.update({'index_source': source, 'index_sec': elapsed})
+            action = {'shared': '재사용', 'loaded': '로드', 'built': '빌드'}[source]
+            print(
+                f"[VectorRetriever] 인덱스 {action} 완료 "
+                f"({self.effective_index_type}, fingerprint={fingerprint}, n={index.ntotal}, {elapsed * 1000:.1f}ms)"
+            )
             return True
         except Exception as e:
             print(f"[VectorRetriever][ERROR] build_index 실패: {e}")
             return False
 
-    def search(self, query: str, top_k: int = 5, min_score: float = 0.0):
+    def encode_query(self, query: str) -> np.ndarray:
+        """정규화된 쿼리 임베딩(float32, (dim,)). 캐시에 있으면 encoder를 호출하지 않음"""
+        return self.encode_queries([query])[0]
+
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
         """
-        쿼리(query) 관련 music chunk Top-K 검색.
-        반환 passage에는 node_id, concept_type, parent_id 등 평가/로그에 필요한 메타 정보가 포함됨.
+        여러 쿼리를 (n, dim) float32 행렬로 임베딩.
+        캐시 miss 쿼리만 모아(중복 제거) 한 번의 배치 encode 호출로 처리.
         """
+        norm_queries = [QueryEmbeddingCache.normalize_query(q) for q in queries]
+        vectors = {}
+        pending, pending_set = [], set()  # encode 순서 유지용 list + 중복 검사용 set
+        for nq in norm_queries:
+            if nq in vectors or nq in pending_set:
+                continue
+            vec = self.query_cache.get(self.model_name, nq)
+            if vec is not None:
+                vectors[nq] = vec
+            else:
+                pending.append(nq)
+                pending_set.add(nq)
+        if pending:
+            encoded = self.model.encode(
+                pending,
+                batch_size=32,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            ).astype('float32')
+            for nq, vec in zip(pending, encoded):
+                self.query_cache.put(self.model_name, nq, vec)
+                vectors[nq] = vec
+        if not norm_queries:
+            return np.zeros((0, self.index.d if self.index is not None else 0), dtype=np.float32)
+        return np.stack([vectors[nq] for nq in norm_queries]).astype(np.float32, copy=False)
+
+    def _get_sparse_retriever(self) -> SparseRetriever:
+        if self.sparse_retriever is None:
+            self.sparse_retriever = SparseRetriever(self.chunks)
+        return self.sparse_retriever
+
+    def _ensure_index(self) -> bool:
         if self.index is None:
+            print("[VectorRetriever] 인덱스가 준비되지 않아 build_index()를 호출합니다 (저장된 인덱스가 있으면 로드).")
             self.build_index()
             if self.index is None:
                 print("[VectorRetriever][ERROR] 인덱스 구축 실패")
-                return []
+                return False
+        return True
+
+    def _make_result(self, chunk: Dict, score: float, rank: int) -> Dict:
+        # 반드시 node_id, concept_type, parent_id 등 메타 정보 포함
+        return {
+            'node_id': chunk.get('node_id'),
+            'concept_type': chunk.get('concept_type'),
+            'parent_id': chunk.get('parent_id'),
+            'concept.ko': chunk.get('concept.ko', '') or '',
+            'concept.en': chunk.get('concept.en', '') or '',
+            'aliases': chunk.get('aliases', '') or '',
+            'definition': chunk.get('definition', '') or '',
+            'logic': chunk.get('logic', '') or '',
+            'examples.name': chunk.get('examples.name', '') or '',
+            'examples.description': chunk.get('examples.description', '') or '',
+            'tips': chunk.get('tips', '') or '',
+            'prerequisites.ko': chunk.get('prerequisites.ko', '') or '',
+            'prerequisites.en': chunk.get('prerequisites.en', '') or '',
+            'score': float(score),
+            'rank': rank
+        }
+
+    def _collect_hits(self, score_row, index_row, min_score: float) -> List[Tuple[int, float]]:
+        hits = []
+        for score, idx in zip(score_row, index_row):
+            # idx == -1: 후보 수가 top_k보다 적을 때 FAISS가 채우는 값
+            if score >= min_score and 0 <= idx < len(self.chunks):
+                hits.append((int(idx), float(score)))
+        return hits
 
-        query_orig = query
-        query = query.lower().strip()
+    def _rerank_hits(self, query: str, hits: List[Tuple[int, float]], exact_rows: List[int],
+                     query_emb: Optional[np.ndarray], top_k: int) -> List[Dict]:
+        """
+        AliasIndex lookup으로 alias 가중치 부여 + dense 검색이 놓친 정확 일치 청크 주입.
+        주입 청크 점수는 쿼리 임베딩과의 cosine (encoder 생략 시 EXACT_MATCH_SCORE).
+        """
+        hit_rows = {row for row, _ in hits}
+        for row in exact_rows:
+            if row not in hit_rows:
+                if query_emb is not None:
+                    score = float(np.dot(np.asarray(self.search_embeddings[row], dtype=np.float32), query_emb))
+                else:
+                    score = EXACT_MATCH_SCORE
+                hits.append((row, score))
+                hit_rows.add(row)
+
+        matches = self.alias_index.match_rows(query, [row for row, _ in hits])
+        results = [
+            self._make_result(self.chunks[row], score + self.alias_index.boost(matches.get(row)), rank)
+            for rank, (row, score) in enumerate(hits, 1)
+        ]
+        results = sorted(results, key=lambda x: x['score'], reverse=True)[:top_k]
+        # rank 필드 다시 업데이트 (정렬 후)
+        for i, r in enumerate(results, 1):
+            r['rank'] = i
+        return results
 
-        # 쿼리 임베딩
-        query_emb = self.model.encode(
-            query,
-            normalize_embeddings=True,
-            convert_to_numpy=True
-        ).astype('float32').reshape(1, -1)
+    def _hybrid_results(self, query: str, dense_hits: List[Tuple[int, float]], exact_rows: List[int],
+                        query_emb: np.ndarray, top_k: int, search_k: int) -> List[Dict]:
+        """
+        dense 순위 + BM25 순위 + alias 일치 순위(정확 > 포함)를 RRF로 융합.
+        순서는 fusion_score 기준, 'score'는 dense와 동일하게 cosine + alias 가중치 (로그/게이트 호환).
+        """
+        sparse_hits = self._get_sparse_retriever().search(query, search_k)
+        dense_scores = dict(dense_hits)
+        candidates = list(dict.fromkeys(
+            [row for row, _ in dense_hits] + [row for row, _ in sparse_hits] + list(exact_rows)
+        ))
+        matches = self.alias_index.match_rows(query, candidates)
+        alias_ranking = [r for r in candidates if matches.get(r) == 'exact'] + \
+                        [r for r in candidates if matches.get(r) == 'partial']
+        fused = reciprocal_rank_fusion([
+            [row for row, _ in dense_hits],
+            [row for row, _ in sparse_hits],
+            alias_ranking
+        ])[:top_k]
 
-        # FAISS 유사도 검색
-        scores, indices = self.index.search(query_emb, top_k)
         results = []
-        for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if score >= min_score and idx < len(self.chunks):
-                chunk = self.chunks[idx]
-                # 반드시 node_id, concept_type, parent_id 등 메타 정보 포함
-                results.append({
-                    'node_id': chunk.get('node_id'),
-                    'concept_type': chunk.get('concept_type'),
-                    'parent_id': chunk.get('parent_id'),
-                    'concept.ko': chunk.get('concept.ko', '') or '',
-                    'concept.en': chunk.get('concept.en', '') or '',
-                    'aliases': chunk.get('aliases', '') or '',
-                    'definition': chunk.get('definition', '') or '',
-                    'logic': chunk.get('logic', '') or '',
-                    'examples.name': chunk.get('examples.name', '') or '',
-                    'examples.description': chunk.get('examples.description', '') or '',
-                    'tips': chunk.get('tips', '') or '',
-                    'prerequisites.ko': chunk.get('prerequisites.ko', '') or '',
-                    'prerequisites.en': chunk.get('prerequisites.en', '') or '',
-                    'score': float(score),
-                    'rank': i + 1
-                })
-
-        # === re-ranking by alias/concept match ===
-        results = rerank_by_alias(query_orig, results)
+        for rank, (row, fusion_score) in enumerate(fused, 1):
+            score = dense_scores.get(row)
+            if score is None:
+                score = float(np.dot(np.asarray(self.search_embeddings[row], dtype=np.float32), query_emb))
+            result = self._make_result(self.chunks[row], score + self.alias_index.boost(matches.get(row)), rank)
+            result['fusion_score'] = fusion_score
+            results.append(result)
         return results
 
+    def search(self, query: str, top_k: int = 5, min_score: float = 0.0):
+        """
+        쿼리(query) 관련 music chunk Top-K 검색.
+        반환 passage에는 node_id, concept_type, parent_id 등 평가/로그에 필요한 메타 정보가 포함됨.
+        """
+        return self.search_batch([query], top_k=top_k, min_score=min_score)[0]
+
+    def search_batch(self, queries: List[str], top_k: int = 5, min_score: float = 0.0) -> List[List[Dict]]:
+        """
+        여러 쿼리를 한 번에 검색: 배치 encode 1회 + (n, dim) FAISS search 1회 + 쿼리별 alias rerank.
+        결과[i]는 search(queries[i], top_k, min_score)와 동일.
+        개념명/alias와 정확히 일치하는 쿼리는(skip_encoder_on_exact) encoder 없이 lookup만으로 응답.
+        """
+        if not queries:
+            return []
+        if not self._ensure_index():
+            return [[] for _ in queries]
+
+        exact_rows = [self.alias_index.exact_rows(q) for q in queries]
+        dense_pos = [
+            i for i, rows in enumerate(exact_rows)
+            if not (self.skip_encoder_on_exact and rows)
+        ]
+
+        batch_results = [None] * len(queries)
+        if dense_pos and self.mode == 'sparse':
+            for i in dense_pos:
+                hits = self._get_sparse_retriever().search(queries[i], top_k, min_score)
+                batch_results[i] = self._rerank_hits(queries[i], hits, exact_rows[i], None, top_k)
+        elif dense_pos:
+            # hybrid는 융합 전 후보를 더 깊게 가져옴
+            search_k = top_k if self.mode == 'dense' else max(top_k * 4, HYBRID_CANDIDATE_K)
+            # 쿼리 임베딩 (캐시 hit 시 encoder 생략)
+            query_embs = self._project_queries(self.encode_queries([queries[i] for i in dense_pos]))
+            # FAISS 유사도 검색
+            scores, indices = self.index.search(query_embs, search_k)
+            for j, i in enumerate(dense_pos):
+                hits = self._collect_hits(scores[j], indices[j], min_score)
+                if self.mode == 'hybrid':
+                    batch_results[i] = self._hybrid_results(queries[i], hits, exact_rows[i], query_embs[j], top_k, search_k)
+                else:
+                    # === re-ranking by alias/concept match ===
+                    batch_results[i] = self._rerank_hits(queries[i], hits, exact_rows[i], query_embs[j], top_k)
+
+        for i, rows in enumerate(exact_rows):
+            if batch_results[i] is None:
+                batch_results[i] = self._rerank_hits(queries[i], [], rows, None, top_k)
+        return batch_results
+
     def get_stats(self):
         return {
             'model_name': self.model_name,
             'num_embeddings': len(self.embeddings) if self.embeddings is not None else 0,
-            'embedding_dim': int(self.embeddings.shape[1]) if self.embeddings is not None else None
+            'embedding_dim': int(self.embeddings.shape[1]) if self.embeddings is not None else None,
+            'search_dim': int(self.search_embeddings.shape[1]) if self.search_embeddings is not None else None,
+            'index_type': self.index_type,
+            'effective_index_type': self.effective_index_type,
+            'index_fingerprint': self.index_fingerprint,
+            'mode': self.mode,
+            'startup': dict(self.startup_stats),
+            'query_cache': self.query_cache.stats()
         }
 
 # if __name__ == "__main__":
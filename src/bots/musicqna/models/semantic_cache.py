@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import faiss
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_CAPACITY = 1024
+# 임계값 이상 후보 중 node_id가 맞는 항목을 찾기 위해 확인할 이웃 수
+NEIGHBORS = 5
+
+class SemanticAnswerCache:
+    """
+    과거 질문 임베딩 → 답변 캐시 (의미적으로 거의 같은 질문이면 LLM 호출 생략).
+    - 저장소: FAISS IndexIDMap2(IndexFlatIP) (정규화 임베딩이므로 inner product = cosine)
+    - hit 조건: 유사도 >= threshold 이고 이번 검색의 node_id 집합이 캐시된 질문의 것과 동일
+    - capacity 초과 시 가장 오래 사용되지 않은 항목을 remove_ids로 제거 (LRU)
+    """
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, capacity: int = DEFAULT_CAPACITY):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.index = None
+        self._entries = OrderedDict()  # id → {'query', 'node_ids', 'response'}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.counters = {'lookups': 0, 'hits': 0, 'near_misses': 0, 'puts': 0, 'evictions': 0}
+
+    @staticmethod
+    def node_key(node_ids: List) -> tuple:
+        return tuple(sorted(str(n) for n in node_ids))
+
+    def _ensure_index(self, dim: int):
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def lookup(self, query_vec: np.ndarray, node_ids: List) -> Optional[Dict]:
+        """hit이면 {'query', 'node_ids', 'response', 'similarity'} 반환, 아니면 None"""
+        with self._lock:
+            self.counters['lookups'] += 1
+            if self.index is None or self.index.ntotal == 0:
+                return None
+            vec = np.ascontiguousarray(np.asarray(query_vec, dtype=np.float32).reshape(1, -1))
+            scores, ids = self.index.search(vec, min(NEIGHBORS, self.index.ntotal))
+            key = self.node_key(node_ids)
+            near_miss = False
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id < 0 or score < self.threshold:
+                    break
+                entry = self._entries.get(int(entry_id))
+                if entry is None:
+                    continue
+                if entry['node_ids'] != key:
+                    # 질문은 비슷하지만 검색 근거가 다름 → 캐시 답변을 쓰지 않음
+                    near_miss = True
+                    continue
+                self._entries.move_to_end(int(entry_id))
+                self.counters['hits'] += 1
+                return {**entry, 'similarity': float(score)}
+            if near_miss:
+                self.counters['near_misses'] += 1
+            return None
+
+    def put(self, query: str, query_vec: np.ndarray, node_ids: List, response: Dict):
+        vec = np.ascontiguousarray(np.asarray(query_vec, dtype=np.float32).reshape(1, -1))
+        with self._lock:
+            self._ensure_index(vec.shape[1])
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(vec, np.array([entry_id], dtype='int64'))
+            self._entries[entry_id] = {'query': query, 'node_ids': self.node_key(node_ids), 'response': response}
+            self.counters['puts'] += 1
+            if len(self._entries) > self.capacity:
+                overflow = len(self._entries) - self.capacity
+                evicted = [self._entries.popitem(last=False)[0] for _ in range(overflow)]
+                self.index.remove_ids(np.array(evicted, dtype='int64'))
+                self.counters['evictions'] += overflow
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counters['lookups']
+            return {
+                **self.counters,
+                'hit_rate': self.counters['hits'] / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'threshold': self.threshold,
+                'capacity': self.capacity
+            }
+
+    def clear(self):
+        with self._lock:
+            self.index = None
+            self._entries.clear()
@@ -0,0 +1,113 @@
+import re
+import math
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# 필드별 가중치: 개념명/alias는 정의·설명보다 강하게 반영 (BM25 tf에 곱해짐)
+SPARSE_FIELD_WEIGHTS = {
+    'concept.ko': 3.0,
+    'concept.en': 3.0,
+    'aliases': 3.0,
+    'definition': 1.0,
+    'logic': 1.0,
+    'examples.name': 1.0,
+    'examples.description': 0.5,
+    'tips': 0.5,
+    'prerequisites.ko': 0.5,
+    'prerequisites.en': 0.5
+}
+
+_HANGUL_RUN = re.compile(r'[가-힣]+')
+_LATIN_RUN = re.compile(r'[a-z0-9#♭♯△]+')
+
+def tokenize(text: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    한국어: 한글 연속 구간의 문자 n-gram (조사/띄어쓰기 변화에 강함, 1글자 구간은 그대로)
+    영어/숫자: 소문자 단어 토큰
+    """
+    if not text:
+        return []
+    text = str(text).lower()
+    tokens = []
+    lo, hi = ngram_range
+    for run in _HANGUL_RUN.findall(text):
+        if len(run) < lo:
+            tokens.append(run)
+            continue
+        for n in range(lo, hi + 1):
+            for i in range(len(run) - n + 1):
+                tokens.append(run[i:i + n])
+    tokens.extend(_LATIN_RUN.findall(text))
+    return tokens
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """여러 순위 목록(행 번호)을 RRF 점수(sum 1/(k+rank))로 융합, 점수 내림차순"""
+    fused = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, 1):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)
+
+class SparseRetriever:
+    """
+    청크 필드 기반 BM25 역색인.
+    posting list는 term별 array('I')(청크 행 번호, 오름차순) + array('f')(가중 tf)로 압축 저장.
+    """
+    def __init__(self, chunks: List[Dict], k1: float = 1.5, b: float = 0.75, field_weights: Dict = None):
+        self.k1 = k1
+        self.b = b
+        self.field_weights = field_weights or SPARSE_FIELD_WEIGHTS
+        self.num_docs = len(chunks)
+        self.vocab = {}
+        self.postings_docs = []
+        self.postings_tfs = []
+        self.doc_len = array('f')
+        self._build(chunks)
+
+    def _build(self, chunks: List[Dict]):
+        for row, chunk in enumerate(chunks):
+            tf = Counter()
+            for field, weight in self.field_weights.items():
+                for tok in tokenize(chunk.get(field)):
+                    tf[tok] += weight
+            self.doc_len.append(sum(tf.values()))
+            for tok, freq in tf.items():
+                term_id = self.vocab.get(tok)
+                if term_id is None:
+                    term_id = len(self.vocab)
+                    self.vocab[tok] = term_id
+                    self.postings_docs.append(array('I'))
+                    self.postings_tfs.append(array('f'))
+                self.postings_docs[term_id].append(row)
+                self.postings_tfs[term_id].append(freq)
+        self.avg_doc_len = (sum(self.doc_len) / self.num_docs) if self.num_docs else 0.0
+        self.idf = array('f', [
+            math.log(1 + (self.num_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for docs in self.postings_docs
+        ])
+
+    def search(self, query: str, top_k: int = 5, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """BM25 상위 top_k (행 번호, 점수)"""
+        scores = {}
+        k1, b, avg_len = self.k1, self.b, self.avg_doc_len or 1.0
+        for tok, qtf in Counter(tokenize(query)).items():
+            term_id = self.vocab.get(tok)
+            if term_id is None:
+                continue
+            idf = self.idf[term_id]
+            for row, tf in zip(self.postings_docs[term_id], self.postings_tfs[term_id]):
+                denom = tf + k1 * (1 - b + b * self.doc_len[row] / avg_len)
+                scores[row] = scores.get(row, 0.0) + qtf * idf * tf * (k1 + 1) / denom
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        return [(row, score) for row, score in ranked if score > min_score]
+
+    def get_stats(self) -> Dict:
+        num_postings = sum(len(d) for d in self.postings_docs)
+        return {
+            'num_docs': self.num_docs,
+            'vocab_size': len(self.vocab),
+            'num_postings': num_postings,
+            'postings_kb': num_postings * (4 + 4) / 1024,
+            'avg_doc_len': self.avg_doc_len
+        }
@@ -0,0 +1,124 @@
+"""
+정의형 질문 템플릿 답변 (LLM 호출 없음)
+- "X란?", "X이란 무엇인가요?" (what_is), "X의 정의는?" (definition) 형태이고
+  X가 개념명/alias와 정확히 일치하는 청크가 하나뿐이면 그 청크의 정의·원리·예시·팁으로 답변 구성
+- 템플릿 답변임을 답변 본문과 응답 dict('templated': True)에 표시
+- 의도별 시도/적중 수, 적중 시 처리 시간(ms) 통계
+"""
+import re
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.bots.musicqna.models.alias_index import normalize, EXACT_MATCH_SCORE
+
+_ENDING = r'\s*(?:무엇인가요|무엇입니까|무엇이야|뭔가요|뭐예요|뭐에요|뭐야|뭐지|무엇)?\s*\??\s*$'
+INTENT_PATTERNS = [
+    ('definition', re.compile(r'^\s*(?P<term>.+?)\s*의\s*정의\s*(?:는|가)?' + _ENDING)),
+    ('what_is', re.compile(r'^\s*(?P<term>.+?)\s*(?:이)?란' + _ENDING)),
+]
+TEMPLATE_NOTICE = "※ 참고 자료의 내용을 그대로 정리한 템플릿 답변입니다 (LLM 생성 답변 아님)."
+TEMPLATE_MODEL = 'template'
+
+def detect_intent(query: str):
+    """→ (intent, 개념명 후보 목록) / 정의형 질문이 아니면 (None, [])"""
+    for intent, pattern in INTENT_PATTERNS:
+        m = pattern.match(query or '')
+        if m:
+            term = m.group('term').strip()
+            # "X이란"은 X, "...이"로 끝나는 개념명 "X이"+"란" 둘 다 가능
+            candidates = [term]
+            if intent == 'what_is' and re.search(r'이란' + _ENDING, query):
+                candidates.append(term + '이')
+            return intent, candidates
+    return None, []
+
+def render_answer(chunk: Dict) -> str:
+    def value(key):
+        v = chunk.get(key)
+        return str(v).strip() if v else ''
+
+    title = value('concept.ko')
+    if value('concept.en'):
+        title += f" ({value('concept.en')})"
+    lines = [f"📘 {title}", "", f"[정의] {value('definition')}"]
+    if value('logic'):
+        lines.append(f"[원리] {value('logic')}")
+    if value('examples.name'):
+        example = value('examples.name')
+        if value('examples.description'):
+            example += f" — {value('examples.description')}"
+        lines.append(f"[예시] {example}")
+    if value('tips'):
+        lines.append(f"[팁] {value('tips')}")
+    lines += ["", TEMPLATE_NOTICE]
+    return "\n".join(lines)
+
+class TemplateAnswerer:
+    def __init__(self, retriever):
+        self.retriever = retriever
+        self._lock = threading.Lock()
+        self.counters = {}  # intent → {'attempts', 'hits', 'latency_ms': [...]}
+
+    def _match_row(self, candidates: List[str]) -> Optional[int]:
+        alias_index = getattr(self.retriever, 'alias_index', None)
+        if alias_index is None:
+            return None
+        for term in candidates:
+            rows = alias_index.exact_rows(term)
+            if len(rows) > 1:
+                # 같은 이름이 여러 청크에 있으면 concept.ko 정확 일치만, 그래도 여럿이면 LLM에 맡김
+                rows = [r for r in rows if normalize(self.retriever.chunks[r].get('concept.ko')) == normalize(term)]
+            if len(rows) == 1:
+                return rows[0]
+        return None
+
+    def answer(self, query: str) -> Optional[Dict]:
+        """템플릿으로 답할 수 있으면 응답 dict, 아니면 None"""
+        t0 = time.perf_counter()
+        intent, candidates = detect_intent(query)
+        if intent is None:
+            return None
+        row = self._match_row(candidates)
+        response = None
+        if row is not None:
+            chunk = self.retriever.chunks[row]
+            response = {
+                'answer': render_answer(chunk),
+                'sources': [self.retriever._make_result(chunk, EXACT_MATCH_SCORE, 1)],
+                'model': TEMPLATE_MODEL,
+                'timestamp': datetime.now().isoformat(),
+                'used_system_prompt': False,
+                'cached': False,
+                'prompt_tokens': 0,
+                'templated': True,
+                'intent': intent
+            }
+        latency_ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            c = self.counters.setdefault(intent, {'attempts': 0, 'hits': 0, 'latency_ms': []})
+            c['attempts'] += 1
+            if response is not None:
+                c['hits'] += 1
+                c['latency_ms'].append(latency_ms)
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            out = {}
+            for intent, c in self.counters.items():
+                lat = sorted(c['latency_ms'])
+                out[intent] = {
+                    'attempts': c['attempts'],
+                    'hits': c['hits'],
+                    'hit_rate': c['hits'] / c['attempts'] if c['attempts'] else 0.0,
+                    'p50_ms': lat[len(lat) // 2] if lat else None,
+                    'max_ms': lat[-1] if lat else None
+                }
+            return out
+
+    def print_stats(self):
+        for intent, s in self.stats().items():
+            p50 = f"{s['p50_ms']:.2f}ms" if s['p50_ms'] is not None else '-'
+            print(f"📘 [템플릿 답변] {intent}: {s['hits']}/{s['attempts']} ({s['hit_rate']:.1%}) | p50 {p50}")
@@ -0,0 +1,185 @@
+"""
+토큰 예산 기반 참고자료(context) 패커
+- 토큰 수는 대상 모델의 tokenizer(tiktoken)로 계산, tiktoken이 없으면 문자 종류별 근사치 사용
+- concept_type별 필드 우선순위에 따라 (정의 → 원리/예시 → 팁 ...) 예산 안에서 채움
+  · 우선순위 단계마다 검색 순위대로 passage를 돌며 채우므로 1위 passage가 예산을 독식하지 않음
+  · 예산이 모자라면 문장 경계(. ; ? !)에서 자르고, 너무 짧게 남으면 필드를 생략
+- 부모/자식 개념이 함께 검색되면 부모는 정의만 남기고, 이미 들어간 내용과 겹치는 필드는 제외
+- 출력 포맷은 기존 RAGModel._format_sources_for_prompt와 동일 ([참고자료 n] 블록)
+"""
+import re
+from typing import Dict, List, Optional
+
+DEFAULT_CONTEXT_BUDGET = 800
+# 잘라서라도 넣을 최소 토큰 수 (이보다 적게 남으면 필드 생략)
+MIN_FIELD_TOKENS = 24
+# chat 포맷 메시지당 부가 토큰 (role 등), 응답 시작 토큰
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+DEFAULT_FIELD_PRIORITY = ['definition', 'logic', 'examples.name', 'examples.description', 'tips']
+FIELD_PRIORITY = {
+    'foundation_concept': ['definition', 'logic', 'tips'],
+    'categorical_concept': ['definition', 'logic', 'tips', 'examples.name'],
+    'core_concept': ['definition', 'logic', 'examples.name', 'examples.description', 'tips'],
+    'symbol_concept': ['definition', 'examples.name', 'examples.description', 'logic', 'tips'],
+    'example_concept': ['examples.name', 'examples.description', 'definition', 'logic', 'tips'],
+    'technique_concept': ['definition', 'logic', 'tips', 'examples.name', 'examples.description'],
+}
+# 렌더링 순서/라벨 (기존 프롬프트 포맷)
+FIELD_LABELS = [
+    ('definition', "[정의]: "),
+    ('logic', "[원리]: "),
+    ('examples.name', "예시: "),
+    ('examples.description', "예시 설명: "),
+    ('tips', "[팁]: "),
+]
+SEPARATOR = "-" * 28
+_SENTENCE_END = re.compile(r'[.;?!。](?:\s|$)')
+
+class TokenCounter:
+    """tiktoken이 설치되어 있으면 모델 tokenizer, 없으면 근사치 (한글/CJK 1자≈1토큰, 그 외 4자≈1토큰)"""
+    def __init__(self, model_name: str = "gpt-3.5-turbo"):
+        self.model_name = model_name
+        self.encoding = None
+        try:
+            import tiktoken
+            try:
+                self.encoding = tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            pass
+        except Exception as e:
+            # 첫 사용 시 BPE 파일 다운로드 실패(오프라인/프록시 등) → 근사치로 동작 (QnA 봇 시작은 막지 않음)
+            print(f"[TokenCounter] tiktoken 로드 실패 → 근사치 사용: {e}")
+        self.backend = 'tiktoken' if self.encoding is not None else 'approx'
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        wide = sum(1 for ch in text if ord(ch) >= 0x1100)
+        return wide + (len(text) - wide + 3) // 4
+
+    def count_messages(self, messages: List[Dict]) -> int:
+        return sum(TOKENS_PER_MESSAGE + self.count(m.get('content') or '') for m in messages) + TOKENS_PER_REPLY
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """max_tokens 이내로 자르되 가능하면 마지막 문장 경계에서 자름"""
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            cut = self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        else:
+            lo, hi = 0, len(text)
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if self.count(text[:mid]) <= max_tokens:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            cut = text[:lo]
+        ends = [m.end() for m in _SENTENCE_END.finditer(cut)]
+        if ends and ends[-1] >= len(cut) // 2:
+            return cut[:ends[-1]].rstrip()
+        return cut.rstrip() + "..."
+
+def _value(source: Dict, field: str) -> str:
+    value = source.get(field)
+    return str(value).strip() if value else ''
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', '', text)
+
+class ContextPacker:
+    def __init__(self, model_name: str = "gpt-3.5-turbo", budget: int = DEFAULT_CONTEXT_BUDGET,
+                 counter: Optional[TokenCounter] = None):
+        self.budget = budget
+        self.counter = counter or TokenCounter(model_name)
+
+    def _header(self, idx: int, source: Dict) -> str:
+        return (
+            f"\n[참고자료 {idx}]\n"
+            f"용어(한글): {_value(source, 'concept.ko')}\n"
+            f"용어(영문): {_value(source, 'concept.en')}\n"
+            f"동의어·유사 표기: {_value(source, 'aliases')}\n"
+        )
+
+    def _field_plan(self, sources: List[Dict]) -> List[List[str]]:
+        """passage별 채울 필드 순서. 같이 검색된 자식이 있는 부모는 정의만"""
+        parents_in_pack = {str(s.get('parent_id')) for s in sources if s.get('parent_id') is not None}
+        plans = []
+        for source in sources:
+            fields = FIELD_PRIORITY.get(source.get('concept_type'), DEFAULT_FIELD_PRIORITY)
+            if str(source.get('node_id')) in parents_in_pack:
+                fields = ['definition']
+            plans.append(list(fields))
+        return plans
+
+    def pack(self, sources: List[Dict]) -> Dict:
+        """
+        → {'text', 'tokens', 'budget', 'passages', 'fields', 'truncated', 'dropped'}
+        text는 기존 포맷의 참고자료 문자열 (예산 안에 passage 헤더조차 못 넣으면 그 passage부터 생략)
+        """
+        used = 0
+        packed = []  # [(idx, source, header, {field: text})]
+        for idx, source in enumerate(sources, 1):
+            header = self._header(idx, source)
+            cost = self.counter.count(header) + self.counter.count(SEPARATOR)
+            if used + cost > self.budget:
+                break
+            used += cost
+            packed.append((idx, source, header, {}))
+
+        plans = self._field_plan([p[1] for p in packed])
+        seen = []  # 이미 넣은 필드 값 (정규화) → 부모/자식, 형제 간 중복 제거
+        truncated = dropped = 0
+        depth = max((len(p) for p in plans), default=0)
+        for level in range(depth):
+            for (idx, source, header, fields), plan in zip(packed, plans):
+                if level >= len(plan):
+                    continue
+                field = plan[level]
+                text = _value(source, field)
+                if not text:
+                    continue
+                norm = _normalize(text)
+                if any(norm == s or (len(norm) > 20 and norm in s) for s in seen):
+                    dropped += 1
+                    continue
+                label = dict(FIELD_LABELS)[field]
+                cost = self.counter.count(f"{label}{text}\n")
+                remaining = self.budget - used
+                if cost > remaining:
+                    if remaining - self.counter.count(label) < MIN_FIELD_TOKENS:
+                        dropped += 1
+                        continue
+                    text = self.counter.truncate(text, remaining - self.counter.count(label) - 1)
+                    cost = self.counter.count(f"{label}{text}\n")
+                    if cost > remaining:
+                        dropped += 1
+                        continue
+                    truncated += 1
+                fields[field] = text
+                seen.append(norm)
+                used += cost
+
+        blocks = []
+        for idx, source, header, fields in packed:
+            block = header
+            for field, label in FIELD_LABELS:
+                if field in fields:
+                    block += f"{label}{fields[field]}\n"
+            blocks.append(block + SEPARATOR)
+        text = "".join(blocks)
+        return {
+            'text': text,
+            'tokens': self.counter.count(text),
+            'budget': self.budget,
+            'passages': len(packed),
+            'fields': sum(len(p[3]) for p in packed),
+            'truncated': truncated,
+            'dropped': dropped
+        }
@@ -0,0 +1,45 @@
+"""
+배치 로그용 검색 결과 참조 (청크 전체 대신 node_id + score + rank만 저장)
+- compact_sources: response['sources'] → topk_refs [{'node_id', 'score', 'rank'}]
+- SourceRehydrator: topk_refs만 있는 로그 행에 curriculum 노드로 topk_sources_full을 복원
+  (Retriever._make_result와 같은 필드 구성, 기존 all.json 행은 그대로 통과)
+"""
+import json
+from typing import Dict, List, Optional
+
+DEFAULT_CURRICULUM_PATH = "data/musicqna/processed/music_theory_curriculum.json"
+SOURCE_FIELDS = [
+    'concept.ko', 'concept.en', 'aliases', 'definition', 'logic', 'examples.name', 'examples.description',
+    'tips', 'prerequisites.ko', 'prerequisites.en'
+]
+
+def compact_sources(sources: List[Dict]) -> List[Dict]:
+    return [
+        {'node_id': s.get('node_id'), 'score': s.get('score'), 'rank': s.get('rank', i)}
+        for i, s in enumerate(sources, 1)
+    ]
+
+class SourceRehydrator:
+    def __init__(self, curriculum_path: str = DEFAULT_CURRICULUM_PATH, nodes: Optional[List[Dict]] = None):
+        if nodes is None:
+            with open(curriculum_path, encoding="utf-8") as f:
+                nodes = json.load(f)
+        self.nodes = {n.get('node_id'): n for n in nodes}
+
+    def source(self, ref: Dict) -> Dict:
+        node = self.nodes.get(ref.get('node_id'), {})
+        source = {
+            'node_id': ref.get('node_id'),
+            'concept_type': node.get('concept_type'),
+            'parent_id': node.get('parent_id')
+        }
+        for field in SOURCE_FIELDS:
+            source[field] = node.get(field, '') or ''
+        source['score'] = ref.get('score')
+        source['rank'] = ref.get('rank')
+        return source
+
+    def __call__(self, row: Dict) -> Dict:
+        if 'topk_sources_full' in row or 'topk_refs' not in row:
+            return row
+        return {**row, 'topk_sources_full': [self.source(ref) for ref in row['topk_refs']]}
@@ -0,0 +1,128 @@
+"""
+날짜 해석기 동등성 검사 + 마이크로 벤치마크 (LLM 호출 없음)
+- 비교 대상: resolve_relative_date_kor (정형식/상대 패턴 + 메모이즈, dateparser는 마지막 수단)
+  vs resolve_relative_date_kor_legacy (dateparser 우선 → 정형식 fallback)
+- 동등성 (같은 기준 시각으로 두 함수 호출, 반환 datetime 또는 ValueError 여부가 같아야 함)
+  · dataset: auto_schedule_questions.json의 문장 전체, 앞 1~4 단어, 규칙 파서 start/end 표기
+  · logs: 배치 평가 로그(data/scheduler/batch_logs)의 start/end 값 (ISO 변환 전 자연어 / ISO)
+  · relative: 오늘/내일/모레, 이번주·다음주·다다음주 X요일 × 시간 표기 조합
+    (기존 dateparser는 "내일 오후 3시"의 "3시"를 '3시간 뒤'로 읽는 등 결과가 다를 수 있어 차이 목록을 따로 출력)
+- 벤치마크: 호출당 평균 μs (legacy / 새 해석기 첫 호출(cold) / 같은 입력 재호출(warm)),
+  새 해석기에서 dateparser(기존 구현)까지 간 입력 수, dateparser import 시간(별도 프로세스)
+
+실행: python -m src.bots.scheduler.eval.benchmark_date_resolver [--base "2026-01-02 21:28"]
+"""
+import sys
+import json
+import time
+import argparse
+import datetime
+import subprocess
+
+from src.bots.scheduler.models.rule_parser import parse_schedule
+from src.bots.scheduler.utils import date_utils
+from src.bots.common.batch_log import ALL_LOG_GLOB, iter_log_rows
+from src.bots.scheduler.utils.date_utils import resolve_relative_date_kor, resolve_relative_date_kor_legacy
+
+TIME_TEXTS = ["", "오전 10시", "오후 3시", "오후 12시", "15시", "15시 30분", "12:30"]
+
+def dataset_texts(questions):
+    texts = set()
+    for q in questions:
+        words = q.split()
+        texts.add(q)
+        texts.update(" ".join(words[:k]) for k in range(1, min(4, len(words)) + 1))
+        parsed = parse_schedule(q)
+        if parsed:
+            texts.add(parsed['event']['start']['dateTime'])
+            texts.add(parsed['event']['end']['dateTime'])
+    return sorted(t for t in texts if t.strip())
+
+def log_texts(pattern=f"data/scheduler/batch_logs/*/{ALL_LOG_GLOB}"):
+    texts = set()
+    for row in iter_log_rows(pattern):
+        event = row.get('event') or {}
+        for key in ('start', 'end'):
+            value = (event.get(key) or {}).get('dateTime')
+            if value:
+                texts.add(value)
+    return sorted(texts)
+
+def relative_texts():
+    dates = ["오늘", "내일", "모레"] + [f"{w} {d}요일" for w in ("이번주", "다음주", "다다음주") for d in "월수금일"]
+    return [f"{d} {t}".strip() for d in dates for t in TIME_TEXTS]
+
+def outcome(fn, text, base):
+    try:
+        return fn(text, base)[0]
+    except ValueError:
+        return 'ValueError'
+
+def compare(texts, base):
+    diffs = []
+    for text in texts:
+        old, new = outcome(resolve_relative_date_kor_legacy, text, base), outcome(resolve_relative_date_kor, text, base)
+        if old != new:
+            diffs.append((text, old, new))
+    return diffs
+
+def per_call_us(fn, texts, base, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            outcome(fn, text, base)
+    return (time.perf_counter() - t0) * 1e6 / (len(texts) * repeat)
+
+def main():
+    parser = argparse.ArgumentParser(description="resolve_relative_date_kor 동등성 검사 + 마이크로 벤치마크")
+    parser.add_argument('--base', default=None, help="기준 시각 'YYYY-MM-DD HH:MM' (기본: 현재 시각)")
+    args = parser.parse_args()
+    base = datetime.datetime.strptime(args.base, "%Y-%m-%d %H:%M") if args.base else datetime.datetime.now()
+
+    with open("data/scheduler/processed/auto_schedule_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    corpora = {'dataset': dataset_texts(questions), 'logs': log_texts(), 'relative': relative_texts()}
+
+    # cold 측정 중 기존 구현(dateparser)으로 넘어간 입력 수
+    fallbacks = []
+    def counted_legacy(text, base_date):
+        fallbacks.append(text)
+        return resolve_relative_date_kor_legacy(text, base_date)
+
+    date_utils._resolve_cached.cache_clear()
+    date_utils.resolve_relative_date_kor_legacy = counted_legacy
+    try:
+        new_cold = per_call_us(resolve_relative_date_kor, corpora['dataset'], base)
+    finally:
+        date_utils.resolve_relative_date_kor_legacy = resolve_relative_date_kor_legacy
+    new_warm = per_call_us(resolve_relative_date_kor, corpora['dataset'], base, repeat=5)
+    legacy = per_call_us(resolve_relative_date_kor_legacy, corpora['dataset'], base)
+    import_sec = subprocess.run(
+        [sys.executable, '-c', 'import time; t = time.perf_counter(); import dateparser; print(time.perf_counter() - t)'],
+        capture_output=True, text=True
+    ).stdout.strip()
+
+    date_utils._resolve_cached.cache_clear()
+    print(f"\n📊 동등성 (기준 시각 {base:%Y-%m-%d %H:%M})")
+    total_diffs = 0
+    for name, texts in corpora.items():
+        diffs = compare(texts, base)
+        if name != 'relative':
+            total_diffs += len(diffs)
+        print(f"  {name:>9}: {len(texts) - len(diffs)}/{len(texts)} 일치")
+        for text, old, new in diffs[:15]:
+            print(f"      {text!r}: legacy={old} → new={new}")
+        if len(diffs) > 15:
+            print(f"      ... 외 {len(diffs) - 15}건")
+
+    print(f"\n⏱️ 호출당 평균 (dataset {len(corpora['dataset'])}개 입력)")
+    print(f"  legacy(dateparser 우선): {legacy:>9.1f}μs")
+    print(f"  new (cold, 캐시 없음):   {new_cold:>9.1f}μs  ({legacy / max(new_cold, 1e-9):.0f}x)")
+    print(f"  new (warm, 메모이즈):    {new_warm:>9.1f}μs  ({legacy / max(new_warm, 1e-9):.0f}x)")
+    print(f"  새 해석기에서 dateparser까지 간 입력: {len(fallbacks)}/{len(corpora['dataset'])} (예: {fallbacks[:3]})")
+    if import_sec:
+        print(f"  dateparser import: {float(import_sec) * 1000:.0f}ms (정형식/상대 패턴 입력만 들어오면 import하지 않음)")
+    return total_diffs
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,65 @@
+"""
+스케쥴러 입력 게이트 벤치마크 (LLM 호출 없음)
+- auto_schedule_questions.json 전체를 게이트에 통과시켜 차단 수(= 절약한 LLM 호출) 측정
+- false reject (생성 규칙 기준): noise_case(NOISES) 문장이 아닌데 차단된 입력
+- missed noise: NOISES 문장인데 통과된 입력 (규칙 파서/LLM이 처리)
+- false reject (LLM 기준): 배치 로그에서 LLM이 event를 만들었거나 missing에 날짜·시간이 모두 있지 않았는데 차단된 입력
+- 게이트 판단 시간 p50/p95 (μs)
+
+실행: python -m src.bots.scheduler.eval.benchmark_input_gate
+"""
+import json
+import time
+import argparse
+
+import numpy as np
+
+from src.bots.scheduler.models.input_gate import InputGate, MISSING_ALL
+from src.bots.scheduler.data_processing.auto_date_generator import NOISES
+from src.bots.scheduler.eval.benchmark_rule_parser import load_logged_events
+from src.bots.common.batch_log import ALL_LOG_GLOB
+
+def main():
+    parser = argparse.ArgumentParser(description="스케쥴러 입력 게이트 차단율 / false reject 측정")
+    parser.add_argument('--logs', default=f"data/scheduler/batch_logs/*/{ALL_LOG_GLOB}")
+    args = parser.parse_args()
+
+    with open("data/scheduler/processed/auto_schedule_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    gate = InputGate()
+    noises = set(NOISES)
+    rejected, latencies = [], []
+    missed_noise = []
+    for text in questions:
+        t0 = time.perf_counter()
+        passed = gate.check(text)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        if not passed:
+            rejected.append(text)
+        elif text in noises:
+            missed_noise.append(text)
+
+    false_rejects = [t for t in rejected if t not in noises]
+    n_noise = sum(1 for t in questions if t in noises)
+    stats = gate.stats()
+    print(f"\n📊 입력 게이트 벤치마크 (입력 {len(questions)}개, noise {n_noise}개)")
+    print(f"차단(LLM 호출 생략): {stats['rejected']} ({stats['reject_rate']:.1%})")
+    print(f"false reject (생성 규칙 기준): {len(false_rejects)} ({len(false_rejects) / len(questions):.2%})")
+    print(f"통과된 noise: {len(missed_noise)}/{n_noise} → {sorted(set(missed_noise))}")
+    print(f"latency: p50 {np.percentile(latencies, 50):.1f}μs | p95 {np.percentile(latencies, 95):.1f}μs")
+
+    logged = load_logged_events(args.logs)
+    in_logs = [t for t in rejected if t in logged]
+    llm_disagree = [
+        t for t in in_logs
+        if logged[t][0] is not None or not set(MISSING_ALL) <= set(logged[t][1])
+    ]
+    if in_logs:
+        print(f"false reject (LLM 로그 기준): {len(llm_disagree)}/{len(in_logs)} → {sorted(set(llm_disagree))}")
+    if false_rejects:
+        print(f"생성 규칙 기준 false reject 예시: {sorted(set(false_rejects))[:10]}")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+출력 모드 벤치마크: 기존 few-shot 텍스트 JSON vs 구조화 출력 (실제 LLM 호출, 캐시 미사용)
+- auto_schedule_questions.json에서 --limit개를 뽑아 모드별(text / tool / json_schema)로 추출
+  (게이트/규칙 파서는 끄고 모든 문장을 LLM으로 보냄 → 출력 모드 차이만 측정)
+- 지표 (모드별): 호출당 prompt/completion 토큰, 파싱 실패율(JSON 아님 / event·missing 키 없음),
+  호출 지연 p50/p95, text 모드 결과와의 일치율 (event+missing 전체 / start / summary / description)
+
+실행: python -m src.bots.scheduler.eval.benchmark_output_mode --modes text,tool,json_schema --limit 64
+     (stub 서버로 확인: OPENAI_BASE_URL=http://127.0.0.1:8089/v1)
+"""
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+import openai
+
+from src.bots.scheduler.models.schedule_llm import OUTPUT_MODES, _build_request, _reply_text
+from src.bots.scheduler.eval.benchmark_packing import agreement
+
+def call(request):
+    t0 = time.perf_counter()
+    completion = openai.chat.completions.create(**request)
+    usage = getattr(completion, 'usage', None)
+    return (
+        _reply_text(completion),
+        int(getattr(usage, 'prompt_tokens', 0) or 0),
+        int(getattr(usage, 'completion_tokens', 0) or 0),
+        time.perf_counter() - t0
+    )
+
+def parse_item(reply):
+    try:
+        parsed = json.loads(reply)
+    except Exception:
+        return None
+    if not isinstance(parsed, dict) or "event" not in parsed or not isinstance(parsed.get("missing", []), list):
+        return None
+    return {"event": parsed.get("event"), "missing": parsed.get("missing", [])}
+
+def run_mode(texts, mode):
+    results, latencies = [], []
+    stats = {'prompt_tokens': 0, 'completion_tokens': 0, 'parse_errors': 0, 'call_errors': 0}
+    for text in texts:
+        try:
+            reply, p, c, sec = call(_build_request(text, mode))
+        except Exception as e:
+            print(f"  ⚠️ [{mode}] 호출 실패: {e}")
+            stats['call_errors'] += 1
+            results.append(None)
+            continue
+        stats['prompt_tokens'] += p
+        stats['completion_tokens'] += c
+        latencies.append(sec * 1000)
+        item = parse_item(reply)
+        stats['parse_errors'] += int(item is None)
+        results.append(item)
+    return results, stats, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="스케쥴러 출력 모드(text/tool/json_schema): 토큰/파싱 실패/지연 비교")
+    parser.add_argument('--modes', default=','.join(OUTPUT_MODES))
+    parser.add_argument('--limit', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open("data/scheduler/processed/auto_schedule_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    texts = random.Random(args.seed).sample(questions, min(args.limit, len(questions)))
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip() in OUTPUT_MODES]
+    if 'text' not in modes:
+        modes.insert(0, 'text')
+    rows, reference = [], None
+    for mode in modes:
+        results, stats, latencies = run_mode(texts, mode)
+        if mode == 'text':
+            reference = results
+        calls = max(1, len(latencies))
+        rows.append({
+            'mode': mode,
+            'model': _build_request(texts[0], mode)['model'],
+            'prompt_per_call': stats['prompt_tokens'] / calls,
+            'completion_per_call': stats['completion_tokens'] / calls,
+            'parse_fail_rate': (stats['parse_errors'] + stats['call_errors']) / len(texts),
+            'p50_ms': float(np.percentile(latencies, 50)) if latencies else 0.0,
+            'p95_ms': float(np.percentile(latencies, 95)) if latencies else 0.0,
+            **agreement(results, reference)
+        })
+        print(f"  ✅ mode={mode}")
+
+    print(f"\n📊 출력 모드 벤치마크 (문장 {len(texts)}개, 일치율 기준: text)")
+    print(f"{'mode':>12} {'model':>14} {'prompt/call':>12} {'compl/call':>11} {'parse_fail':>11} {'p50 ms':>8} {'p95 ms':>8} {'agree':>7} {'start':>7} {'summary':>8}")
+    for r in rows:
+        print(
+            f"{r['mode']:>12} {r['model']:>14} {r['prompt_per_call']:>12.1f} {r['completion_per_call']:>11.1f} "
+            f"{r['parse_fail_rate']:>11.1%} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['all']:>7.1%} {r['start']:>7.1%} {r['summary']:>8.1%}"
+        )
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+다중 입력 packing 벤치마크 (실제 LLM 호출, 캐시 미사용)
+- auto_schedule_questions.json에서 --limit개를 뽑아 pack_size별로 추출
+  (게이트/규칙 파서는 끄고 모든 문장을 LLM으로 보냄 → packing 효과만 측정)
+- 지표 (pack_size별): 문장당 prompt/completion 토큰, 문장당 지연 시간, fallback(배열 형식 불일치) 묶음 수,
+  pack_size=1(문장별 추출) 결과와의 일치율 (event+missing 전체 / start / summary / description)
+
+실행: python -m src.bots.scheduler.eval.benchmark_packing --pack-sizes 1,4,8,16 --limit 64
+     (stub 서버로 확인: OPENAI_BASE_URL=http://127.0.0.1:8089/v1)
+"""
+import json
+import time
+import random
+import argparse
+
+import openai
+
+from src.bots.scheduler.models.schedule_llm import (
+    _build_request, _build_batch_request, _parse_batch_items
+)
+
+def call(request):
+    t0 = time.perf_counter()
+    completion = openai.chat.completions.create(**request)
+    usage = getattr(completion, 'usage', None)
+    return (
+        completion.choices[0].message.content,
+        int(getattr(usage, 'prompt_tokens', 0) or 0),
+        int(getattr(usage, 'completion_tokens', 0) or 0),
+        time.perf_counter() - t0
+    )
+
+def parse_single(reply):
+    try:
+        parsed = json.loads(reply)
+        return {"event": parsed.get("event"), "missing": parsed.get("missing", [])}
+    except Exception:
+        return None
+
+def run_pack_size(texts, pack_size):
+    stats = {'prompt_tokens': 0, 'completion_tokens': 0, 'seconds': 0.0, 'fallback_packs': 0, 'parse_errors': 0}
+    results = []
+
+    def single(text):
+        reply, p, c, sec = call(_build_request(text))
+        stats['prompt_tokens'] += p
+        stats['completion_tokens'] += c
+        stats['seconds'] += sec
+        item = parse_single(reply)
+        stats['parse_errors'] += int(item is None)
+        return item
+
+    for k in range(0, len(texts), pack_size):
+        pack = texts[k:k + pack_size]
+        if len(pack) == 1:
+            results.append(single(pack[0]))
+            continue
+        reply, p, c, sec = call(_build_batch_request(pack))
+        stats['prompt_tokens'] += p
+        stats['completion_tokens'] += c
+        stats['seconds'] += sec
+        items = _parse_batch_items(reply, len(pack))
+        if items is None:
+            stats['fallback_packs'] += 1
+            results.extend(single(text) for text in pack)
+        else:
+            results.extend({"event": it.get("event"), "missing": it.get("missing", [])} for it in items)
+    return results, stats
+
+def field(item, key):
+    event = (item or {}).get("event") or {}
+    value = event.get(key)
+    return value.get("dateTime") if isinstance(value, dict) else value
+
+def agreement(results, reference):
+    keys = {'all': 0, 'start': 0, 'summary': 0, 'description': 0}
+    for a, b in zip(results, reference):
+        keys['all'] += int(json.dumps(a, sort_keys=True, ensure_ascii=False) == json.dumps(b, sort_keys=True, ensure_ascii=False))
+        for key in ('start', 'summary', 'description'):
+            keys[key] += int(field(a, key) == field(b, key))
+    return {k: v / len(results) for k, v in keys.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="스케쥴러 다중 입력 packing: 토큰/지연/일치율 비교")
+    parser.add_argument('--pack-sizes', default='1,4,8,16')
+    parser.add_argument('--limit', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with open("data/scheduler/processed/auto_schedule_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+    texts = random.Random(args.seed).sample(questions, min(args.limit, len(questions)))
+
+    sizes = sorted({int(s) for s in args.pack_sizes.split(',') if s.strip()} | {1})
+    rows, reference = [], None
+    for size in sizes:
+        results, stats = run_pack_size(texts, size)
+        if size == 1:
+            reference = results
+        n = len(texts)
+        rows.append({
+            'pack_size': size,
+            'prompt_per_item': stats['prompt_tokens'] / n,
+            'completion_per_item': stats['completion_tokens'] / n,
+            'ms_per_item': stats['seconds'] * 1000 / n,
+            'fallback_packs': stats['fallback_packs'],
+            'parse_errors': stats['parse_errors'],
+            **agreement(results, reference)
+        })
+        print(f"  ✅ pack_size={size}")
+
+    print(f"\n📊 packing 벤치마크 (문장 {len(texts)}개, 일치율 기준: pack_size=1)")
+    print(f"{'pack':>5} {'prompt/item':>12} {'compl/item':>11} {'ms/item':>9} {'fallback':>9} {'agree':>7} {'start':>7} {'summary':>8} {'desc':>7}")
+    for r in rows:
+        print(
+            f"{r['pack_size']:>5} {r['prompt_per_item']:>12.1f} {r['completion_per_item']:>11.1f} {r['ms_per_item']:>9.1f} "
+            f"{r['fallback_packs']:>9} {r['all']:>7.1%} {r['start']:>7.1%} {r['summary']:>8.1%} {r['description']:>7.1%}"
+        )
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+규칙 기반 일정 파서 벤치마크
+- coverage: auto_schedule_questions.json 중 규칙 파서가 처리(LLM 생략)한 비율
+- latency: 규칙 파서 처리 시간 p50/p95 (μs)
+- agreement (기본, LLM 호출 없음): 기존 배치 평가 로그(data/scheduler/batch_logs)의 LLM 결과와 비교
+  · 로그의 start/end는 evaluate_event가 ISO로 변환한 값이므로 규칙 결과도 같은 방식(try_to_iso)으로
+    변환해 비교 (기준 날짜 = 로그 폴더 이름의 실행 시각)
+  · 항목별 일치율: start/end, summary, description, missing, 전체(event+missing) 일치
+- round-trip (데이터셋 + 경계 케이스): 규칙 파서가 만든 start/end 표기가 date_utils로 해석되고 end = start + 1시간인지
+  (오전 11시 → 오후 12시, 자정 넘김, HH:MM 등 데이터셋에 없는 형식은 EDGE_CASES로 확인)
+- agreement (--llm): 규칙 파서가 처리한 입력을 실제 LLM(use_rules=False)에도 보내 자연어 그대로 비교
+
+실행: python -m src.bots.scheduler.eval.benchmark_rule_parser [--llm --limit 50]
+"""
+import os
+import json
+import time
+import argparse
+import datetime
+
+import numpy as np
+
+from src.bots.scheduler.models.rule_parser import parse_schedule
+from src.bots.scheduler.eval.evaluate_batch_cli import try_to_iso
+from src.bots.scheduler.utils.date_utils import resolve_relative_date_kor
+from src.bots.common.batch_log import ALL_LOG_GLOB, log_paths, read_rows
+
+FIELDS = ('start', 'end', 'summary', 'description', 'missing')
+# 데이터셋에 없는 시간 표기 경계 케이스 (None = 규칙 파서가 LLM에 맡겨야 함)
+EDGE_CASES = {
+    "3월 10일 오전 11시 회의": "3월 10일 오후 12시",
+    "3월 10일 오후 12시 회의": "3월 10일 오후 1시",
+    "3월 10일 오전 12시 30분 회의": "3월 10일 오전 1시 30분",
+    "3월 10일 14:30 회의": "3월 10일 15:30",
+    "2024년 3월 10일 9:05 회의": "2024년 3월 10일 10:05",
+    "3월 10일 오후 11시 회의": None,
+    "3월 10일 23시 회의": None,
+    "3월 10일 23:30 회의": None,
+    "3월 10일 24시 회의": None,
+    "3월 10일 오후 2:30 회의": None,
+    "2월 29일 13시 45분 회의": None,
+    "2028년 2월 29일 13시 45분 회의": "2028년 2월 29일 14시 45분",
+}
+
+def round_trip_ok(rule, base):
+    """규칙 결과의 start/end가 모두 해석되고 end - start == 1시간이면 True (날짜 없는 결과는 검사 제외 → True)"""
+    if "날짜" in rule['missing']:
+        return True
+    try:
+        start, _ = resolve_relative_date_kor(rule['event']['start']['dateTime'], base)
+        end, _ = resolve_relative_date_kor(rule['event']['end']['dateTime'], base)
+    except ValueError:
+        return False
+    return end - start == datetime.timedelta(hours=1)
+
+def check_edge_cases(base):
+    failures = []
+    for text, expected_end in EDGE_CASES.items():
+        rule = parse_schedule(text)
+        end = rule['event']['end']['dateTime'] if rule else None
+        if end != expected_end or (rule and not round_trip_ok(rule, base)):
+            failures.append((text, expected_end, end))
+    return failures
+
+def load_logged_events(pattern):
+    """input → (LLM event(ISO 변환 후), missing, 기준 시각) (같은 입력은 첫 로그만)"""
+    logged = {}
+    for path in log_paths(pattern):
+        run_name = os.path.basename(os.path.dirname(path))
+        try:
+            base = datetime.datetime.strptime(run_name[:13], "%Y%m%d_%H%M")
+        except ValueError:
+            base = datetime.datetime.now()
+        for row in read_rows(path):
+            logged.setdefault(row.get('input', ''), (row.get('event'), row.get('missing') or [], base))
+    return logged
+
+def compare(rule, llm_event, llm_missing, to_iso=None):
+    """항목별 일치 여부 dict (to_iso: 규칙 결과 dateTime 변환 함수, None이면 자연어 그대로 비교)"""
+    ev = rule['event']
+    llm_event = llm_event or {}
+
+    def when(event, key, convert):
+        value = ((event or {}).get(key) or {}).get('dateTime', '')
+        return convert(value) if convert else value
+
+    out = {
+        'start': when(ev, 'start', to_iso) == when(llm_event, 'start', None),
+        'end': when(ev, 'end', to_iso) == when(llm_event, 'end', None),
+        'summary': (ev.get('summary') or '').strip() == (llm_event.get('summary') or '').strip(),
+        'description': (ev.get('description') or '').strip() == (llm_event.get('description') or '').strip(),
+        'missing': sorted(rule['missing']) == sorted(llm_missing or []),
+    }
+    out['all'] = all(out.values())
+    return out
+
+def main():
+    parser = argparse.ArgumentParser(description="규칙 기반 일정 파서 coverage / LLM 일치율 / 지연 시간")
+    parser.add_argument('--logs', default=f"data/scheduler/batch_logs/*/{ALL_LOG_GLOB}")
+    parser.add_argument('--llm', action='store_true', help="규칙 처리 입력을 실제 LLM에도 보내 비교")
+    parser.add_argument('--limit', type=int, default=None, help="--llm 비교 입력 수 제한")
+    args = parser.parse_args()
+
+    with open("data/scheduler/processed/auto_schedule_questions.json", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    parsed, latencies = {}, []
+    for text in questions:
+        t0 = time.perf_counter()
+        result = parse_schedule(text)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+        if result is not None:
+            parsed[text] = result
+    coverage = len(parsed) / len(questions)
+
+    print(f"\n📊 규칙 파서 벤치마크 (입력 {len(questions)}개)")
+    print(f"coverage: {len(parsed)}/{len(questions)} ({coverage:.1%}) → LLM 호출 {len(questions) - len(parsed)}회로 감소")
+    print(f"latency: p50 {np.percentile(latencies, 50):.1f}μs | p95 {np.percentile(latencies, 95):.1f}μs")
+
+    base = datetime.datetime.now().replace(second=0, microsecond=0)
+    broken = [text for text, rule in parsed.items() if not round_trip_ok(rule, base)]
+    print(f"round-trip (start/end 해석, end = start + 1시간): {len(parsed) - len(broken)}/{len(parsed)}"
+          + (f" → 실패 예시 {broken[:5]}" if broken else ""))
+    edge_failures = check_edge_cases(base)
+    print(f"경계 케이스: {len(EDGE_CASES) - len(edge_failures)}/{len(EDGE_CASES)} 통과")
+    for text, expected, got in edge_failures:
+        print(f"  ❌ {text!r}: end 기대 {expected!r} → {got!r}")
+
+    logged = load_logged_events(args.logs)
+    matches = {k: 0 for k in FIELDS + ('all',)}
+    n = 0
+    for text, rule in parsed.items():
+        if text not in logged:
+            continue
+        event, missing, base = logged[text]
+        cmp = compare(rule, event, missing, to_iso=lambda v, base=base: try_to_iso(v, base) or v)
+        n += 1
+        for key, ok in cmp.items():
+            matches[key] += int(ok)
+    if n:
+        print(f"\n🔁 배치 로그 LLM 결과와 일치율 (공통 입력 {n}개)")
+        print("  " + " | ".join(f"{k} {matches[k] / n:.1%}" for k in FIELDS + ('all',)))
+    else:
+        print("\n(배치 로그와 겹치는 입력이 없어 일치율 생략)")
+
+    if args.llm:
+        from src.bots.scheduler.models.schedule_llm import extract_schedule
+        texts = list(parsed)[:args.limit] if args.limit else list(parsed)
+        live = {k: 0 for k in FIELDS + ('all',)}
+        llm_latencies = []
+        for text in texts:
+            t0 = time.perf_counter()
+            result = extract_schedule(text, use_rules=False)
+            llm_latencies.append((time.perf_counter() - t0) * 1000)
+            for key, ok in compare(parsed[text], result.get('event'), result.get('missing')).items():
+                live[key] += int(ok)
+        print(f"\n🤖 실제 LLM 결과와 일치율 ({len(texts)}개, LLM p50 {np.percentile(llm_latencies, 50):.0f}ms)")
+        print("  " + " | ".join(f"{k} {live[k] / len(texts):.1%}" for k in FIELDS + ('all',)))
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,23 @@ import json
 import random
 import datetime
 import re
-from src.bots.scheduler.models.schedule_llm import extract_schedule
+from src.bots.scheduler.models.schedule_llm import extract_schedule, aextract_schedule, extract_schedules
+from src.bots.common.async_runner import get_concurrency, run_batch
+from src.bots.common.llm_cache import get_llm_cache
+from src.bots.common.batch_log import BatchLogWriter
+from src.bots.scheduler.models.input_gate import get_input_gate
 from src.bots.scheduler.utils.date_utils import resolve_relative_date_kor
 
+# 결과 파일 append 주기 (동시 실행 모드에서는 이 단위로 묶어 LLM 호출)
+LOG_INTERVAL = 100
+
+def get_pack_size() -> int:
+    """.env SCHEDULER_PACK_SIZE: 2 이상이면 LLM 요청 하나에 문장 N개를 묶어 추출 (기본 1 = 문장별 호출)"""
+    try:
+        return max(1, int(os.getenv("SCHEDULER_PACK_SIZE") or 1))
+    except ValueError:
+        return 1
+
 def is_iso_datetime(dt_str):
     return bool(re.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", dt_str))
 
@@ -24,7 +38,8 @@ def evaluate_event(event, input_text):
     end = event.get('end', {}).get('dateTime', '')
     summary = (event.get('summary', '') or '').strip()
     description = (event.get('description', '') or '').strip()
-    now = datetime.datetime.now()
+    # 기준 시각을 분 단위로 맞춰 같은 분 안의 같은 표기는 해석 결과(메모이즈)를 재사용
+    now = datetime.datetime.now().replace(second=0, microsecond=0)
 
     # 1. 자연어 → ISO 변환 시도
     start_iso = try_to_iso(start, now)
@@ -44,26 +59,13 @@ def evaluate_event(event, input_text):
     else:
         return "fail"
 
-def append_results(version_dir, results, successes, fails, partials):
-    os.makedirs(version_dir, exist_ok=True)
-    for fname, newdata in {
-        "all.json": results,
-        "success.json": successes,
-        "fail.json": fails,
-        "partial_fail.json": partials
-    }.items():
-        fpath = os.path.join(version_dir, fname)
-        if os.path.exists(fpath):
-            with open(fpath, "r", encoding="utf-8") as f:
-                curdata = json.load(f)
-        else:
-            curdata = []
-        curdata_keys = {d.get('input','') for d in curdata}
-        adddata = [d for d in newdata if d.get('input', '') not in curdata_keys]
-        curdata += adddata
-        with open(fpath, "w", encoding="utf-8") as f:
-            json.dump(curdata, f, ensure_ascii=False, indent=2)
-    print(f"\n🌱 Results appended: {version_dir}/ (success/fail/partial_fail/all.json)")
+def row_key(row):
+    return row.get('input', '')
+
+def append_results(writer, results):
+    # all.jsonl + 라벨별 jsonl에 이어 쓰기 (중복 input은 all.keys로 제외)
+    writer.append(results)
+    print(f"\n🌱 Results appended: {writer.version_dir}/ (success/fail/partial_fail/all{writer.ext})")
 
 def main():
     input_path = os.path.join("data", "scheduler", "processed", "auto_schedule_questions.json")
@@ -95,7 +97,8 @@ def main():
 
     questions = random.sample(questions, N_SAMPLE)
 
-    results, successes, fails, partials = [], [], [], []
+    results = []
+    source_counts = {}
 
     now_dt = datetime.datetime.now()
     now_str = now_dt.strftime("%Y%m%d_%H%M")
@@ -103,40 +106,67 @@ def main():
         "data", "scheduler", "batch_logs",
         f"{now_str}_seed{seed_value}"
     )
-
-    for idx, question_text in enumerate(questions):
-        print(f"\n[{idx+1}/{N_SAMPLE}] 질문: {question_text}")
-        try:
-            result = extract_schedule(question_text)
-            event = result.get('event')
-        except Exception as e:
-            result = {"event": None, "response": str(e)}
-            event = None
-
-        label = evaluate_event(event, question_text)
-        eval_log = {
-            "input": question_text,
-            "event": event,
-            "llm_response": result.get("response"),
-            "label": label,
-            "missing": result.get("missing"),
-        }
-        results.append(eval_log)
-        if label == "success":
-            successes.append(eval_log)
-        elif label == "fail":
-            fails.append(eval_log)
-        elif label == "partial":
-            partials.append(eval_log)
-
-        print(f"   → 평가결과: {label}")
-
-        if (idx+1) % 100 == 0 or (idx+1) == N_SAMPLE:
-            append_results(version_dir, results, successes, fails, partials)
-            results, successes, fails, partials = [], [], [], []
+    writer = BatchLogWriter(version_dir, row_key)
+
+    # LLM_CONCURRENCY > 1: LOG_INTERVAL개씩 AsyncOpenAI로 동시 호출 후 순서대로 기록 (로그는 순차 실행과 동일)
+    concurrency = get_concurrency()
+    if concurrency > 1:
+        print(f"⚡ LLM 동시 실행 모드: concurrency={concurrency}")
+    pack_size = get_pack_size()
+    if pack_size > 1:
+        print(f"📦 다중 입력 packing 모드: 요청당 최대 {pack_size}문장")
+
+    async def ask(idx, client):
+        return await aextract_schedule(questions[idx], client=client)
+
+    for block_start in range(0, N_SAMPLE, LOG_INTERVAL):
+        block = list(range(block_start, min(block_start + LOG_INTERVAL, N_SAMPLE)))
+        if pack_size > 1:
+            block_results = dict(zip(block, extract_schedules(
+                [questions[idx] for idx in block], pack_size=pack_size, concurrency=concurrency
+            )))
+        elif concurrency > 1:
+            block_results = dict(zip(block, run_batch(block, ask, concurrency)))
+        else:
+            block_results = {}
+
+        for idx in block:
+            question_text = questions[idx]
+            print(f"\n[{idx+1}/{N_SAMPLE}] 질문: {question_text}")
+            if idx in block_results:
+                result = block_results[idx]
+                event = result.get('event')
+            else:
+                try:
+                    result = extract_schedule(question_text)
+                    event = result.get('event')
+                except Exception as e:
+                    result = {"event": None, "response": str(e)}
+                    event = None
+
+            source_counts[result.get("source") or "error"] = source_counts.get(result.get("source") or "error", 0) + 1
+            label = evaluate_event(event, question_text)
+            eval_log = {
+                "input": question_text,
+                "event": event,
+                "llm_response": result.get("response"),
+                "label": label,
+                "missing": result.get("missing"),
+                "source": result.get("source"),
+            }
+            results.append(eval_log)
+
+            print(f"   → 평가결과: {label}")
+
+            if (idx+1) % LOG_INTERVAL == 0 or (idx+1) == N_SAMPLE:
+                append_results(writer, results)
+                results = []
 
     print("\n🌱 전체 루프 완료!")
-    print(f"→ 전체 결과: {version_dir}/.json 등 (누적 append)")
+    get_llm_cache().print_stats()
+    get_input_gate().print_stats()
+    print("🧭 [처리 경로] " + " | ".join(f"{k} {v}" for k, v in sorted(source_counts.items())))
+    print(f"→ 전체 결과: {version_dir}/all{writer.ext} 등 (누적 append)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
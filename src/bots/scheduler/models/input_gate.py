@@ -0,0 +1,76 @@
+"""
+스케쥴러 LLM 앞단 입력 게이트
+- 날짜 anchor(월/일, 연도, 내일·다음주·요일 등)도 시간 anchor(시/분, HH:MM, 오전·오후·저녁 등)도 없는 입력은
+  LLM 호출 없이 바로 missing ["날짜", "시간"] 응답 (프롬프트 예시 5와 동일)
+- anchor가 하나라도 있으면 통과 (규칙 파서 → LLM 순서로 처리). 애매하면 통과시키는 쪽으로 보수적으로 판단
+- '주말', '언제든', '추후' 같은 막연한 표현은 anchor로 보지 않음
+- 통과/차단 수(= 절약한 LLM 호출 수) 카운터
+"""
+import re
+import threading
+from typing import Dict
+
+from src.bots.scheduler.utils.date_utils import (
+    YEAR_RE, MONTH_RE, DAY_RE, HOUR_RE, HHMM_RE, AMPM_HOUR_RE, RELATIVE_DATE_WORDS, AMBIGUOUS_TIME_WORDS
+)
+
+MISSING_ALL = ["날짜", "시간"]
+# 막연한 표현: 게이트 판단에서 anchor로 치지 않음
+VAGUE_WORDS = ["주말", "언제", "추후", "나중", "적당한", "빠른 시간", "아무 때", "아무때"]
+DATE_WORDS = [w for w in RELATIVE_DATE_WORDS if w not in VAGUE_WORDS] + [
+    "글피", "어제", "이번 주", "다음 주", "다음달", "다음 달", "이번달", "이번 달"
+]
+TIME_WORDS = AMBIGUOUS_TIME_WORDS + ["오전", "오후", "정오", "자정", "낮"]
+WEEKDAY_RE = re.compile(r'[월화수목금토일]요일')
+ISO_DATE_RE = re.compile(r'\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}')
+MINUTE_RE = re.compile(r'\d{1,2}\s*분')
+
+def has_date_anchor(text: str) -> bool:
+    return bool(
+        YEAR_RE.search(text) or MONTH_RE.search(text) or DAY_RE.search(text) or ISO_DATE_RE.search(text)
+        or WEEKDAY_RE.search(text) or any(w in text for w in DATE_WORDS)
+    )
+
+def has_time_anchor(text: str) -> bool:
+    return bool(
+        HOUR_RE.search(text) or HHMM_RE.search(text) or AMPM_HOUR_RE.search(text) or MINUTE_RE.search(text)
+        or any(w in text for w in TIME_WORDS)
+    )
+
+class InputGate:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {'checked': 0, 'rejected': 0}
+
+    def check(self, text: str) -> bool:
+        """LLM(또는 규칙 파서)로 넘길 입력이면 True, 날짜/시간 anchor가 전혀 없으면 False"""
+        normalized = " ".join((text or "").split())
+        passed = has_date_anchor(normalized) or has_time_anchor(normalized)
+        with self._lock:
+            self.counters['checked'] += 1
+            self.counters['rejected'] += int(not passed)
+        return passed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            checked = self.counters['checked']
+            return {
+                **self.counters,
+                'calls_avoided': self.counters['rejected'],
+                'reject_rate': self.counters['rejected'] / checked if checked else 0.0
+            }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"🚪 [입력 게이트] LLM 호출 생략 {s['rejected']}/{s['checked']} ({s['reject_rate']:.1%})")
+
+_default_gate = None
+_default_lock = threading.Lock()
+
+def get_input_gate() -> InputGate:
+    """프로세스 공용 게이트 (extract_schedule / 배치 평가 통계 공유)"""
+    global _default_gate
+    with _default_lock:
+        if _default_gate is None:
+            _default_gate = InputGate()
+        return _default_gate
@@ -0,0 +1,135 @@
+"""
+규칙 기반 일정 추출기 (LLM 앞단 fast-path)
+- "(YYYY년) M월 D일 (오전/오후) H시 (M분) [장소] [내용]" 처럼 형식이 분명한 입력만 처리,
+  나머지는 None을 반환해 LLM(extract_schedule)에 맡김
+- 출력은 SCHEDULER_SYSTEM_PROMPT의 예시와 같은 {"event", "missing"} 구조
+  · start/end dateTime은 입력 자연어 그대로 (end = start + 1시간, 같은 표기. 오전 11시 → 오후 12시,
+    자정을 넘기는 경우(오후 11시, 23:30 등)는 LLM에 맡김)
+  · summary = 내용(마지막 단어), description = 장소(그 앞 단어들), 빠진 항목은 빈 문자열 (제목은 missing에도 기록)
+  · 날짜 없이 시간만 있으면 event 생성 + missing ["날짜"] (프롬프트 예시 4)
+- LLM에 맡기는 경우: 날짜/시간이 문장 맨 앞에 없음, 상대 날짜(내일·다음주 등), 모호한 시간(저녁·아침 등),
+  존재하지 않는 날짜(연도 없는 2월 29일 포함), 시간 범위 초과, 날짜만 있고 시간 없음, 내용 부분에 숫자가 더 있음
+"""
+import re
+import calendar
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+DATE_RE = re.compile(r'^(?:(?P<year>\d{4})년\s*)?(?P<month>\d{1,2})월\s*(?P<day>\d{1,2})일')
+TIME_RE = re.compile(
+    r'^(?:(?P<ampm>오전|오후)\s*)?(?:(?P<hour>\d{1,2})시(?:\s*(?P<minute>\d{1,2})분)?|(?P<hh>\d{1,2}):(?P<mm>\d{2}))'
+)
+RELATIVE_WORDS = ["내일", "모레", "오늘", "어제", "주말", "이번주", "다음주", "다다음주", "이번 주", "다음 주"]
+AMBIGUOUS_TIME_WORDS = ["저녁", "아침", "심야", "밤", "새벽", "오전 중", "오후 중"]
+# 한 단어만 남았을 때 장소로 볼 단어/접미사 (그 외는 내용으로 봄)
+PLACE_WORDS = {"집", "회사", "온라인", "학교", "사무실", "본사", "지점"}
+PLACE_SUFFIXES = ("카페", "역", "실", "관", "방", "센터", "학교", "병원", "공원", "호텔", "식당", "빌딩", "타워")
+PLACE_PARTICLES = ("에서", "에")
+
+def is_place(word: str) -> bool:
+    return word in PLACE_WORDS or word.endswith(PLACE_SUFFIXES)
+
+def _valid_date(year: Optional[int], month: int, day: int) -> bool:
+    if not 1 <= month <= 12:
+        return False
+    # 연도 없는 2월 29일은 LLM에 맡김 (date_utils는 연도를 다가오는 해로 채우므로 평년이면 해석 실패)
+    if year is None and (month, day) == (2, 29):
+        return False
+    last_day = calendar.monthrange(year or 2024, month)[1]
+    return 1 <= day <= last_day
+
+def _end_time_text(m) -> Optional[str]:
+    """시작 시간 + 1시간을 시작과 같은 표기로 (자정을 넘기거나 시간 값이 잘못되면 None → LLM에 맡김)"""
+    ampm = m.group('ampm')
+    if m.group('hh') is not None:
+        # '오후 2:30' 같은 혼합 표기는 LLM에 맡김
+        if ampm:
+            return None
+        hour, minute = int(m.group('hh')), int(m.group('mm'))
+    else:
+        hour = int(m.group('hour'))
+        minute = int(m.group('minute')) if m.group('minute') is not None else 0
+        if ampm:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if ampm == '오후' else 0)
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    start = datetime(2000, 1, 1, hour, minute)
+    end = start + timedelta(hours=1)
+    if end.date() != start.date():
+        return None
+
+    if m.group('hh') is not None:
+        return f"{end.hour}:{m.group('mm')}"
+    if ampm:
+        text = f"{'오전' if end.hour < 12 else '오후'} {end.hour % 12 or 12}시"
+    else:
+        text = f"{end.hour}시"
+    if m.group('minute') is not None:
+        text += f" {m.group('minute')}분"
+    return text
+
+def _split_slots(rest: str):
+    """날짜/시간 뒤 나머지 → (summary, description)"""
+    words = rest.split()
+    if not words:
+        return "", ""
+    if is_place(words[-1]):
+        return "", " ".join(words)
+    summary = words[-1]
+    place = words[:-1]
+    if place:
+        for particle in PLACE_PARTICLES:
+            if place[-1].endswith(particle) and len(place[-1]) > len(particle):
+                place[-1] = place[-1][:-len(particle)]
+                break
+    return summary, " ".join(place)
+
+def parse_schedule(text: str) -> Optional[Dict]:
+    """확신할 수 있으면 {"event", "missing"}, 아니면 None"""
+    orig = " ".join((text or "").split())
+    if not orig or any(w in orig for w in RELATIVE_WORDS + AMBIGUOUS_TIME_WORDS):
+        return None
+
+    pos = 0
+    date_text = ""
+    m_date = DATE_RE.match(orig)
+    if m_date:
+        year = int(m_date.group('year')) if m_date.group('year') else None
+        if not _valid_date(year, int(m_date.group('month')), int(m_date.group('day'))):
+            return None
+        date_text = m_date.group(0)
+        pos = m_date.end()
+
+    m_time = TIME_RE.match(orig[pos:].lstrip())
+    if not m_time:
+        # 시간 없음(날짜만 / 둘 다 없음)은 LLM에 맡김
+        return None
+    if m_time.group('hour') is not None and int(m_time.group('hour')) > 24:
+        return None
+    end_time = _end_time_text(m_time)
+    if end_time is None:
+        return None
+    time_text = m_time.group(0)
+    rest = orig[pos:].lstrip()[m_time.end():].strip()
+    if re.search(r'\d', rest):
+        return None
+
+    prefix = f"{date_text} " if date_text else ""
+    summary, description = _split_slots(rest)
+    missing: List[str] = []
+    if not date_text:
+        missing.append("날짜")
+    # 프롬프트 예시 2와 동일하게 장소가 없는 것은 missing에 넣지 않음 (description만 빈 문자열)
+    if not summary:
+        missing.append("제목")
+    return {
+        "event": {
+            "summary": summary,
+            "start": {"dateTime": prefix + time_text},
+            "end": {"dateTime": prefix + end_time},
+            "description": description
+        },
+        "missing": missing
+    }
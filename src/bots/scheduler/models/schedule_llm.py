@@ -3,7 +3,13 @@ import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from src.bots.scheduler.prompts.prompts import SCHEDULER_SYSTEM_PROMPT
+from src.bots.scheduler.prompts.prompts import (
+    SCHEDULER_SYSTEM_PROMPT, SCHEDULER_BATCH_SYSTEM_PROMPT, SCHEDULER_STRUCTURED_SYSTEM_PROMPT
+)
+from src.bots.scheduler.models.rule_parser import parse_schedule
+from src.bots.scheduler.models.input_gate import get_input_gate, MISSING_ALL
+from src.bots.common.llm_cache import get_llm_cache, cached_chat_completion, acached_chat_completion
+from src.bots.common.async_runner import run_batch
 # from src.bots.scheduler.utils.config import OPENAI_API_KEY
 
 load_dotenv()
@@ -11,50 +17,138 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 openai.api_key = OPENAI_API_KEY
 
-def extract_schedule(text, state=None, base_date_str=None):
-    """
-    LLM에 자연어 명령을 입력받아 일정 정보(event/missing)를 추출만 한다.
-    성공/실패 등 판정이나 메시지 안내엔 관여하지 않는다.
-    """
-    if base_date_str is None:
-        base_date = datetime.now()
-    else:
-        base_date = datetime.strptime(base_date_str, '%Y-%m-%d')
+OUTPUT_MODES = ("text", "tool", "json_schema")
+# json_schema(strict) 모드는 Structured Outputs를 지원하는 모델이 필요 (gpt-3.5-turbo는 미지원)
+STRUCTURED_MODEL = os.getenv("SCHEDULER_STRUCTURED_MODEL") or "gpt-4o-mini"
 
-    messages = [
-        {"role": "system", "content": SCHEDULER_SYSTEM_PROMPT},
-        {"role": "user", "content": text}
-    ]
-    
-    try:
-        completion = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            temperature=0.2
-        )
-        llm_reply = completion.choices[0].message.content
-    except Exception as e:
+_DATETIME_SCHEMA = {
+    "type": "object",
+    "properties": {"dateTime": {"type": "string"}},
+    "required": ["dateTime"],
+    "additionalProperties": False
+}
+SCHEDULE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "event": {
+            "type": ["object", "null"],
+            "properties": {
+                "summary": {"type": "string"},
+                "start": _DATETIME_SCHEMA,
+                "end": _DATETIME_SCHEMA,
+                "description": {"type": "string"}
+            },
+            "required": ["summary", "start", "end", "description"],
+            "additionalProperties": False
+        },
+        "missing": {"type": "array", "items": {"type": "string", "enum": ["날짜", "시간", "제목"]}}
+    },
+    "required": ["event", "missing"],
+    "additionalProperties": False
+}
+SCHEDULE_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_schedule",
+        "description": "일정문장에서 추출한 이벤트와 빠진 정보를 기록",
+        "parameters": SCHEDULE_SCHEMA
+    }
+}
+
+def get_output_mode():
+    """.env SCHEDULER_OUTPUT_MODE: text(기본, 기존 few-shot 프롬프트) | tool(function calling) | json_schema(strict)"""
+    mode = (os.getenv("SCHEDULER_OUTPUT_MODE") or "text").strip().lower()
+    return mode if mode in OUTPUT_MODES else "text"
+
+def _build_request(text, output_mode=None):
+    mode = output_mode or get_output_mode()
+    if mode == "text":
         return {
-            "event": None,
-            "missing": [],
-            "done": False,
-            "state": state or {},
-            "error": f"AI 처리 중 오류: {e}"
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": SCHEDULER_SYSTEM_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            "temperature": 0.2
+        }
+    request = {
+        "model": STRUCTURED_MODEL if mode == "json_schema" else "gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": SCHEDULER_STRUCTURED_SYSTEM_PROMPT},
+            {"role": "user", "content": text}
+        ],
+        "temperature": 0.2
+    }
+    if mode == "tool":
+        request["tools"] = [SCHEDULE_TOOL]
+        request["tool_choice"] = {"type": "function", "function": {"name": "record_schedule"}}
+    else:
+        request["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "schedule", "strict": True, "schema": SCHEDULE_SCHEMA}
         }
+    return request
 
+def _reply_text(completion):
+    # tool call 응답이면 함수 인자(JSON 문자열), 아니면 message.content
+    message = completion.choices[0].message
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        return tool_calls[0].function.arguments
+    return message.content
+
+def _build_batch_request(texts):
+    numbered = "\n".join(f"{i}. {' '.join(text.split())}" for i, text in enumerate(texts, 1))
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": SCHEDULER_BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": numbered}
+        ],
+        "temperature": 0.2
+    }
+
+def _parse_batch_items(reply, n):
+    """JSON 배열(또는 배열 하나를 담은 객체) → 길이 n의 {event, missing} 목록, 형식이 다르면 None"""
+    try:
+        parsed = json.loads(reply)
+    except Exception:
+        return None
+    if isinstance(parsed, dict):
+        arrays = [v for v in parsed.values() if isinstance(v, list)]
+        parsed = arrays[0] if len(arrays) == 1 else None
+    if not isinstance(parsed, list) or len(parsed) != n:
+        return None
+    if not all(isinstance(item, dict) and "event" in item for item in parsed):
+        return None
+    return parsed
+
+def _is_json(reply):
+    # 파싱 불가능한 응답은 캐시에 저장하지 않음 (다음 호출에서 재시도)
+    try:
+        json.loads(reply)
+        return True
+    except Exception:
+        return False
+
+def _error_result(state, error):
+    return {
+        "event": None,
+        "missing": [],
+        "done": False,
+        "state": state or {},
+        "error": error
+    }
+
+def _parse_reply(llm_reply, state=None):
     try:
         parsed = json.loads(llm_reply)
     except Exception:
-        return {
-            "event": None,
-            "missing": [],
-            "done": False,
-            "state": state or {},
-            "error": f"LLM 응답 파싱 오류: {llm_reply}"
-        }
+        return _error_result(state, f"LLM 응답 파싱 오류: {llm_reply}")
 
-    event = parsed.get("event")
-    missing = parsed.get("missing", [])
+    return _result(parsed.get("event"), parsed.get("missing", []), source="llm")
+
+def _result(event, missing, source):
     done = event is not None and not missing
 
     next_state = {
@@ -66,5 +160,127 @@ def extract_schedule(text, state=None, base_date_str=None):
         "event": event,
         "missing": missing,
         "done": done,
-        "state": next_state
-    }
\ No newline at end of file
+        "state": next_state,
+        "source": source
+    }
+
+def _fast_result(text, use_gate=True, use_rules=True):
+    # 날짜/시간 anchor가 없는 입력은 게이트에서 바로 missing 응답, 형식이 분명한 입력은 규칙 파서로 처리
+    # (둘 다 LLM 호출 없음), 아니면 None
+    if use_gate and not get_input_gate().check(text):
+        return _result(None, list(MISSING_ALL), source="gate")
+    if not use_rules:
+        return None
+    parsed = parse_schedule(text)
+    if parsed is None:
+        return None
+    return _result(parsed["event"], parsed["missing"], source="rule")
+
+def extract_schedule(text, state=None, base_date_str=None, use_rules=True, use_gate=True, output_mode=None):
+    """
+    LLM에 자연어 명령을 입력받아 일정 정보(event/missing)를 추출만 한다.
+    성공/실패 등 판정이나 메시지 안내엔 관여하지 않는다.
+    use_gate=True면 날짜/시간 anchor가 없는 입력은 LLM 없이 missing ["날짜", "시간"] (result['source'] == 'gate'),
+    use_rules=True면 규칙 기반 파서가 확신하는 입력은 LLM 없이 같은 형식으로 반환 (result['source'] == 'rule')
+    output_mode: text | tool | json_schema (None이면 .env SCHEDULER_OUTPUT_MODE), 반환 형식은 모드와 무관하게 동일
+    """
+    fast = _fast_result(text, use_gate, use_rules)
+    if fast is not None:
+        return fast
+
+    if base_date_str is None:
+        base_date = datetime.now()
+    else:
+        base_date = datetime.strptime(base_date_str, '%Y-%m-%d')
+
+    try:
+        # 같은 입력(시스템 프롬프트 포함 전체 messages)은 LLM 응답 캐시에서 재사용
+        llm_reply, _ = cached_chat_completion(
+            openai, get_llm_cache(), _build_request(text, output_mode), validate=_is_json, extract=_reply_text
+        )
+    except Exception as e:
+        return _error_result(state, f"AI 처리 중 오류: {e}")
+
+    return _parse_reply(llm_reply, state)
+
+async def aextract_schedule(text, state=None, base_date_str=None, client=None, use_rules=True, use_gate=True,
+                            output_mode=None):
+    """
+    extract_schedule의 비동기 버전 (배치 평가 동시 실행용).
+    client: openai.AsyncOpenAI, 429/5xx는 jitter backoff로 재시도. 반환 형식은 동기 버전과 동일.
+    """
+    fast = _fast_result(text, use_gate, use_rules)
+    if fast is not None:
+        return fast
+
+    try:
+        llm_reply, _ = await acached_chat_completion(
+            client, get_llm_cache(), _build_request(text, output_mode), validate=_is_json, extract=_reply_text
+        )
+    except Exception as e:
+        return _error_result(state, f"AI 처리 중 오류: {e}")
+
+    return _parse_reply(llm_reply, state)
+
+def _pack_results(items):
+    return [_result(item.get("event"), item.get("missing", []), source="llm_pack") for item in items]
+
+def _extract_pack(texts):
+    """한 요청으로 texts를 처리, 응답 형식이 맞지 않거나 호출 실패 시 문장별 호출로 fallback"""
+    if len(texts) > 1:
+        try:
+            reply, _ = cached_chat_completion(
+                openai, get_llm_cache(), _build_batch_request(texts),
+                validate=lambda r: _parse_batch_items(r, len(texts)) is not None
+            )
+            items = _parse_batch_items(reply, len(texts))
+            if items is not None:
+                return _pack_results(items)
+        except Exception:
+            pass
+    return [extract_schedule(text, use_gate=False, use_rules=False) for text in texts]
+
+async def _aextract_pack(texts, client):
+    if len(texts) > 1:
+        try:
+            reply, _ = await acached_chat_completion(
+                client, get_llm_cache(), _build_batch_request(texts),
+                validate=lambda r: _parse_batch_items(r, len(texts)) is not None
+            )
+            items = _parse_batch_items(reply, len(texts))
+            if items is not None:
+                return _pack_results(items)
+        except Exception:
+            pass
+    return [await aextract_schedule(text, client=client, use_gate=False, use_rules=False) for text in texts]
+
+def extract_schedules(texts, pack_size=8, concurrency=1, use_gate=True, use_rules=True):
+    """
+    여러 일정문장을 한꺼번에 추출 (배치 평가, 대량 등록용). 반환: texts와 같은 순서의 extract_schedule 결과 목록.
+    - 게이트/규칙 파서로 처리되는 문장은 LLM 없이 바로 결과
+    - 나머지는 pack_size개씩 번호를 붙여 한 요청으로 보내고 JSON 배열로 받음 (few-shot 시스템 프롬프트를 묶음당 1번만 지불)
+    - 묶음 응답이 배열 형식/길이가 맞지 않으면 그 묶음만 문장별 호출로 fallback (source: llm_pack | llm)
+    - concurrency > 1이면 묶음들을 AsyncOpenAI로 동시 호출
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        fast = _fast_result(text, use_gate, use_rules)
+        if fast is not None:
+            results[i] = fast
+        else:
+            pending.append(i)
+
+    pack_size = max(1, pack_size)
+    packs = [pending[k:k + pack_size] for k in range(0, len(pending), pack_size)]
+    if concurrency > 1:
+        async def worker(pack, client):
+            return await _aextract_pack([texts[i] for i in pack], client)
+        pack_results = run_batch(packs, worker, concurrency)
+    else:
+        pack_results = [_extract_pack([texts[i] for i in pack]) for pack in packs]
+
+    for pack, pack_result in zip(packs, pack_results):
+        for i, result in zip(pack, pack_result):
+            results[i] = result
+    return results
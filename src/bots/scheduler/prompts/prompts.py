@@ -71,4 +71,24 @@ SCHEDULER_SYSTEM_PROMPT = """
   "event": null,
   "missing": ["날짜", "시간"]
 }
-"""
\ No newline at end of file
+"""
+# 여러 문장을 한 요청으로 처리할 때 SCHEDULER_SYSTEM_PROMPT 뒤에 붙이는 지시
+SCHEDULER_BATCH_INSTRUCTION = """
+[여러 입력]
+- 사용자 메시지는 번호가 붙은 여러 일정문장이다 (예: "1. ...", "2. ...").
+- 각 문장을 서로 독립적으로 위 규칙대로 처리한다.
+- 출력은 오직 JSON 배열 하나이며, i번째 원소는 i번째 문장의 {"event": ..., "missing": [...]} 객체다.
+- 배열 길이는 반드시 입력 문장 수와 같아야 하고, 순서를 바꾸거나 합치거나 빠뜨리지 않는다.
+"""
+
+SCHEDULER_BATCH_SYSTEM_PROMPT = SCHEDULER_SYSTEM_PROMPT + SCHEDULER_BATCH_INSTRUCTION
+
+# 구조화 출력(tool call / json_schema) 모드용 짧은 프롬프트: 출력 형식은 스키마가 강제하므로 형식 설명/예시 출력 생략
+SCHEDULER_STRUCTURED_SYSTEM_PROMPT = """
+사용자의 일정문장에서 구글캘린더 이벤트 정보를 추출만 한다. 안내/설명/ISO변환/추정 금지.
+- 날짜(월/일)와 시간이 모두 없으면 event는 null, missing에 빠진 정보("날짜", "시간")만 기록.
+- 하나라도 있으면 event 생성. 빠진 날짜/시간과 빈 summary(제목)는 missing에 기록 ("날짜", "시간", "제목").
+- summary는 일정 내용, description은 장소 (없으면 빈 문자열).
+- start/end dateTime은 입력 표기 그대로 (예: "10월 15일 오후 7시"), end는 start의 1시간 뒤를 같은 표기로.
+예: "10월 15일 오후 7시 강남 회식" → summary "회식", start "10월 15일 오후 7시", end "10월 15일 오후 8시", description "강남", missing []
+"""
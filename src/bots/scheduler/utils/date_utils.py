@@ -1,10 +1,58 @@
 import re
-from datetime import datetime
-import dateparser
+from datetime import datetime, timedelta
+from functools import lru_cache
 
-def resolve_relative_date_kor(natural_kor_str, base_date):
+# 날짜/시간 slot 패턴 (resolve_relative_date_kor, scheduler 입력 게이트에서 공용)
+YEAR_RE = re.compile(r'(\d{4})년')
+MONTH_RE = re.compile(r'(\d{1,2})월')
+DAY_RE = re.compile(r'(\d{1,2})일')
+HOUR_RE = re.compile(r'(\d{1,2})시')
+HHMM_RE = re.compile(r'(\d{1,2}):(\d{2})')
+AMPM_HOUR_RE = re.compile(r'(오전|오후)\s*(\d{1,2})시')
+RELATIVE_DATE_WORDS = ["내일", "모레", "오늘", "주말", "이번주", "다음주", "다다음주"]
+AMBIGUOUS_TIME_WORDS = ["저녁", "아침", "심야", "밤", "점심", "새벽"]
+
+# 정형식 fallback 패턴 (resolve_relative_date_kor_legacy (5)와 동일)
+ISO_PREFIX_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+FULL_DATETIME_RE = re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*([0-2]?\d)시(?:\s*(\d{1,2})분)?')
+MD_AMPM_RE = re.compile(r'(\d{1,2})월\s*(\d{1,2})일\s*(오전|오후)\s*([0-2]?\d)시(?:\s*(\d{1,2})분)?')
+MD_HOUR_RE = re.compile(r'(\d{1,2})월\s*(\d{1,2})일\s*([0-2]?\d)시(?:\s*(\d{1,2})분)?')
+# 'M월 D일 HH:MM' (기존 구현은 해석하지 못하던 형식, 규칙 파서 출력에 쓰임)
+FULL_HHMM_RE = re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2}):(\d{2})(?!\d)')
+MD_HHMM_RE = re.compile(r'(\d{1,2})월\s*(\d{1,2})일\s*(\d{1,2}):(\d{2})(?!\d)')
+AMPM_ONLY_RE = re.compile(r'(오전|오후)\s*([0-2]?\d)시(?:\s*(\d{1,2})분)?')
+# 상대 날짜 (문장 전체가 '날짜 [시간]'일 때만): 오늘/내일/모레, 이번주·다음주·다다음주 + 요일
+DAY_OFFSETS = {"오늘": 0, "내일": 1, "모레": 2}
+WEEK_OFFSETS = {"이번주": 0, "다음주": 1, "다다음주": 2}
+WEEKDAYS = "월화수목금토일"
+RELATIVE_DATETIME_RE = re.compile(
+    r'^(?:(?P<day>오늘|내일|모레)|(?P<week>다다음주|다음주|이번주)\s*(?P<weekday>[월화수목금토일])요일)'
+    r'(?:\s*(?:(?P<ampm>오전|오후)\s*)?(?P<hour>\d{1,2})시(?:\s*(?P<minute>\d{1,2})분)?'
+    r'|\s*(?P<hh>\d{1,2}):(?P<mm>\d{2}))?\s*$'
+)
+
+def _dateparser():
+    # import가 느려서 정형식/상대 패턴으로 못 푸는 입력에서만 로드
+    import dateparser
+    return dateparser
+
+def _apply_ampm(ampm, hour):
+    if ampm == '오후' and hour != 12:
+        return hour + 12
+    if ampm == '오전' and hour == 12:
+        return 0
+    return hour
+
+def _upcoming_year(base_date, month, day):
+    # 연도 없는 월/일: 기준일보다 이전이면 내년
+    year = base_date.year
+    if (month < base_date.month) or (month == base_date.month and day < base_date.day):
+        year += 1
+    return year
+
+def resolve_relative_date_kor_legacy(natural_kor_str, base_date):
     """
-    한국/상대표현 자연어 일정문장 → datetime 변환.
+    (기존 구현, 동등성 비교용) 한국/상대표현 자연어 일정문장 → datetime 변환.
     - 날짜/시간 slot(월일/년월일 + 시) 모두 명확해야 함
     - 모호한 시간 표기는 예외
     - ISO 형식, '내일', '모레' 등도 지원
@@ -16,24 +64,23 @@ def resolve_relative_date_kor(natural_kor_str, base_date):
 
     # (1) 완전 ISO 포맷일 때
     if re.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", orig):
-        dt = dateparser.parse(orig)
+        dt = _dateparser().parse(orig)
         if dt:
             return dt, []
         else:
             raise ValueError(f"ISO8601 파싱 실패: '{orig}'")
 
     # (2) 애매/추측 불가 시간 표현은 강제 예외
-    ambiguous_time = ["저녁", "아침", "심야", "밤", "점심", "새벽"]
-    if any(word in orig for word in ambiguous_time):
+    if any(word in orig for word in AMBIGUOUS_TIME_WORDS):
         raise ValueError(f"모호한 시간표현(추정·자동변환X): '{orig}'")
 
     # (3) 날짜/시간 필수 slot 체크
-    year = re.search(r'(\d{4})년', orig)
-    month = re.search(r'(\d{1,2})월', orig)
-    day = re.search(r'(\d{1,2})일', orig)
-    hour = re.search(r'(\d{1,2})시', orig) or re.search(r'(\d{1,2}):(\d{2})', orig)
-    am_pm = re.search(r'(오전|오후)\s*(\d{1,2})시', orig)
-    is_relative = any(x in orig for x in ["내일", "모레", "오늘", "주말", "이번주", "다음주", "다다음주"])
+    year = YEAR_RE.search(orig)
+    month = MONTH_RE.search(orig)
+    day = DAY_RE.search(orig)
+    hour = HOUR_RE.search(orig) or HHMM_RE.search(orig)
+    am_pm = AMPM_HOUR_RE.search(orig)
+    is_relative = any(x in orig for x in RELATIVE_DATE_WORDS)
 
     has_full_date = (year and month and day) or (month and day)
     has_time = (hour or am_pm)
@@ -43,7 +90,7 @@ def resolve_relative_date_kor(natural_kor_str, base_date):
         raise ValueError(f"날짜/시간 slot 불충분: '{orig}'")
 
     # (4) dateparser 우선 해석 (internal, 상대표현 등)
-    dt = dateparser.parse(orig, languages=["ko"], settings={'RELATIVE_BASE': base_date})
+    dt = _dateparser().parse(orig, languages=["ko"], settings={'RELATIVE_BASE': base_date})
 
     # (5) Fallback 정형식 처리
 
@@ -96,4 +143,112 @@ def resolve_relative_date_kor(natural_kor_str, base_date):
     if dt:
         return dt, []
 
-    raise ValueError(f"명확한 날짜/시간 파싱 실패: '{orig}'")
\ No newline at end of file
+    raise ValueError(f"명확한 날짜/시간 파싱 실패: '{orig}'")
+
+def _resolve_relative(m, base_date):
+    """RELATIVE_DATETIME_RE 매치 → datetime, 직접 풀 수 없으면 None (dateparser로 넘김)"""
+    if m.group('day'):
+        date = base_date + timedelta(days=DAY_OFFSETS[m.group('day')])
+    else:
+        monday = base_date - timedelta(days=base_date.weekday())
+        date = monday + timedelta(weeks=WEEK_OFFSETS[m.group('week')], days=WEEKDAYS.index(m.group('weekday')))
+    if m.group('hh') is not None:
+        hour, minute = int(m.group('hh')), int(m.group('mm'))
+    elif m.group('hour') is not None:
+        hour = _apply_ampm(m.group('ampm'), int(m.group('hour')))
+        minute = int(m.group('minute')) if m.group('minute') else 0
+    elif m.group('day'):
+        # 시간 없는 '오늘/내일/모레': 기준 시각 그대로 (기존 dateparser 결과와 같음)
+        return date
+    else:
+        return None
+    return datetime(date.year, date.month, date.day, hour, minute, 0)
+
+def _resolve_fast(orig, base_date):
+    """정형식/상대 패턴 → datetime, 해당 없으면 None. 잘못된 날짜/시간 값은 ValueError"""
+    if any(word in orig for word in RELATIVE_DATE_WORDS):
+        m = RELATIVE_DATETIME_RE.match(orig)
+        return _resolve_relative(m, base_date) if m else None
+
+    # 절대 날짜 형식은 dateparser(ko)가 None을 주므로 기존에도 아래 fallback 결과가 그대로 쓰임
+    m = FULL_DATETIME_RE.match(orig)
+    if m:
+        year, month, day, hour = map(int, m.groups()[:4])
+        minute = int(m.group(5)) if m.group(5) else 0
+        return datetime(year, month, day, hour, minute, 0)
+    m = MD_AMPM_RE.match(orig)
+    if m:
+        month, day, hour = int(m.group(1)), int(m.group(2)), int(m.group(4))
+        minute = int(m.group(5)) if m.group(5) else 0
+        return datetime(_upcoming_year(base_date, month, day), month, day, _apply_ampm(m.group(3), hour), minute, 0)
+    m = MD_HOUR_RE.match(orig)
+    if m:
+        month, day, hour = map(int, m.groups()[:3])
+        minute = int(m.group(4)) if m.group(4) else 0
+        return datetime(_upcoming_year(base_date, month, day), month, day, hour, minute, 0)
+    m = FULL_HHMM_RE.match(orig)
+    if m:
+        year, month, day, hour, minute = map(int, m.groups())
+        return datetime(year, month, day, hour, minute, 0)
+    m = MD_HHMM_RE.match(orig)
+    if m:
+        month, day, hour, minute = map(int, m.groups())
+        return datetime(_upcoming_year(base_date, month, day), month, day, hour, minute, 0)
+    return None
+
+@lru_cache(maxsize=4096)
+def _resolve_cached(orig, base_date):
+    """→ (datetime, None) 또는 (None, 오류 메시지). 실패도 캐시해서 같은 입력에 dateparser를 다시 부르지 않음"""
+    if ISO_PREFIX_RE.match(orig):
+        try:
+            return datetime.fromisoformat(orig), None
+        except ValueError:
+            dt = _dateparser().parse(orig)
+            return (dt, None) if dt else (None, f"ISO8601 파싱 실패: '{orig}'")
+
+    if any(word in orig for word in AMBIGUOUS_TIME_WORDS):
+        return None, f"모호한 시간표현(추정·자동변환X): '{orig}'"
+
+    year = YEAR_RE.search(orig)
+    month = MONTH_RE.search(orig)
+    day = DAY_RE.search(orig)
+    hour = HOUR_RE.search(orig) or HHMM_RE.search(orig)
+    am_pm = AMPM_HOUR_RE.search(orig)
+    is_relative = any(x in orig for x in RELATIVE_DATE_WORDS)
+    has_full_date = (year and month and day) or (month and day)
+    has_time = (hour or am_pm)
+    if not ((has_full_date and has_time) or is_relative):
+        return None, f"날짜/시간 slot 불충분: '{orig}'"
+
+    try:
+        dt = _resolve_fast(orig, base_date)
+    except ValueError:
+        # 패턴은 맞았지만 값이 범위 밖('내일 24시', '2월 30일' 등) → 판단을 기존 구현에 넘김
+        dt = None
+    try:
+        if dt is None:
+            # 마지막 수단: 기존 구현 그대로 (dateparser → 정형식 fallback)
+            dt, _ = resolve_relative_date_kor_legacy(orig, base_date)
+    except ValueError as e:
+        return None, str(e)
+    return dt, None
+
+def resolve_relative_date_kor(natural_kor_str, base_date):
+    """
+    한국/상대표현 자연어 일정문장 → datetime 변환.
+    - 절대 날짜(월일/년월일 + 시간)와 ISO 입력은 resolve_relative_date_kor_legacy와 결과가 같음
+    - 상대 날짜 + 시간('내일 오후 3시' 등)은 의도적으로 다름: 기존 구현은 dateparser가 '3시'를 '3시간 뒤'로
+      읽는 등 결과가 틀릴 수 있어, 여기서는 기준일 + 명시한 시각으로 해석
+    - 미리 컴파일한 패턴으로 ISO, 'YYYY년 M월 D일 H시 | HH:MM', 'M월 D일 (오전/오후) H시 (M분) | HH:MM',
+      '오늘/내일/모레 (오전/오후) H시 | HH:MM', '이번주/다음주/다다음주 X요일 ...'를 직접 해석
+    - 그 외 입력만 dateparser(지연 import)를 포함한 기존 구현으로 처리
+    - (text, base_date) 단위로 결과(실패 포함)를 메모이즈
+    - 파싱 실패시 반드시 ValueError 발생(빈/애매/불완전 등)
+    """
+    orig = natural_kor_str.strip()
+    if not orig:
+        raise ValueError("빈 입력")
+    dt, error = _resolve_cached(orig, base_date)
+    if error is not None:
+        raise ValueError(error)
+    return dt, []
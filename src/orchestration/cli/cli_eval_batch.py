@@ -3,20 +3,22 @@ CLI 자동질문/배치 평가 오케스트레이터
 - 각 시스템의 독립적인 batch 평가 CLI(main)을 직접 호출
 """
 
-import sys
+# 실제 평가 CLI의 main 함수는 선택 시점에 import (선택하지 않은 봇의 의존성은 로드하지 않음)
+def load_musicqna_batch_main():
+    try:
+        from src.bots.musicqna.eval.evaluate_batch_cli import main as musicqna_batch_main
+        return musicqna_batch_main
+    except Exception as e:
+        print(f"[IMPORT ERROR] musicqna 평가 모듈 불러오기 실패: {e}")
+        return None
 
-# 실제 평가 CLI에서 main 함수 import
-try:
-    from src.bots.musicqna.eval.evaluate_batch_cli import main as musicqna_batch_main
-except Exception as e:
-    print(f"[IMPORT ERROR] musicqna 평가 모듈 불러오기 실패: {e}")
-    musicqna_batch_main = None
-
-try:
-    from src.bots.scheduler.eval.evaluate_batch_cli import main as scheduler_batch_main
-except Exception as f:
-    print(f"[IMPORT ERROR] scheduler 평가 모듈 불러오기 실패: {f}")
-    scheduler_batch_main = None
+def load_scheduler_batch_main():
+    try:
+        from src.bots.scheduler.eval.evaluate_batch_cli import main as scheduler_batch_main
+        return scheduler_batch_main
+    except Exception as f:
+        print(f"[IMPORT ERROR] scheduler 평가 모듈 불러오기 실패: {f}")
+        return None
 
 def main():
     print("=" * 50)
@@ -28,11 +30,13 @@ def main():
     print("q) 종료")
     sel = input("> ").strip()
     if sel == "1":
+        musicqna_batch_main = load_musicqna_batch_main()
         if musicqna_batch_main:
             musicqna_batch_main()
         else:
             print("뮤직QnA 평가 모듈이 없습니다.")
     elif sel == "2":
+        scheduler_batch_main = load_scheduler_batch_main()
         if scheduler_batch_main:
             scheduler_batch_main()
         else:
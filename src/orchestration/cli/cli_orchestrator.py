@@ -1,17 +1,24 @@
 # src/orchestration/cli/cli_orchestrator.py
 
+import os
 import sys
 
-from src.bots.musicqna.cli.cli_main import main as qna_cli_main
-from src.bots.scheduler.cli.cli_main import main as scheduler_cli_main
-from src.orchestration.cli.cli_eval_orchestrator import main as eval_cli_main
-from src.orchestration.cli.cli_eval_batch import main as eval_batch_main
+from dotenv import load_dotenv, find_dotenv
+
+# 각 메뉴의 CLI 모듈은 선택 시점에 import (스케쥴러만 쓰면 torch/faiss 등을 로드하지 않음)
+load_dotenv(find_dotenv())
 
 def main():
     print("="*40)
     print(" UNIFIED CLI ORCHESTRATOR")
     print("="*40)
 
+    # ORCHESTRATOR_WARMUP=1: 메뉴 대기 중 뮤직QnA encoder/인덱스를 백그라운드로 미리 로드
+    warmup = None
+    if os.getenv("ORCHESTRATOR_WARMUP", "0").lower() in ("1", "true", "yes"):
+        from src.orchestration.cli.warmup import start_warmup
+        warmup = start_warmup()
+
     while True:
         print("\n어떤 기능을 실행하시겠습니까?")
         print("1) 뮤직QnA 시스템 실행")
@@ -22,12 +29,20 @@ def main():
         sel = input("> ").strip()
 
         if sel == "1":
+            if warmup is not None:
+                warmup.wait()
+            from src.bots.musicqna.cli.cli_main import main as qna_cli_main
             qna_cli_main()
         elif sel == "2":
+            from src.bots.scheduler.cli.cli_main import main as scheduler_cli_main
             scheduler_cli_main()
         elif sel == "3":
+            from src.orchestration.cli.cli_eval_orchestrator import main as eval_cli_main
             eval_cli_main()
         elif sel == "4":
+            if warmup is not None:
+                warmup.wait()
+            from src.orchestration.cli.cli_eval_batch import main as eval_batch_main
             eval_batch_main()
         elif sel.lower() in ["q","quit","exit"]:
             print("프로그램을 종료합니다.")
@@ -36,4 +51,4 @@ def main():
             print("올바른 선택지를 입력하세요.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
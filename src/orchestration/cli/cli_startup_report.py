@@ -0,0 +1,111 @@
+"""
+오케스트레이터 cold-start 리포트
+- 시나리오마다 새 인터프리터(subprocess)에서 측정 → 모듈 캐시 영향 없음
+- import 시간: 기존 방식(메뉴 모듈 전체 eager import) vs lazy import, 스케쥴러만 사용하는 경우
+- 첫 질문 지연: warm-up 없이 초기화 후 첫 검색 vs 백그라운드 warm-up 완료 후 첫 검색
+  (LLM 호출은 네트워크 지연이 섞이므로 제외하고 검색(encode + FAISS)까지만 측정)
+
+실행: python -m src.orchestration.cli.cli_startup_report --repeat 3
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+FIRST_QUERY = "코드 진행에서 긴장감을 만드는 방법이 궁금해요"
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'faiss', 'openai')
+
+_PRELUDE = """
+import sys, time, json
+t0 = time.perf_counter()
+"""
+_EPILOGUE = """
+out['heavy_loaded'] = [m for m in %r if m in sys.modules]
+print('@@' + json.dumps(out))
+""" % (HEAVY_MODULES,)
+
+SCENARIOS = {
+    # 변경 전 cli_orchestrator: 메뉴 모듈을 모두 최상단에서 import
+    'eager_import': """
+import src.bots.musicqna.cli.cli_main
+import src.bots.scheduler.cli.cli_main
+import src.orchestration.cli.cli_eval_orchestrator
+import src.bots.musicqna.eval.evaluate_batch_cli
+import src.bots.scheduler.eval.evaluate_batch_cli
+out = {'import_sec': time.perf_counter() - t0}
+""",
+    'lazy_import': """
+import src.orchestration.cli.cli_orchestrator
+out = {'import_sec': time.perf_counter() - t0}
+""",
+    'scheduler_only': """
+import src.orchestration.cli.cli_orchestrator
+import src.bots.scheduler.cli.cli_main
+out = {'import_sec': time.perf_counter() - t0}
+""",
+    'first_query_cold': """
+import src.orchestration.cli.cli_orchestrator
+import src.bots.musicqna.cli.cli_main
+from src.bots.musicqna.models.retriever import VectorRetriever
+t1 = time.perf_counter()
+r = VectorRetriever(); r.build_index()
+t2 = time.perf_counter()
+r.search(%(query)r, top_k=2)
+t3 = time.perf_counter()
+out = {'import_sec': t1 - t0, 'init_sec': t2 - t1, 'first_query_sec': t3 - t2}
+""",
+    'first_query_warm': """
+import src.orchestration.cli.cli_orchestrator
+from src.orchestration.cli.warmup import start_warmup
+w = start_warmup(); w.join()
+t1 = time.perf_counter()
+from src.bots.musicqna.models.retriever import VectorRetriever
+r = VectorRetriever(); r.build_index()
+t2 = time.perf_counter()
+r.search(%(query)r, top_k=2)
+t3 = time.perf_counter()
+out = {'warmup_sec': t1 - t0, 'warmup': w.stats, 'init_sec': t2 - t1, 'first_query_sec': t3 - t2}
+""",
+}
+
+def run_scenario(name: str) -> dict:
+    code = _PRELUDE + SCENARIOS[name] % {'query': FIRST_QUERY} + _EPILOGUE
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith('@@'):
+            return json.loads(line[2:])
+    raise RuntimeError(f"[{name}] 측정 실패:\n{proc.stderr[-1000:]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="오케스트레이터 import 시간 / 첫 질문 지연 리포트")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    args = parser.parse_args()
+
+    results = {}
+    for name in [s for s in args.scenarios.split(',') if s]:
+        runs = [run_scenario(name) for _ in range(args.repeat)]
+        merged = {}
+        for key in ('import_sec', 'warmup_sec', 'init_sec', 'first_query_sec'):
+            values = [r[key] for r in runs if key in r]
+            if values:
+                merged[key] = statistics.median(values)
+        merged['heavy_loaded'] = runs[-1]['heavy_loaded']
+        results[name] = merged
+        print(f"  ✅ {name} ({args.repeat}회)")
+
+    def ms(value):
+        return f"{value * 1000:>9.1f}" if value is not None else f"{'-':>9}"
+
+    print("\n📊 cold-start 리포트 (중앙값, ms)")
+    print(f"{'scenario':<18} {'import':>9} {'warmup':>9} {'init':>9} {'1st_query':>9}  heavy modules")
+    for name, r in results.items():
+        print(
+            f"{name:<18} {ms(r.get('import_sec'))} {ms(r.get('warmup_sec'))} {ms(r.get('init_sec'))} "
+            f"{ms(r.get('first_query_sec'))}  {','.join(r['heavy_loaded']) or '-'}"
+        )
+    return results
+
+if __name__ == "__main__":
+    main()